@@ -9,7 +9,7 @@ from pathlib import Path
 from loguru import logger
 
 from core.state import InvestigationState, CryptoSegment
-from cryptanalysis.detectors import detect_all
+from cryptanalysis.detectors import detect_all_batch
 from cryptanalysis.decoders import decode_segment
 from cryptanalysis.steganography import detect_image_stego
 
@@ -32,19 +32,20 @@ class CryptanalysisHunterAgent:
             extracted = state.get("extracted_text", {}) or {}
 
             seg_id = 0
-            for doc_id, text in extracted.items():
-                if not text:
-                    continue
-                for item in detect_all(text):
+            docs = [(doc_id, text) for doc_id, text in extracted.items() if text]
+            detected = detect_all_batch([text for _, text in docs])
+            for (doc_id, text), items in zip(docs, detected):
+                for item in items:
                     crypto_type = item[0]
                     start, end, content = item[1], item[2], item[3]
                     shift = item[4] if len(item) > 4 else None
+                    raw = item[5] if len(item) > 5 else None
                     seg_id += 1
                     sid = f"seg_{doc_id}_{seg_id}"
-                    dec = decode_segment(crypto_type, content, shift=shift)
+                    dec = decode_segment(crypto_type, content, shift=shift, raw=raw)
                     if dec:
                         decrypted_content[sid] = dec
-                    enc = CryptoSegment(
+                    enc = CryptoSegment.model_construct(
                         segment_id=sid,
                         doc_id=doc_id,
                         content=content[:500],
@@ -74,7 +75,7 @@ class CryptanalysisHunterAgent:
                         for finding in detect_image_stego(img_path):
                             seg_id += 1
                             sid = f"stego_{seg_id}"
-                            encrypted_segments.append(CryptoSegment(
+                            encrypted_segments.append(CryptoSegment.model_construct(
                                 segment_id=sid,
                                 doc_id="",
                                 content=finding.get("content_preview", finding.get("note", ""))[:500],
@@ -72,7 +72,7 @@ class EntityExtractionAgent:
             rel_objs = []
             for r in relationships:
                 rel_objs.append(
-                    Relationship(
+                    Relationship.model_construct(
                         source_entity_id=r["source"],
                         target_entity_id=r["target"],
                         relationship_type=r.get("type", "ASSOCIATED_WITH"),
@@ -12,7 +12,7 @@ from loguru import logger
 from core.state import InvestigationState, SemanticLink
 from core.config import settings
 from rag.indexer import index_documents_from_state
-from rag.vector_store import get_chroma_client, get_or_create_collection, query_similar
+from rag.vector_store import get_or_create_collection, query_similar
 from rag.embeddings import get_embedding_model
 
 # Stopwords (PT/EN) for shared_concepts extraction
@@ -100,8 +100,7 @@ class SemanticLinkerAgent:
                 return state
 
             model = get_embedding_model()
-            client = get_chroma_client()
-            collection = get_or_create_collection(client)
+            collection = get_or_create_collection()
 
             links: List[SemanticLink] = list(state.get("semantic_links", []))
             seen_pairs: Set[Tuple[str, str]] = set()
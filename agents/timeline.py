@@ -104,7 +104,7 @@ class TimelineReconstructorAgent:
                     ent_involved = _entities_in_doc_for_event(desc, entities, doc_id)
                     date_iso = dt.strftime("%Y-%m-%d") if dt and hasattr(dt, "strftime") else None
                     timeline.append(
-                        TimelineEvent(
+                        TimelineEvent.model_construct(
                             event_id=f"ev_{event_id}_{uuid.uuid4().hex[:6]}",
                             timestamp=dt,
                             inferred_timestamp=dt,
@@ -2,16 +2,21 @@
 SHERLOCK - FastAPI backend: health, investigate, events (polling + SSE), WebSocket.
 """
 
+import asyncio
 import json
 import re
+import time
 import uuid
 import threading
+from collections import OrderedDict
 from pathlib import Path
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, File, Form, Query, UploadFile
+import orjson
+from fastapi import FastAPI, File, Form, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import StreamingResponse
 import uvicorn
 
@@ -31,29 +36,49 @@ from core.memory import consolidate_memories
 from core.state import create_initial_state
 from core.graph import create_sherlock_graph
 
-# In-memory store for last run state (keyed by run_id)
-_runs: Dict[str, Dict[str, Any]] = {}
+# Process-wide activity monitor (singleton), bound once for all handlers
+_monitor = ActivityMonitor()
+
+# In-memory store for last run state (keyed by run_id); LRU-bounded to settings.API_MAX_RUNS
+_runs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 _runs_lock = threading.Lock()
 
+# Cached /health result: (monotonic timestamp, payload); refreshed after _HEALTH_TTL seconds
+_health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_HEALTH_TTL = 10.0
+
+# SSE framing constants for /events/stream (payload is already bytes from orjson)
+_SSE_ID_PREFIX = b"id: "
+_SSE_DATA_PREFIX = b"\ndata: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _store_run(run_id: str, record: Dict[str, Any]) -> None:
+    """Publish a run record, evicting the least recently used runs beyond API_MAX_RUNS."""
+    with _runs_lock:
+        _runs[run_id] = record
+        _runs.move_to_end(run_id)
+        while len(_runs) > settings.API_MAX_RUNS:
+            _runs.popitem(last=False)
+
 
 def _run_investigation(run_id: str, uploads_path: str) -> None:
     try:
         state = run_monitored_investigation(documents_path=uploads_path)
-        with _runs_lock:
-            _runs[run_id] = {
-                "status": "completed",
-                "state": {
-                    "document_metadata_count": len(state.get("document_metadata", {})),
-                    "entities_count": len(state.get("entities", {})),
-                    "relationships_count": len(state.get("relationships", [])),
-                    "current_step": state.get("current_step"),
-                    "odos_status": state.get("odos_status"),
-                },
-                "state_full": state,
-            }
+        _store_run(run_id, {
+            "status": "completed",
+            "state": {
+                "document_metadata_count": len(state.get("document_metadata", {})),
+                "entities_count": len(state.get("entities", {})),
+                "relationships_count": len(state.get("relationships", [])),
+                "current_step": state.get("current_step"),
+                "odos_status": state.get("odos_status"),
+            },
+            "state_full": state,
+        })
     except Exception as e:
-        with _runs_lock:
-            _runs[run_id] = {"status": "failed", "error": str(e)}
+        _store_run(run_id, {"status": "failed", "error": str(e)})
 
 
 def _run_investigation_and_save(investigation_id: str, uploads_path: str) -> None:
@@ -75,14 +100,35 @@ def _run_investigation_and_save(investigation_id: str, uploads_path: str) -> Non
         logger.exception(f"Investigation run failed: {e}")
 
 
+# Streaming endpoints served without GZip: older Starlette GZipMiddleware buffers text/event-stream
+_UNCOMPRESSED_PATHS = frozenset({"/events/stream"})
+
+
+class _GZipExceptStreams:
+    """GZipMiddleware for every HTTP path except _UNCOMPRESSED_PATHS (independent of the Starlette version)."""
+
+    def __init__(self, app: Any, minimum_size: int = 500) -> None:
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "http" and scope["path"] not in _UNCOMPRESSED_PATHS:
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    settings.ensure_dirs()
     yield
     # shutdown if needed
 
 
 app = FastAPI(title="SHERLOCK API", version="0.1.0", lifespan=lifespan)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+# Full investigation states are large, highly repetitive JSON (SSE streams are left uncompressed)
+app.add_middleware(_GZipExceptStreams, minimum_size=1024)
 
 
 @app.get("/")
@@ -96,18 +142,29 @@ def root() -> Dict[str, Any]:
     }
 
 
-@app.get("/health")
-def health() -> Dict[str, Any]:
-    """Status and optional Neo4j/Chroma check."""
-    result: Dict[str, Any] = {"status": "ok"}
+def _check_neo4j() -> str:
+    """Blocking Neo4j connectivity probe (run off the event loop)."""
     try:
         from knowledge_graph.neo4j_client import Neo4jClient
         c = Neo4jClient()
         c.connect()
         c.close()
-        result["neo4j"] = "connected"
+        return "connected"
     except Exception as e:
-        result["neo4j"] = str(e)
+        return str(e)
+
+
+@app.get("/health")
+async def health() -> Dict[str, Any]:
+    """Status and optional Neo4j/Chroma check (cached for a few seconds)."""
+    global _health_cache
+    now = time.monotonic()
+    cached = _health_cache
+    if cached is not None and now - cached[0] < _HEALTH_TTL:
+        return cached[1]
+    result: Dict[str, Any] = {"status": "ok"}
+    result["neo4j"] = await asyncio.to_thread(_check_neo4j)
+    _health_cache = (time.monotonic(), result)
     return result
 
 
@@ -154,29 +211,53 @@ def get_investigations() -> Dict[str, Any]:
     return {"investigations": items}
 
 
-@app.get("/investigations/{investigation_id}")
-def get_investigation(investigation_id: str) -> Dict[str, Any]:
-    """Get investigation meta and summary (doc_count, entity_count from last state)."""
-    meta = get_meta(investigation_id)
-    if not meta:
-        return {"error": "not_found", "investigation_id": investigation_id}
-    state = inv_load_state(investigation_id)
-    summary = {}
+def _state_summary(state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Counts and status from the last saved state (empty before the first run)."""
+    summary: Dict[str, Any] = {}
     if state:
         summary["document_count"] = len(state.get("document_metadata", {}))
         summary["entity_count"] = len(state.get("entities", {})) if isinstance(state.get("entities"), dict) else 0
         summary["relationship_count"] = len(state.get("relationships", []))
+        summary["hypothesis_count"] = len(state.get("hypotheses", []) or [])
         summary["current_step"] = state.get("current_step")
         summary["odos_status"] = state.get("odos_status")
-    return {"meta": meta, "summary": summary}
+    return summary
+
+
+@app.get("/investigations/{investigation_id}")
+def get_investigation(investigation_id: str) -> Dict[str, Any]:
+    """Get investigation meta and summary (doc_count, entity_count from last state)."""
+    meta = get_meta(investigation_id)
+    if not meta:
+        return {"error": "not_found", "investigation_id": investigation_id}
+    return {"meta": meta, "summary": _state_summary(inv_load_state(investigation_id))}
+
+
+@app.get("/investigations/{investigation_id}/summary")
+def get_investigation_overview(investigation_id: str) -> Dict[str, Any]:
+    """Meta, state summary and uploaded files in one response (what the dashboard shows)."""
+    meta = get_meta(investigation_id)
+    if not meta:
+        return {"error": "not_found", "investigation_id": investigation_id}
+    return {
+        "meta": meta,
+        "summary": _state_summary(inv_load_state(investigation_id)),
+        **_uploaded_files(meta),
+    }
 
 
 @app.get("/investigations/{investigation_id}/state")
-def get_investigation_state(investigation_id: str, full: bool = Query(True, description="Full state")) -> Dict[str, Any]:
-    """Get investigation state (full or summary)."""
+def get_investigation_state(
+    investigation_id: str,
+    full: bool = Query(True, description="Full state"),
+    fields: Optional[str] = Query(None, description="Comma-separated top-level state keys to return (full state only)"),
+) -> Dict[str, Any]:
+    """Get investigation state (full or summary); `fields` trims the full state to what a view needs."""
     state = inv_load_state(investigation_id)
     if not state:
         return {"error": "not_found", "investigation_id": investigation_id}
+    if full and fields:
+        return {"state": {k: state[k] for k in fields.split(",") if k in state}}
     if full:
         return {"state": state}
     return {
@@ -272,15 +353,6 @@ async def post_investigation_uploads(
             desc_by_file.update(json.loads(descriptions))
         except Exception:
             pass
-    # Load existing descriptions to merge
-    desc_path = upload_dir / "descriptions.json"
-    if desc_path.exists():
-        try:
-            existing = json.loads(desc_path.read_text(encoding="utf-8"))
-            if isinstance(existing, dict):
-                desc_by_file = {**existing, **desc_by_file}
-        except Exception:
-            pass
     seen: Dict[str, int] = {}
     for u in files:
         if not u.filename:
@@ -309,6 +381,16 @@ async def post_investigation_uploads(
                 desc_by_file[final_name] = d.get(final_name) or d.get(u.filename or "", "")
             except Exception:
                 pass
+    # Merge existing descriptions only after the last await: concurrent uploads to the same
+    # investigation then cannot interleave between this read and the write below
+    desc_path = upload_dir / "descriptions.json"
+    if desc_path.exists():
+        try:
+            existing = json.loads(desc_path.read_text(encoding="utf-8"))
+            if isinstance(existing, dict):
+                desc_by_file = {**existing, **desc_by_file}
+        except Exception:
+            pass
     if desc_by_file and "*" in desc_by_file:
         global_desc = desc_by_file.pop("*", "")
         for n in uploaded_names:
@@ -328,6 +410,11 @@ def get_investigation_files(investigation_id: str) -> Dict[str, Any]:
     meta = get_meta(investigation_id)
     if not meta:
         return {"error": "not_found", "investigation_id": investigation_id}
+    return _uploaded_files(meta)
+
+
+def _uploaded_files(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """{"files": [{name, size, description}], "uploads_path"} for an investigation's uploads folder."""
     uploads_path = meta.get("uploads_path")
     if not uploads_path:
         return {"files": [], "uploads_path": None}
@@ -373,19 +460,21 @@ def post_investigation_run(investigation_id: str) -> Dict[str, Any]:
 @app.get("/runs/{run_id}")
 def get_run(run_id: str, full: bool = Query(False, description="Include full state")) -> Dict[str, Any]:
     """Get run status and state (if completed). Use ?full=1 for full state (hypotheses, report_summary, etc.)."""
+    # Run records are replaced wholesale, never mutated, so projecting outside the lock is safe.
     with _runs_lock:
-        data = dict(_runs.get(run_id, {"status": "unknown"}))
+        data = _runs.get(run_id)
+        if data is not None:
+            _runs.move_to_end(run_id)
+    if data is None:
+        return {"status": "unknown"}
+    out = {k: v for k, v in data.items() if k != "state_full"}
     if full and isinstance(data.get("state_full"), dict):
-        data["state"] = data.pop("state_full", None)
-        return data
-    if isinstance(data, dict) and "state_full" in data:
-        out = {k: v for k, v in data.items() if k != "state_full"}
-        return out
-    return data
+        out["state"] = data["state_full"]
+    return out
 
 
 @app.post("/search")
-def search(body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+async def search(body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Hybrid search (vector + graph). Body: {"query": "...", "run_id": "..." or "investigation_id": "...", "n_results": 10}."""
     body = body or {}
     query = body.get("query", "").strip()
@@ -396,42 +485,59 @@ def search(body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     n_results = min(50, max(1, int(body.get("n_results", 10))))
     state: Dict[str, Any] = {}
     if investigation_id:
-        state = inv_load_state(investigation_id) or {}
+        state = await asyncio.to_thread(inv_load_state, investigation_id) or {}
     elif run_id:
+        # Only grab the reference under the lock; run records are published by a single
+        # assignment and never mutated, so the state is read-only from here on.
         with _runs_lock:
-            data = _runs.get(run_id, {})
-            state = data.get("state_full") or {}
+            state_ref = _runs.get(run_id, {}).get("state_full")
+        state = state_ref or {}
     try:
         from rag.hybrid_search import hybrid_search
-        results = hybrid_search(query, state, n_results=n_results)
+        # Vector + graph search is blocking; keep it off the event loop.
+        results = await asyncio.to_thread(hybrid_search, query, state, n_results=n_results)
         return {"results": results}
     except Exception as e:
         return {"results": [], "error": str(e)}
 
 
 @app.get("/events")
-def get_events(n: int = Query(50, ge=1, le=500)) -> Dict[str, Any]:
-    """Poll recent activity events (for dashboard)."""
-    events = ActivityMonitor().get_recent(n)
+def get_events(
+    n: int = Query(50, ge=1, le=500),
+    since: Optional[int] = Query(None, ge=0, description="Only events with seq > since"),
+) -> Dict[str, Any]:
+    """Poll recent activity events (for dashboard). Pass since=<last seq> to get only new events."""
+    if since is not None:
+        events = _monitor.get_since(since, n=n)
+    else:
+        events = _monitor.get_recent(n)
     return {"events": events}
 
 
 @app.get("/events/stream")
-def events_stream():
-    """SSE stream of activity events (polling every 2s)."""
-    import time
-    import json
+def events_stream(request: Request):
+    """SSE stream of new activity events (checked every 2s). Honors Last-Event-ID on reconnect."""
+    try:
+        start_seq = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        start_seq = 0
 
     def gen():
+        last_seq = start_seq
         while True:
-            events = ActivityMonitor().get_recent(50)
-            yield f"data: {json.dumps({'events': events})}\n\n"
+            events = _monitor.get_since(last_seq, n=50)
+            if events:
+                last_seq = events[-1]["seq"]
+                yield b"".join((
+                    _SSE_ID_PREFIX, str(last_seq).encode(), _SSE_DATA_PREFIX,
+                    orjson.dumps({"events": events}), _SSE_SUFFIX,
+                ))
             time.sleep(2)
 
     return StreamingResponse(
         gen(),
         media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        headers=_SSE_HEADERS,
     )
 
 
@@ -477,4 +583,5 @@ app.include_router(ws_router, tags=["websocket"])
 
 
 if __name__ == "__main__":
-    uvicorn.run("api.main:app", host="0.0.0.0", port=8001, reload=False)
+    # Keep-alive above the Streamlit client's pool expiry (60s), so polling UIs reuse their connection
+    uvicorn.run("api.main:app", host="0.0.0.0", port=8001, reload=False, timeout_keep_alive=75)
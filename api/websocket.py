@@ -3,6 +3,7 @@ SHERLOCK - WebSocket endpoint for real-time activity events.
 """
 
 import asyncio
+import orjson
 from fastapi import APIRouter
 from fastapi import WebSocket, WebSocketDisconnect
 
@@ -10,15 +11,21 @@ from core.monitors import ActivityMonitor
 
 router = APIRouter()
 
+# Process-wide activity monitor (singleton), bound once for the polling loops
+_monitor = ActivityMonitor()
+
 
 @router.websocket("/ws")
 async def websocket_events(websocket: WebSocket) -> None:
-    """Send activity events every 2 seconds until client disconnects."""
+    """Send new activity events every 2 seconds until client disconnects (first message: last 50)."""
     await websocket.accept()
+    last_seq = 0
     try:
         while True:
-            events = ActivityMonitor().get_recent(50)
-            await websocket.send_json({"type": "activity", "events": events})
+            events = _monitor.get_since(last_seq, n=50)
+            if events:
+                last_seq = events[-1]["seq"]
+                await websocket.send_text(orjson.dumps({"type": "activity", "events": events}).decode())
             await asyncio.sleep(2)
     except WebSocketDisconnect:
         pass
@@ -28,16 +35,19 @@ async def websocket_events(websocket: WebSocket) -> None:
 
 @router.websocket("/ws/investigation/{investigation_id}")
 async def websocket_investigation(websocket: WebSocket, investigation_id: str) -> None:
-    """Send activity events for a single investigation every 1-2s. For Pipeline Monitor."""
+    """Send new activity events for a single investigation every 1-2s. For Pipeline Monitor."""
     await websocket.accept()
+    last_seq = 0
     try:
         while True:
-            events = ActivityMonitor().get_recent(100, investigation_id=investigation_id)
-            await websocket.send_json({
-                "type": "activity",
-                "investigation_id": investigation_id,
-                "events": events,
-            })
+            events = _monitor.get_since(last_seq, n=100, investigation_id=investigation_id)
+            if events:
+                last_seq = events[-1]["seq"]
+                await websocket.send_text(orjson.dumps({
+                    "type": "activity",
+                    "investigation_id": investigation_id,
+                    "events": events,
+                }).decode())
             await asyncio.sleep(1)
     except WebSocketDisconnect:
         pass
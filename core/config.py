@@ -3,9 +3,10 @@ SHERLOCK Intelligence System - Configuration Management
 Centralized configuration using pydantic-settings.
 """
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
-from typing import Optional, List
+from typing import ClassVar, Optional, List, Set
 
 
 class Settings(BaseSettings):
@@ -38,13 +39,29 @@ class Settings(BaseSettings):
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = "sherlock123"
     NEO4J_DATABASE: str = "neo4j"
+    # Bolt pool: keep NEO4J_POOL_SIZE above the number of concurrent workers/threads
+    NEO4J_POOL_SIZE: int = 64
+    # Parallel sessions for bulk entity/relationship writes (1 = single writer)
+    NEO4J_INGEST_WORKERS: int = 8
+    NEO4J_ACQUISITION_TIMEOUT: float = 30.0
+    NEO4J_TX_RETRY_TIME: float = 15.0
+    NEO4J_FETCH_SIZE: int = 1000
 
     CHROMA_HOST: str = "localhost"
     CHROMA_PORT: int = 8000
     CHROMA_COLLECTION: str = "sherlock_documents"
+    # "chroma" (default) or "faiss": on-disk FAISS index under EMBEDDINGS_DIR (needs faiss-cpu/faiss-gpu)
+    VECTOR_BACKEND: str = "chroma"
+    # FAISS backend only: store int8 scalar-quantized vectors (4x less index RAM/disk); applies to new indexes
+    FAISS_SQ8: bool = False
 
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DIMENSION: int = 384
+    # API embeddings (EMBEDDING_PROVIDER=openai): texts per request and requests in flight
+    EMBED_API_BATCH_SIZE: int = 256
+    EMBED_CONCURRENCY: int = 4
+    # Documents whose chunks are written to the vector store concurrently when indexing
+    INDEX_WORKERS: int = 4
 
     SPACY_MODEL_PT: str = "pt_core_news_lg"
     SPACY_MODEL_EN: str = "en_core_web_lg"
@@ -80,6 +97,18 @@ class Settings(BaseSettings):
     LANGCHAIN_TRACING_V2: bool = False
     LANGCHAIN_PROJECT: str = "sherlock-intelligence"
 
+    # API: completed runs kept in memory for GET /runs (least recently used evicted first)
+    API_MAX_RUNS: int = 100
+
+    # Store writes (meta/state/LTM): "strict" fsyncs before the atomic rename, "relaxed" skips fsync
+    LTM_DURABILITY: str = "strict"
+
+    # Cryptanalysis: worker processes for detector scans over large batches (0 = one per CPU, 1 = serial)
+    CRYPTO_WORKERS: int = 0
+
+    # Knowledge graph: "cugraph" runs PageRank/betweenness/Louvain on the GPU (needs RAPIDS); "" keeps Neo4j GDS
+    GPU_GRAPH_BACKEND: str = ""
+
     LOG_LEVEL: str = "INFO"
     LOG_FILE: Path = PROJECT_ROOT / "sherlock.log"
 
@@ -87,6 +116,11 @@ class Settings(BaseSettings):
     CHECKPOINT_DIR: Optional[Path] = None  # Set to PROJECT_ROOT / "checkpoints" to enable
     # Human-in-the-loop: pause before ODOS Guardian (Fase 4). Set False to run without interrupt.
     INTERRUPT_BEFORE_ODOS: bool = True
+    # Create data directories on first Settings construction. Set False for read-only deployments.
+    CREATE_DATA_DIRS: bool = True
+
+    # Process-wide guard: each data directory path is created at most once (other paths still are).
+    _dirs_created: ClassVar[Set[Path]] = set()
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -95,14 +129,22 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    @model_validator(mode="after")
+    def _create_dirs_once(self) -> "Settings":
+        if self.CREATE_DATA_DIRS:
+            self.ensure_dirs()
+        return self
+
+    def ensure_dirs(self) -> None:
+        """Create data directories (idempotent; touches the filesystem once per path per process)."""
         for dir_path in [
             self.DATA_DIR, self.UPLOADS_DIR, self.PROCESSED_DIR,
             self.QUARANTINE_DIR, self.EMBEDDINGS_DIR, self.GRAPHS_DIR,
             self.REPORTS_DIR, self.KNOWLEDGE_BASE_DIR, self.INVESTIGATIONS_DIR,
         ]:
-            dir_path.mkdir(parents=True, exist_ok=True)
+            if dir_path not in Settings._dirs_created:
+                dir_path.mkdir(parents=True, exist_ok=True)
+                Settings._dirs_created.add(dir_path)
 
 
 settings = Settings()
@@ -0,0 +1,35 @@
+"""
+SHERLOCK - File I/O helpers shared by the investigation store and memory layers.
+"""
+
+import os
+from pathlib import Path
+from typing import Set
+
+from core.config import settings
+
+# Directories already created by ensure_dir in this process
+_made_dirs: Set[Path] = set()
+
+
+def ensure_dir(path: Path) -> Path:
+    """mkdir -p once per process per path; later calls are a set lookup, not a syscall."""
+    if path not in _made_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _made_dirs.add(path)
+    return path
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a .tmp sibling and os.replace so readers never see a partial file."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if settings.LTM_DURABILITY != "relaxed":
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
@@ -10,7 +10,10 @@ Agent call flow (orchestration):
 - After odos_guardian, _after_guardian_route maps odos_status to report, refinement, or blocked; all go to END.
 """
 
+import threading
 import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
 from langgraph.graph import StateGraph, END
 from loguru import logger
 
@@ -29,71 +32,101 @@ from core.config import settings
 from core.memory import consolidate_memories
 
 
+# odos_status -> route after the Guardian; anything else (NEEDS_REVIEW, PENDING) -> refinement
+_ROUTE_MAP = {"VALID": "report", "BLOCKED": "blocked"}
+
+
 def _after_guardian_route(state: InvestigationState) -> str:
     """Soul: VALID → report; NEEDS_REVIEW → refinement (human); BLOCKED → blocked. All go to END."""
-    odos = state.get("odos_status", "PENDING")
-    if odos == "VALID":
-        return "report"
-    if odos == "BLOCKED":
-        return "blocked"
-    return "refinement"
+    return _ROUTE_MAP.get(state.get("odos_status", "PENDING"), "refinement")
+
+
+# Pipeline nodes in execution order: (node name, factory returning the node's process callable).
+_AGENT_FACTORIES: List[Tuple[str, Callable[[], Callable[[InvestigationState], Any]]]] = [
+    ("ingest_documents", lambda: DocumentIngestionAgent().process),
+    ("classify_documents", lambda: DocumentClassifierAgent().process),
+    ("extract_entities", lambda: EntityExtractionAgent().process),
+    ("cryptanalysis_hunter", lambda: CryptanalysisHunterAgent().process),
+    ("semantic_linker", lambda: SemanticLinkerAgent().process),
+    ("timeline", lambda: TimelineReconstructorAgent().process),
+    ("pattern_recognition", lambda: PatternRecognitionAgent().process),
+    ("build_knowledge_graph", lambda: build_knowledge_graph),
+    ("synthesis", lambda: IntelligenceSynthesisAgent().process),
+    ("odos_guardian", lambda: odos_guardian_process),
+]
+
+# Static wiring precomputed at import: linear edges between consecutive pipeline nodes.
+_NODE_NAMES: Tuple[str, ...] = tuple(name for name, _ in _AGENT_FACTORIES)
+_EDGES: Tuple[Tuple[str, str], ...] = tuple(zip(_NODE_NAMES, _NODE_NAMES[1:]))
+_GUARDIAN_ROUTES = {"report": END, "refinement": END, "blocked": END}
+
+# Agent instances shared by every compiled graph in this process (spaCy etc. load once).
+_agent_nodes: Dict[str, Callable[[InvestigationState], Any]] = {}
+
+
+def _get_agent_node(name: str, factory: Callable[[], Callable[[InvestigationState], Any]]):
+    fn = _agent_nodes.get(name)
+    if fn is None:
+        fn = _agent_nodes[name] = factory()
+    return fn
+
+
+def build_graph(monitored: bool = False) -> StateGraph:
+    """Wire the pipeline (uncompiled). If monitored, each node emits start/end to ActivityMonitor."""
+    wrap_agent = None
+    if monitored:
+        from core.graph_enhanced import wrap_agent
+    workflow = StateGraph(InvestigationState)
+    for name, factory in _AGENT_FACTORIES:
+        fn = _get_agent_node(name, factory)
+        workflow.add_node(name, wrap_agent(name, fn) if wrap_agent else fn)
+    workflow.set_entry_point(_NODE_NAMES[0])
+    for src, dst in _EDGES:
+        workflow.add_edge(src, dst)
+    workflow.add_conditional_edges("odos_guardian", _after_guardian_route, _GUARDIAN_ROUTES)
+    return workflow
+
+
+# Checkpointer shared by every compile in this process (one SQLite connection, not one per compile).
+_checkpointer: Any = None
+_checkpointer_lock = threading.Lock()
+
+
+def _get_checkpointer():
+    """SqliteSaver on CHECKPOINT_DIR (WAL) if configured, else MemorySaver; created once per process."""
+    global _checkpointer
+    if _checkpointer is not None:
+        return _checkpointer
+    with _checkpointer_lock:
+        if _checkpointer is not None:
+            return _checkpointer
+        checkpointer = None
+        if getattr(settings, "CHECKPOINT_DIR", None) and settings.CHECKPOINT_DIR:
+            try:
+                import sqlite3
+                from langgraph.checkpoint.sqlite import SqliteSaver
+                settings.CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+                db_path = settings.CHECKPOINT_DIR / "checkpoints.db"
+                conn = sqlite3.connect(str(db_path), check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                checkpointer = SqliteSaver(conn)
+            except Exception as e:
+                logger.warning(f"Checkpointer disabled: {e}")
+        if checkpointer is None:
+            try:
+                from langgraph.checkpoint.memory import MemorySaver
+                checkpointer = MemorySaver()
+            except Exception:
+                pass
+        _checkpointer = checkpointer
+        return checkpointer
 
 
 def create_sherlock_graph():
     """Full workflow through synthesis and ODOS Guardian with conditional end."""
-    workflow = StateGraph(InvestigationState)
+    workflow = build_graph()
 
-    ingestion_agent = DocumentIngestionAgent()
-    classifier_agent = DocumentClassifierAgent()
-    entity_agent = EntityExtractionAgent()
-    crypto_agent = CryptanalysisHunterAgent()
-    semantic_agent = SemanticLinkerAgent()
-    timeline_agent = TimelineReconstructorAgent()
-    pattern_agent = PatternRecognitionAgent()
-    synthesis_agent = IntelligenceSynthesisAgent()
-
-    workflow.add_node("ingest_documents", ingestion_agent.process)
-    workflow.add_node("classify_documents", classifier_agent.process)
-    workflow.add_node("extract_entities", entity_agent.process)
-    workflow.add_node("cryptanalysis_hunter", crypto_agent.process)
-    workflow.add_node("semantic_linker", semantic_agent.process)
-    workflow.add_node("timeline", timeline_agent.process)
-    workflow.add_node("pattern_recognition", pattern_agent.process)
-    workflow.add_node("build_knowledge_graph", build_knowledge_graph)
-    workflow.add_node("synthesis", synthesis_agent.process)
-    workflow.add_node("odos_guardian", odos_guardian_process)
-
-    workflow.set_entry_point("ingest_documents")
-    workflow.add_edge("ingest_documents", "classify_documents")
-    workflow.add_edge("classify_documents", "extract_entities")
-    workflow.add_edge("extract_entities", "cryptanalysis_hunter")
-    workflow.add_edge("cryptanalysis_hunter", "semantic_linker")
-    workflow.add_edge("semantic_linker", "timeline")
-    workflow.add_edge("timeline", "pattern_recognition")
-    workflow.add_edge("pattern_recognition", "build_knowledge_graph")
-    workflow.add_edge("build_knowledge_graph", "synthesis")
-    workflow.add_edge("synthesis", "odos_guardian")
-    workflow.add_conditional_edges(
-        "odos_guardian",
-        _after_guardian_route,
-        {"report": END, "refinement": END, "blocked": END},
-    )
-
-    checkpointer = None
-    if getattr(settings, "CHECKPOINT_DIR", None) and settings.CHECKPOINT_DIR:
-        try:
-            from langgraph.checkpoint.sqlite import SqliteSaver
-            db_path = settings.CHECKPOINT_DIR / "checkpoints.db"
-            settings.CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
-            checkpointer = SqliteSaver.from_conn_string(str(db_path))
-        except Exception as e:
-            logger.warning(f"Checkpointer disabled: {e}")
-    if checkpointer is None:
-        try:
-            from langgraph.checkpoint.memory import MemorySaver
-            checkpointer = MemorySaver()
-        except Exception:
-            pass
+    checkpointer = _get_checkpointer()
     # Human-in-the-loop: pause before ODOS Guardian so user can review synthesis (Soul Fase 4).
     interrupt_before = getattr(settings, "INTERRUPT_BEFORE_ODOS", True)
     compile_kwargs = {}
@@ -3,69 +3,143 @@ SHERLOCK - Investigation store (Spec incremental).
 Persist investigations: meta.json (id, name, version, batches), state.json (full state).
 """
 
-import json
+import os
+import threading
+import time
 import uuid
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import orjson
 
 from core.config import settings
+from core.timeutil import now_iso
+from core.fileio import atomic_write_bytes, ensure_dir
 
 _META_FILE = "meta.json"
 _STATE_FILE = "state.json"
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# investigation_id -> ((mtime_ns, size), parsed doc); cached dicts are shared, treat as read-only
+_CACHE_LOCK = threading.Lock()
+_meta_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_state_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+# list_all result: (monotonic time, investigations dir mtime_ns, metas); reused for _LISTING_TTL_S
+_LISTING_TTL_S = 1.0
+_listing: Optional[Tuple[float, int, List[Dict[str, Any]]]] = None
+
+
+def _json_default(obj: Any) -> Any:
+    # Only called for leaves orjson cannot encode natively (datetime/date/numpy are native).
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "item") and callable(obj.item):
+        item = obj.item()
+        if isinstance(item, (int, float, bool)):
+            return item
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_json_default, option=_JSON_OPTS)
+
+
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data)
 
 
 def _inv_dir(investigation_id: str) -> Path:
-    settings.INVESTIGATIONS_DIR.mkdir(parents=True, exist_ok=True)
-    return settings.INVESTIGATIONS_DIR / investigation_id
+    return ensure_dir(settings.INVESTIGATIONS_DIR) / investigation_id
+
+
+def _stat_key(st: os.stat_result) -> Tuple[int, int]:
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_cached(cache: Dict[str, Any], investigation_id: str, path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Parse `path` unless the cached copy still matches its mtime/size."""
+    try:
+        key = _stat_key(os.stat(path))
+    except FileNotFoundError:
+        with _CACHE_LOCK:
+            cache.pop(investigation_id, None)
+        return None
+    with _CACHE_LOCK:
+        hit = cache.get(investigation_id)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    try:
+        with open(path, "rb") as f:
+            key = _stat_key(os.fstat(f.fileno()))
+            data = _loads(f.read())
+    except Exception:
+        return None
+    with _CACHE_LOCK:
+        cache[investigation_id] = (key, data)
+    return data
+
+
+def _write_cached(cache: Dict[str, Any], investigation_id: str, path: Path, data: Dict[str, Any]) -> None:
+    """Write `data` to `path` and remember it as the parsed copy of the new file."""
+    global _listing
+    atomic_write_bytes(path, _dumps(data))
+    key = _stat_key(os.stat(path))
+    with _CACHE_LOCK:
+        cache[investigation_id] = (key, data)
+        if cache is _meta_cache:
+            _listing = None
 
 
 def create(investigation_id: Optional[str] = None, name: Optional[str] = None) -> str:
     """Create a new investigation; returns investigation_id."""
     inv_id = investigation_id or str(uuid.uuid4())
-    d = _inv_dir(inv_id)
-    d.mkdir(parents=True, exist_ok=True)
+    d = ensure_dir(_inv_dir(inv_id))
+    now = now_iso()
     meta = {
         "id": inv_id,
         "name": name or inv_id,
-        "created_at": datetime.utcnow().isoformat() + "Z",
-        "updated_at": datetime.utcnow().isoformat() + "Z",
+        "created_at": now,
+        "updated_at": now,
         "status": "active",
         "version": 1,
         "batches": [],
     }
-    (d / _META_FILE).write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_cached(_meta_cache, inv_id, d / _META_FILE, meta)
     return inv_id
 
 
 def list_all() -> List[Dict[str, Any]]:
-    """List all investigations (meta only)."""
+    """List all investigations (meta only, newest first; reused for up to 1s)."""
+    global _listing
     base = settings.INVESTIGATIONS_DIR
-    if not base.exists():
+    try:
+        dir_mtime = os.stat(base).st_mtime_ns
+    except FileNotFoundError:
         return []
+    now = time.monotonic()
+    listing = _listing
+    if listing is not None and listing[1] == dir_mtime and now - listing[0] < _LISTING_TTL_S:
+        return list(listing[2])
     result = []
-    for path in base.iterdir():
-        if path.is_dir():
-            meta_path = path / _META_FILE
-            if meta_path.exists():
-                try:
-                    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    with os.scandir(base) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                meta = _read_cached(_meta_cache, entry.name, os.path.join(entry.path, _META_FILE))
+                if meta is not None:
                     result.append(meta)
-                except Exception:
-                    pass
     result.sort(key=lambda m: m.get("updated_at", ""), reverse=True)
-    return result
+    with _CACHE_LOCK:
+        _listing = (now, dir_mtime, result)
+    return list(result)
 
 
 def get_meta(investigation_id: str) -> Optional[Dict[str, Any]]:
-    """Get meta for one investigation."""
-    meta_path = _inv_dir(investigation_id) / _META_FILE
-    if not meta_path.exists():
-        return None
-    try:
-        return json.loads(meta_path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
+    """Get meta for one investigation (cached; do not mutate the result)."""
+    return _read_cached(_meta_cache, investigation_id, _inv_dir(investigation_id) / _META_FILE)
 
 
 def update_meta(investigation_id: str, updates: Dict[str, Any]) -> None:
@@ -73,47 +147,32 @@ def update_meta(investigation_id: str, updates: Dict[str, Any]) -> None:
     meta = get_meta(investigation_id)
     if not meta:
         return
-    meta.update(updates)
-    meta["updated_at"] = datetime.utcnow().isoformat() + "Z"
-    meta_path = _inv_dir(investigation_id) / _META_FILE
-    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    meta = {**meta, **updates, "updated_at": now_iso()}
+    _write_cached(_meta_cache, investigation_id, _inv_dir(investigation_id) / _META_FILE, meta)
 
 
 def load_state(investigation_id: str) -> Optional[Dict[str, Any]]:
-    """Load full state from state.json. Returns None if not found."""
-    state_path = _inv_dir(investigation_id) / _STATE_FILE
-    if not state_path.exists():
-        return None
-    try:
-        return json.loads(state_path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
+    """Load full state from state.json (cached; do not mutate). Returns None if not found."""
+    return _read_cached(_state_cache, investigation_id, _inv_dir(investigation_id) / _STATE_FILE)
 
 
 def save_state(investigation_id: str, state: Dict[str, Any]) -> None:
     """Persist state to state.json and update meta.updated_at and meta.version."""
-    d = _inv_dir(investigation_id)
-    d.mkdir(parents=True, exist_ok=True)
+    d = ensure_dir(_inv_dir(investigation_id))
     state_path = d / _STATE_FILE
-    # Serialize; handle non-JSON-serializable (e.g. datetime)
-    def _serialize(obj: Any) -> Any:
-        if hasattr(obj, "isoformat"):
-            return obj.isoformat()
-        if isinstance(obj, dict):
-            return {k: _serialize(v) for k, v in obj.items()}
-        if isinstance(obj, (list, tuple)):
-            return [_serialize(x) for x in obj]
-        return obj
-    payload = _serialize(state)
-    state_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    meta_path = d / _META_FILE
-    if meta_path.exists():
-        meta = json.loads(meta_path.read_text(encoding="utf-8"))
-    else:
-        meta = {"id": investigation_id, "name": investigation_id, "batches": [], "version": 1}
-    meta["updated_at"] = datetime.utcnow().isoformat() + "Z"
-    meta["version"] = state.get("version", meta.get("version", 1))
-    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    atomic_write_bytes(state_path, _dumps(state))
+    # The caller keeps `state`, so drop the cached copy (re-parsed on the next load_state).
+    with _CACHE_LOCK:
+        _state_cache.pop(investigation_id, None)
+    # Another process may have rewritten meta.json since we cached it; revalidate by mtime/size.
+    meta = _read_cached(_meta_cache, investigation_id, d / _META_FILE)
+    meta = meta or {"id": investigation_id, "name": investigation_id, "batches": [], "version": 1}
+    meta = {
+        **meta,
+        "updated_at": now_iso(),
+        "version": state.get("version", meta.get("version", 1)),
+    }
+    _write_cached(_meta_cache, investigation_id, d / _META_FILE, meta)
 
 
 def append_batch(
@@ -126,18 +185,17 @@ def append_batch(
 ) -> None:
     """Append a batch entry to meta.batches."""
     meta_path = _inv_dir(investigation_id) / _META_FILE
-    if not meta_path.exists():
+    meta = _read_cached(_meta_cache, investigation_id, meta_path)
+    if meta is None:
         return
-    meta = json.loads(meta_path.read_text(encoding="utf-8"))
-    batches = meta.get("batches", [])
+    batches = list(meta.get("batches", []))
     batches.append({
         "batch_id": batch_id,
-        "added_at": datetime.utcnow().isoformat() + "Z",
+        "added_at": now_iso(),
         "doc_count": doc_count,
         "job_id": job_id,
         "entity_count_before": entity_count_before,
         "entity_count_after": entity_count_after,
     })
-    meta["batches"] = batches[-100:]
-    meta["updated_at"] = datetime.utcnow().isoformat() + "Z"
-    meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    meta = {**meta, "batches": batches[-100:], "updated_at": now_iso()}
+    _write_cached(_meta_cache, investigation_id, meta_path, meta)
@@ -3,23 +3,34 @@ SHERLOCK - LLM client for agents (Gemini via LangChain).
 Agents use get_llm(); if None, they keep rule-based behavior.
 """
 
+import threading
 from typing import Any, Optional
 from loguru import logger
 
 from core.config import settings
 
 
+# Marks "already tried, no LLM" so later calls skip the settings checks and the import
+_NO_LLM = object()
 _llm_cache: Optional[Any] = None
+_llm_lock = threading.Lock()
 
 
 def get_llm():
-    """Return a Gemini chat model if GEMINI_API_KEY is set; otherwise None."""
+    """Return a Gemini chat model if GEMINI_API_KEY is set; otherwise None (result cached per process)."""
+    llm = _llm_cache
+    if llm is None:
+        with _llm_lock:
+            llm = _llm_cache if _llm_cache is not None else _load_llm()
+    return None if llm is _NO_LLM else llm
+
+
+def _load_llm() -> Any:
     global _llm_cache
-    if _llm_cache is not None:
-        return _llm_cache
+    _llm_cache = _NO_LLM
     key = getattr(settings, "GEMINI_API_KEY", None)
     if not key or not str(key).strip():
-        return None
+        return _NO_LLM
     try:
         from langchain_google_genai import ChatGoogleGenerativeAI
         model = getattr(settings, "GEMINI_MODEL", "gemini-1.5-flash")
@@ -33,4 +44,4 @@ def get_llm():
         return llm
     except Exception as e:
         logger.warning(f"Gemini LLM not available: {e}")
-        return None
+        return _NO_LLM
@@ -11,7 +11,7 @@ from core.memory.long_term import (
     append_investigation_history,
     get_investigation_history,
 )
-from core.memory.episodic import record_episode, get_episodes
+from core.memory.episodic import record_episode, get_episodes, flush_episodes
 from core.memory.consolidate import consolidate_memories
 from core.memory.memory_manager import MemoryManager, get_memory_manager
 
@@ -26,6 +26,7 @@ __all__ = [
     "get_investigation_history",
     "record_episode",
     "get_episodes",
+    "flush_episodes",
     "consolidate_memories",
     "MemoryManager",
     "get_memory_manager",
@@ -12,7 +12,7 @@ from core.memory.long_term import (
     append_investigation_history,
     store_entity_profile,
 )
-from core.memory.episodic import record_episode
+from core.memory.episodic import record_episode, flush_episodes
 
 STM_IMPORTANCE_THRESHOLD = 0.8
 
@@ -71,4 +71,5 @@ def consolidate_memories(investigation_id: str, state: Dict[str, Any]) -> None:
     }
     append_investigation_history(investigation_id, summary)
     stm.clear(investigation_id)
+    flush_episodes()
     logger.info(f"Consolidated memories for {investigation_id}")
@@ -1,23 +1,91 @@
 """
 SHERLOCK - Episodic Memory.
 Soul: record per agent/investigation: action, reasoning, success (JSONL).
+Episodes are queued in memory and appended in batches by a background flusher.
 """
 
-import json
+import atexit
+import os
+import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from datetime import datetime
-from threading import Lock
+from typing import IO, Any, Deque, Dict, List, Optional
+from threading import Lock, Thread
+
+import orjson
+from loguru import logger
 
 from core.config import settings
+from core.fileio import ensure_dir
+from core.timeutil import now_iso
 
-_LOCK = Lock()
+_LOCK = Lock()  # guards the JSONL file (writer handle and reads)
+_QUEUE_LOCK = Lock()
+_queue: Deque[bytes] = deque()  # serialized JSONL lines
+_writer_fh: Optional[IO[bytes]] = None
+_writer_path: Optional[Path] = None
+_flusher: Optional[Thread] = None
+_FLUSH_INTERVAL_S = 0.05
+_WRITE_BUFFER = 1 << 18
 
 
 def _episodic_dir() -> Path:
-    d = settings.KNOWLEDGE_BASE_DIR / "episodic"
-    d.mkdir(parents=True, exist_ok=True)
-    return d
+    return ensure_dir(settings.KNOWLEDGE_BASE_DIR / "episodic")
+
+
+def _episodes_path() -> Path:
+    return _episodic_dir() / "episodes.jsonl"
+
+
+def _get_writer() -> IO[bytes]:
+    """Append handle kept open between batches (reopened if the knowledge base dir changes)."""
+    global _writer_fh, _writer_path
+    path = _episodes_path()
+    if _writer_fh is None or _writer_path != path:
+        if _writer_fh is not None:
+            _writer_fh.close()
+        _writer_fh = open(path, "ab", buffering=_WRITE_BUFFER)
+        _writer_path = path
+    return _writer_fh
+
+
+def flush_episodes() -> None:
+    """Write all queued episodes to JSONL in a single write()."""
+    global _writer_fh
+    with _LOCK:
+        with _QUEUE_LOCK:
+            if not _queue:
+                return
+            batch = list(_queue)
+            _queue.clear()
+        try:
+            fh = _get_writer()
+            fh.write(b"".join(batch))
+            fh.flush()
+        except Exception:
+            _writer_fh = None  # reopen on the next attempt
+            # Put the batch back in front of anything queued meanwhile; the next flush retries it.
+            with _QUEUE_LOCK:
+                _queue.extendleft(reversed(batch))
+            raise
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(_FLUSH_INTERVAL_S)
+        try:
+            flush_episodes()
+        except Exception:
+            logger.exception("Episodic memory flush failed; episodes re-queued")
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is None:
+        with _QUEUE_LOCK:
+            if _flusher is None:
+                _flusher = Thread(target=_flush_loop, name="episodic-flusher", daemon=True)
+                _flusher.start()
 
 
 def record_episode(
@@ -28,21 +96,46 @@ def record_episode(
     success: bool = True,
     metadata: Optional[Dict[str, Any]] = None,
 ) -> None:
-    """Append one episode (agent decision) to JSONL."""
-    d = _episodic_dir()
-    file_path = d / "episodes.jsonl"
+    """Queue one episode (agent decision); the background flusher appends it to JSONL."""
     entry = {
         "agent_id": agent_id,
         "investigation_id": investigation_id,
         "action": action,
         "reasoning": reasoning[:500] if reasoning else "",
         "success": success,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": now_iso(),
         "metadata": metadata or {},
     }
-    with _LOCK:
-        with open(file_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    line = orjson.dumps(entry) + b"\n"  # serialize here so bad input fails at the caller
+    with _QUEUE_LOCK:
+        _queue.append(line)
+    _ensure_flusher()
+
+
+atexit.register(flush_episodes)
+
+
+_TAIL_CHUNK = 65536
+
+
+def _tail_lines(path: Path, n: int) -> List[bytes]:
+    """Last `n` lines of a file, reading backwards in 64 KiB blocks (O(n) not O(file))."""
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = bytearray()
+        newlines = 0
+        # n + 1 newlines guarantee n complete lines (the file ends with a newline)
+        while pos > 0 and newlines <= n:
+            step = min(_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            newlines += chunk.count(b"\n")
+            buf[:0] = chunk
+    lines = bytes(buf).splitlines()
+    return lines[-n:]
 
 
 def get_episodes(
@@ -51,20 +144,19 @@ def get_episodes(
     limit: int = 100,
 ) -> List[Dict[str, Any]]:
     """Read recent episodes from JSONL, optionally filtered."""
-    file_path = _episodic_dir() / "episodes.jsonl"
-    if not file_path.exists():
+    flush_episodes()
+    try:
+        with _LOCK:
+            lines = _tail_lines(_episodes_path(), limit * 2)
+    except FileNotFoundError:
         return []
-    lines = []
-    with _LOCK:
-        with open(file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
     episodes = []
-    for line in lines[-limit * 2:]:
+    for line in lines:
         line = line.strip()
         if not line:
             continue
         try:
-            ep = json.loads(line)
+            ep = orjson.loads(line)
             if investigation_id and ep.get("investigation_id") != investigation_id:
                 continue
             if agent_id and ep.get("agent_id") != agent_id:
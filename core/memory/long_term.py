@@ -1,42 +1,180 @@
 """
 SHERLOCK - Long-Term Memory (LTM).
 Soul: patterns, entity_profiles, extraction_method; persist in data/knowledge_base/.
+Stored as append-only JSONL (one record per line), compacted to the retention cap
+once a file holds twice as many records as it keeps.
 """
 
-import json
+import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Tuple, Union
 from threading import Lock
 
+import orjson
+
 from core.config import settings
+from core.fileio import atomic_write_bytes, ensure_dir
 
 _LOCK = Lock()
-_PATTERNS_FILE = "patterns.json"
-_ENTITY_PROFILES_FILE = "entity_profiles.json"
-_INVESTIGATION_HISTORY_FILE = "investigation_history.json"
+_PATTERNS_FILE = "patterns.jsonl"
+_ENTITY_PROFILES_FILE = "entity_profiles.jsonl"
+_INVESTIGATION_HISTORY_FILE = "investigation_history.jsonl"
+_EXTRACTION_METHODS_FILE = "extraction_methods.jsonl"
+
+_MAX_PATTERNS = 500
+_MAX_HISTORY = 100
+_MAX_EXTRACTION_METHODS = 200
+_MAX_PROFILES_PER_ENTITY = 20
+_MIN_COMPACT_RECORDS = 200
+
+# Pre-JSONL files (whole-document JSON), migrated on first access.
+_LEGACY_FILES = {
+    _PATTERNS_FILE: "patterns.json",
+    _ENTITY_PROFILES_FILE: "entity_profiles.json",
+    _INVESTIGATION_HISTORY_FILE: "investigation_history.json",
+    _EXTRACTION_METHODS_FILE: "extraction_methods.json",
+}
+
+
+class _LastN:
+    """The newest `maxlen` records; appends are O(1) and evict the oldest."""
+
+    def __init__(self, maxlen: int) -> None:
+        self.items: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.items.append(record)
+
+    def records(self) -> List[Dict[str, Any]]:
+        return list(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class _LastNPerEntity:
+    """Entity profiles: the newest _MAX_PROFILES_PER_ENTITY items per entity key."""
+
+    def __init__(self) -> None:
+        self.by_entity: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.count = 0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        items = self.by_entity.get(record.get("entity", "_unknown"))
+        if items is None:
+            items = self.by_entity[record.get("entity", "_unknown")] = deque(maxlen=_MAX_PROFILES_PER_ENTITY)
+        self.count += len(items) < _MAX_PROFILES_PER_ENTITY
+        items.append({"profile": record.get("profile"), "investigation_id": record.get("investigation_id")})
+
+    def grouped(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {key: list(items) for key, items in self.by_entity.items()}
+
+    def records(self) -> List[Dict[str, Any]]:
+        return _profiles_to_records(self.grouped())
+
+    def __len__(self) -> int:
+        return self.count
+
+
+_Retained = Union[_LastN, _LastNPerEntity]
+
+# Retention per store: only these records are kept in memory and survive compaction
+_RETENTION: Dict[str, Callable[[], _Retained]] = {
+    _PATTERNS_FILE: lambda: _LastN(_MAX_PATTERNS),
+    _ENTITY_PROFILES_FILE: _LastNPerEntity,
+    _INVESTIGATION_HISTORY_FILE: lambda: _LastN(_MAX_HISTORY),
+    _EXTRACTION_METHODS_FILE: lambda: _LastN(_MAX_EXTRACTION_METHODS),
+}
+
+# path -> ((mtime_ns, size), retained records, lines in file); re-parsed only when the file changes
+_cache: Dict[Path, Tuple[Optional[Tuple[int, int]], _Retained, int]] = {}
+
+_TOKEN_RE = re.compile(r"\w+")
+# id(pattern) -> (pattern, token set); holding the pattern keeps its id from being reused
+_pattern_tokens: Dict[int, Tuple[Dict[str, Any], FrozenSet[str]]] = {}
 
 
 def _kb_path(name: str) -> Path:
-    settings.KNOWLEDGE_BASE_DIR.mkdir(parents=True, exist_ok=True)
-    return settings.KNOWLEDGE_BASE_DIR / name
+    return ensure_dir(settings.KNOWLEDGE_BASE_DIR) / name
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _profiles_to_records(data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    return [{"entity": key, **item} for key, items in data.items() for item in items]
+
+
+def _migrate_legacy(path: Path) -> None:
+    """Convert an old whole-file JSON store next to `path` into JSONL (once)."""
+    legacy_name = _LEGACY_FILES.get(path.name)
+    if not legacy_name:
+        return
+    legacy = path.with_name(legacy_name)
+    if not legacy.is_file():
+        return
+    try:
+        data = orjson.loads(legacy.read_bytes())
+    except Exception:
+        return
+    records = _profiles_to_records(data) if isinstance(data, dict) else list(data)
+    _write_records(path, records)
+    legacy.rename(legacy.with_suffix(legacy.suffix + ".migrated"))
+
+
+def _write_records(path: Path, records: List[Dict[str, Any]]) -> None:
+    atomic_write_bytes(path, b"".join(orjson.dumps(r) + b"\n" for r in records))
+
 
+def _load_locked(path: Path) -> Tuple[_Retained, int]:
+    """Retained records of a JSONL store and its line count, re-parsed only if the file changed."""
+    key = _stat_key(path)
+    if key is None:
+        _migrate_legacy(path)
+        key = _stat_key(path)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1], cached[2]
+    retained = _RETENTION[path.name]()
+    lines = 0
+    if key is not None:
+        for line in path.read_bytes().splitlines():
+            if not line.strip():
+                continue
+            lines += 1
+            try:
+                retained.add(orjson.loads(line))
+            except Exception:
+                continue
+    _cache[path] = (key, retained, lines)
+    return retained, lines
 
-def _load_json(path: Path, default: Any) -> Any:
-    if not path.exists():
-        return default
+
+def _read_records(path: Path) -> _Retained:
+    """Retained records of a JSONL store (cached: callers copy, never mutate it)."""
     with _LOCK:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return default
+        return _load_locked(path)[0]
 
 
-def _save_json(path: Path, data: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+def _append_record(path: Path, entry: Dict[str, Any]) -> None:
+    """Append one record (O(1) write); compact the file once it holds twice what is retained."""
     with _LOCK:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        retained, lines = _load_locked(path)
+        with open(path, "ab") as f:
+            f.write(orjson.dumps(entry) + b"\n")
+        retained.add(entry)
+        lines += 1
+        if lines >= 2 * max(_MIN_COMPACT_RECORDS, len(retained)):
+            _write_records(path, retained.records())
+            lines = len(retained)
+        _cache[path] = (_stat_key(path), retained, lines)
 
 
 def store_pattern(
@@ -47,8 +185,6 @@ def store_pattern(
     investigation_id: Optional[str] = None,
 ) -> None:
     """Store a learned pattern in LTM (Soul)."""
-    path = _kb_path(_PATTERNS_FILE)
-    data = _load_json(path, [])
     entry = {
         "pattern_type": pattern_type,
         "description": description,
@@ -56,14 +192,12 @@ def store_pattern(
         "confidence": confidence,
         "investigation_id": investigation_id,
     }
-    data.append(entry)
-    _save_json(path, data[-500:])  # keep last 500
+    _append_record(_kb_path(_PATTERNS_FILE), entry)
 
 
 def get_patterns(pattern_type: Optional[str] = None, min_confidence: float = 0.0) -> List[Dict[str, Any]]:
-    """Retrieve patterns from LTM, optionally filtered."""
-    path = _kb_path(_PATTERNS_FILE)
-    data = _load_json(path, [])
+    """Retrieve patterns from LTM (last 500), optionally filtered."""
+    data = _read_records(_kb_path(_PATTERNS_FILE)).records()
     if pattern_type:
         data = [p for p in data if p.get("pattern_type") == pattern_type]
     if min_confidence > 0:
@@ -71,25 +205,44 @@ def get_patterns(pattern_type: Optional[str] = None, min_confidence: float = 0.0
     return data
 
 
+def _tokenize_pattern(p: Dict[str, Any]) -> FrozenSet[str]:
+    text = f"{p.get('description') or ''} {' '.join(p.get('evidence') or [])}"
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+
+def get_patterns_with_tokens(
+    pattern_type: Optional[str] = None,
+    min_confidence: float = 0.0,
+) -> List[Tuple[Dict[str, Any], FrozenSet[str]]]:
+    """Like get_patterns, paired with each pattern's lowercase word set (tokenized once per record)."""
+    with _LOCK:
+        records = _load_locked(_kb_path(_PATTERNS_FILE))[0].records()
+        pairs = []
+        for p in records:
+            hit = _pattern_tokens.get(id(p))
+            if hit is None:
+                hit = _pattern_tokens[id(p)] = (p, _tokenize_pattern(p))
+            pairs.append((p, hit[1]))
+        if len(_pattern_tokens) > 2 * len(records):
+            _pattern_tokens.clear()
+            _pattern_tokens.update((id(p), (p, t)) for p, t in pairs)
+    if pattern_type:
+        pairs = [(p, t) for p, t in pairs if p.get("pattern_type") == pattern_type]
+    if min_confidence > 0:
+        pairs = [(p, t) for p, t in pairs if p.get("confidence", 0) >= min_confidence]
+    return pairs
+
+
 def store_entity_profile(entity_text: str, profile: Dict[str, Any], investigation_id: Optional[str] = None) -> None:
     """Store or update entity profile in LTM."""
-    path = _kb_path(_ENTITY_PROFILES_FILE)
-    data = _load_json(path, {})
     key = (entity_text or "").strip() or "_unknown"
-    if key not in data:
-        data[key] = []
-    data[key].append({
-        "profile": profile,
-        "investigation_id": investigation_id,
-    })
-    data[key] = data[key][-20:]
-    _save_json(path, data)
+    entry = {"entity": key, "profile": profile, "investigation_id": investigation_id}
+    _append_record(_kb_path(_ENTITY_PROFILES_FILE), entry)
 
 
 def get_entity_profiles(entity_text: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
-    """Retrieve entity profiles from LTM."""
-    path = _kb_path(_ENTITY_PROFILES_FILE)
-    data = _load_json(path, {})
+    """Retrieve entity profiles from LTM (last 20 per entity)."""
+    data = _read_records(_kb_path(_ENTITY_PROFILES_FILE)).grouped()
     if entity_text is not None:
         key = (entity_text or "").strip() or "_unknown"
         return {key: data.get(key, [])}
@@ -98,22 +251,17 @@ def get_entity_profiles(entity_text: Optional[str] = None) -> Dict[str, List[Dic
 
 def store_extraction_method(source: str, method: str, confidence: float) -> None:
     """Store preferred extraction method by source (e.g. file type/producer)."""
-    path = _kb_path("extraction_methods.json")
-    data = _load_json(path, [])
-    data.append({"source": source, "method": method, "confidence": confidence})
-    _save_json(path, data[-200:])
+    entry = {"source": source, "method": method, "confidence": confidence}
+    _append_record(_kb_path(_EXTRACTION_METHODS_FILE), entry)
 
 
 def append_investigation_history(investigation_id: str, summary: Dict[str, Any]) -> None:
     """Append investigation summary to history."""
-    path = _kb_path(_INVESTIGATION_HISTORY_FILE)
-    data = _load_json(path, [])
-    data.append({"investigation_id": investigation_id, **summary})
-    _save_json(path, data[-100:])
+    entry = {"investigation_id": investigation_id, **summary}
+    _append_record(_kb_path(_INVESTIGATION_HISTORY_FILE), entry)
 
 
 def get_investigation_history(limit: int = 50) -> List[Dict[str, Any]]:
     """Return last N investigation summaries from LTM."""
-    path = _kb_path(_INVESTIGATION_HISTORY_FILE)
-    data = _load_json(path, [])
-    return list(data[-limit:])
+    items = _read_records(_kb_path(_INVESTIGATION_HISTORY_FILE)).items
+    return list(islice(items, max(len(items) - limit, 0), None))
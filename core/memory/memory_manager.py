@@ -3,12 +3,15 @@ SHERLOCK - Memory Manager (Fase 5).
 Single facade for STM, LTM, Episodic, and Semantic memory; orchestrates consolidate_memories.
 """
 
+import heapq
+import re
 from typing import Any, Dict, List, Optional
 
 from core.memory.short_term import get_stm, ShortTermMemory
 from core.memory.long_term import (
     store_pattern,
     get_patterns,
+    get_patterns_with_tokens,
     store_entity_profile,
     get_entity_profiles,
     append_investigation_history,
@@ -17,6 +20,8 @@ from core.memory.long_term import (
 from core.memory.episodic import record_episode, get_episodes
 from core.memory.consolidate import consolidate_memories
 
+_WORD_RE = re.compile(r"\w+")
+
 
 class MemoryManager:
     """
@@ -95,21 +100,14 @@ class MemoryManager:
         min_confidence: float = 0.0,
         limit: int = 20,
     ) -> List[Dict[str, Any]]:
-        """Semantic memory: filter LTM patterns by keyword/concept match on description and evidence."""
+        """Semantic memory: rank LTM patterns by words shared with description and evidence."""
         if not (query_text or "").strip():
             return get_patterns(pattern_type=pattern_type, min_confidence=min_confidence)[:limit]
-        words = set((query_text or "").lower().split())
-        all_p = get_patterns(pattern_type=pattern_type, min_confidence=min_confidence)
-        scored = []
-        for p in all_p:
-            desc = (p.get("description") or "").lower()
-            evidence = " ".join(p.get("evidence") or []).lower()
-            text = f"{desc} {evidence}"
-            score = sum(1 for w in words if w in text)
-            if score > 0:
-                scored.append((score, p))
-        scored.sort(key=lambda x: -x[0])
-        return [p for _, p in scored[:limit]]
+        words = frozenset(_WORD_RE.findall(query_text.lower()))
+        pairs = get_patterns_with_tokens(pattern_type=pattern_type, min_confidence=min_confidence)
+        scored = [(len(words & tokens), p) for p, tokens in pairs]
+        best = heapq.nlargest(limit, (x for x in scored if x[0] > 0), key=lambda x: x[0])
+        return [p for _, p in best]
 
     @staticmethod
     def query_entity_profiles(
@@ -3,13 +3,63 @@ SHERLOCK - Short-Term Memory (STM).
 Soul: during investigation - hashes, progress, failed docs, embeddings cache.
 """
 
-from typing import Any, Dict, List, Optional
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple
 from threading import Lock
 
-_store: Dict[str, Dict[str, Any]] = {}
+
+class _Shard:
+    """
+    Entries of one investigation with their own lock.
+    scopes: agent_id (or "global") -> key -> entry; by_importance: sorted (importance, scope, key).
+    """
+
+    __slots__ = ("lock", "scopes", "by_importance")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.scopes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.by_importance: List[Tuple[float, str, str]] = []
+
+    def put(self, scope: str, key: str, entry: Dict[str, Any]) -> None:
+        entries = self.scopes.setdefault(scope, {})
+        old = entries.get(key)
+        if old is not None:
+            i = bisect_left(self.by_importance, (_rank(old), scope, key))
+            del self.by_importance[i]
+        entries[key] = entry
+        insort(self.by_importance, (_rank(entry), scope, key))
+
+    def drop_scope(self, scope: str) -> None:
+        """Remove one agent's entries: O(k log N) in that agent's own keys."""
+        for key, entry in self.scopes.pop(scope, {}).items():
+            i = bisect_left(self.by_importance, (_rank(entry), scope, key))
+            del self.by_importance[i]
+
+    def at_least(self, scope: str, min_importance: float) -> List[Dict[str, Any]]:
+        """Entries of `scope` with importance >= min_importance: O(log N + matches)."""
+        entries = self.scopes.get(scope, {})
+        start = bisect_left(self.by_importance, (min_importance,))
+        return [entries[k] for _, s, k in self.by_importance[start:] if s == scope]
+
+
+def _rank(entry: Dict[str, Any]) -> float:
+    return float(entry.get("importance") or 0)
+
+
+# investigation_id -> shard; _lock only guards adding/removing shards
+_store: Dict[str, _Shard] = {}
 _lock = Lock()
 
 
+def _shard(investigation_id: str, create: bool = False) -> Optional[_Shard]:
+    shard = _store.get(investigation_id)
+    if shard is None and create:
+        with _lock:
+            shard = _store.setdefault(investigation_id, _Shard())
+    return shard
+
+
 def get_stm() -> "ShortTermMemory":
     return ShortTermMemory()
 
@@ -28,15 +78,16 @@ class ShortTermMemory:
         importance: float = 0.5,
         agent_id: Optional[str] = None,
     ) -> None:
-        with _lock:
-            k = f"{investigation_id}:{agent_id or 'global'}:{key}"
-            _store[k] = {
-                "investigation_id": investigation_id,
-                "agent_id": agent_id,
-                "key": key,
-                "content": content,
-                "importance": importance,
-            }
+        entry = {
+            "investigation_id": investigation_id,
+            "agent_id": agent_id,
+            "key": key,
+            "content": content,
+            "importance": importance,
+        }
+        shard = _shard(investigation_id, create=True)
+        with shard.lock:
+            shard.put(agent_id or "global", key, entry)
 
     def retrieve(
         self,
@@ -45,16 +96,20 @@ class ShortTermMemory:
         agent_id: Optional[str] = None,
         min_importance: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
-        with _lock:
-            prefix = f"{investigation_id}:{agent_id or 'global'}:"
-            if key:
-                prefix += key
-                items = [_store[k] for k in _store if k == prefix or k.startswith(prefix + ":")]
-            else:
-                items = [v for k, v in _store.items() if k.startswith(prefix)]
-            if min_importance is not None:
-                items = [x for x in items if x.get("importance", 0) >= min_importance]
-            return list(items)
+        shard = _shard(investigation_id)
+        if shard is None:
+            return []
+        scope = agent_id or "global"
+        with shard.lock:
+            if not key:
+                if min_importance is not None:
+                    return shard.at_least(scope, min_importance)
+                return list(shard.scopes.get(scope, {}).values())
+            prefix = key + ":"
+            items = [v for k, v in shard.scopes.get(scope, {}).items() if k == key or k.startswith(prefix)]
+        if min_importance is not None:
+            items = [x for x in items if x.get("importance", 0) >= min_importance]
+        return items
 
     def get_content(
         self,
@@ -62,19 +117,23 @@ class ShortTermMemory:
         key: str,
         agent_id: Optional[str] = None,
     ) -> Any:
-        with _lock:
-            k = f"{investigation_id}:{agent_id or 'global'}:{key}"
-            entry = _store.get(k)
+        shard = _shard(investigation_id)
+        if shard is None:
+            return None
+        with shard.lock:
+            entry = shard.scopes.get(agent_id or "global", {}).get(key)
             return entry["content"] if entry else None
 
     def clear(self, investigation_id: str, agent_id: Optional[str] = None) -> None:
-        with _lock:
-            prefix = f"{investigation_id}:"
-            if agent_id:
-                prefix += f"{agent_id}:"
-            to_del = [k for k in _store if k.startswith(prefix)]
-            for k in to_del:
-                del _store[k]
+        if not agent_id:
+            with _lock:
+                _store.pop(investigation_id, None)
+            return
+        shard = _shard(investigation_id)
+        if shard is None:
+            return
+        with shard.lock:
+            shard.drop_scope(agent_id)
 
     def clear_all(self) -> None:
         with _lock:
@@ -3,9 +3,27 @@ SHERLOCK - Activity monitoring for real-time dashboard and API.
 """
 
 import threading
-from collections import deque
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from collections import defaultdict, deque
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.timeutil import now_iso
+
+# Stored event: (seq, agent, step, timestamp, investigation_id, payload); dicts built on read
+_MAX_EVENTS = 500
+
+_Event = Tuple[int, str, str, str, Optional[str], Optional[Dict[str, Any]]]
+
+
+def _as_dict(e: _Event) -> Dict[str, Any]:
+    return {
+        "seq": e[0],
+        "agent": e[1],
+        "step": e[2],
+        "timestamp": e[3],
+        "investigation_id": e[4],
+        "payload": e[5] if e[5] is not None else {},
+    }
 
 
 class ActivityMonitor:
@@ -24,30 +42,64 @@ class ActivityMonitor:
     def __init__(self) -> None:
         if hasattr(self, "_events"):
             return
-        self._events: deque = deque(maxlen=500)
+        self._events: deque = deque(maxlen=_MAX_EVENTS)
+        # Same events indexed by investigation_id (tuples are shared, not copied)
+        self._by_inv: Dict[str, deque] = defaultdict(lambda: deque(maxlen=_MAX_EVENTS))
         self._events_lock = threading.Lock()
+        # Monotonic event sequence (not reset by clear) so clients can ask for deltas.
+        self._seq = 0
 
-    def emit(self, agent: str, step: str, investigation_id: Optional[str] = None, **kwargs: Any) -> None:
-        """Append an event: agent name, step (start/end), optional investigation_id and payload."""
-        event: Dict[str, Any] = {
-            "agent": agent,
-            "step": step,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "investigation_id": investigation_id,
-            "payload": dict(kwargs) if kwargs else {},
-        }
+    def emit(
+        self,
+        agent: str,
+        step: str,
+        investigation_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Append an event: agent name, step (start/end), optional investigation_id and payload (not copied)."""
+        timestamp = now_iso()
         with self._events_lock:
+            self._seq += 1
+            event = (self._seq, agent, step, timestamp, investigation_id, payload)
             self._events.append(event)
+            if investigation_id:
+                if investigation_id not in self._by_inv:
+                    self._prune_investigations()
+                self._by_inv[investigation_id].append(event)
+
+    def _prune_investigations(self) -> None:
+        """Drop per-investigation buffers whose events have all left the global buffer."""
+        oldest = self._events[0][0]
+        for iid in [iid for iid, d in self._by_inv.items() if d[-1][0] < oldest]:
+            del self._by_inv[iid]
 
     def get_recent(self, n: int = 50, investigation_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Return the last n events (newest last). If investigation_id is set, filter by it."""
+        """Return the last n events (newest last); with investigation_id, the last n of that investigation."""
+        with self._events_lock:
+            if investigation_id:
+                source = self._by_inv.get(investigation_id, ())
+            else:
+                source = self._events
+            events = list(islice(reversed(source), max(n, 0)))
+        events.reverse()
+        return [_as_dict(e) for e in events]
+
+    def get_since(self, last_seq: int = 0, n: Optional[int] = None, investigation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return events with seq > last_seq (oldest first), at most the newest n. Optional investigation filter."""
+        new: List[_Event] = []
         with self._events_lock:
-            events = list(self._events)[-n:]
-        if investigation_id:
-            events = [e for e in events if e.get("investigation_id") == investigation_id]
-        return events
+            source = self._by_inv.get(investigation_id, ()) if investigation_id else self._events
+            for e in reversed(source):
+                if e[0] <= last_seq:
+                    break
+                new.append(e)
+        new.reverse()
+        if n is not None:
+            new = new[-n:]
+        return [_as_dict(e) for e in new]
 
     def clear(self) -> None:
         """Clear all events."""
         with self._events_lock:
             self._events.clear()
+            self._by_inv.clear()
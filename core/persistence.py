@@ -5,14 +5,18 @@ Tracks per-document status per investigation so ingestion can skip DONE and retr
 
 import sqlite3
 import threading
-from datetime import datetime
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Sequence, Set, Tuple
 
 from core.config import settings
 
+# One connection per thread; _LOCK only guards the one-time schema bootstrap per database file
+_TLS = threading.local()
 _LOCK = threading.Lock()
-_CONN: Optional[sqlite3.Connection] = None
+_BOOTSTRAPPED: Set[Path] = set()
 
 def _ledger_path() -> Path:
     return getattr(settings, "LEDGER_DB_PATH", None) or (settings.DATA_DIR / "processing_ledger.db")
@@ -22,101 +26,234 @@ STATUS_PROCESSING = "PROCESSING"
 STATUS_DONE = "DONE"
 STATUS_FAILED = "FAILED"
 
+# Applied to every connection as it is opened: WAL lets readers run during a write and
+# NORMAL sync fsyncs only at checkpoints.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
 
-def _get_conn() -> sqlite3.Connection:
-    global _CONN
+
+def _connect(path: Path) -> sqlite3.Connection:
+    # Autocommit mode: writes drive their own transactions (BEGIN IMMEDIATE ... COMMIT)
+    # Room for the single-row upsert plus one multi-row upsert per distinct chunk size seen
+    conn = sqlite3.connect(str(path), isolation_level=None, cached_statements=256)
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS doc_processing_ledger (
+    doc_hash TEXT NOT NULL,
+    investigation_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    last_agent_id TEXT,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    updated_at INTEGER NOT NULL,  -- epoch milliseconds (UTC)
+    PRIMARY KEY (doc_hash, investigation_id)
+)
+"""
+
+# Ledgers written before updated_at became epoch milliseconds stored ISO-8601 TEXT
+_MIGRATE_ISO_UPDATED_AT = (
+    "ALTER TABLE doc_processing_ledger RENAME TO doc_processing_ledger_iso_v1",
+    _CREATE_TABLE,
+    """
+    INSERT INTO doc_processing_ledger
+    SELECT doc_hash, investigation_id, status, last_agent_id, retry_count,
+           COALESCE(CAST(ROUND((julianday(updated_at) - 2440587.5) * 86400000) AS INTEGER), 0)
+    FROM doc_processing_ledger_iso_v1
+    """,
+    "DROP TABLE doc_processing_ledger_iso_v1",
+)
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _bootstrap(path: Path) -> None:
+    """Create the schema once per database, from a single connection (DDL must not race)."""
     with _LOCK:
-        if _CONN is None:
-            path = _ledger_path()
-            path.parent.mkdir(parents=True, exist_ok=True)
-            _CONN = sqlite3.connect(str(path), check_same_thread=False)
-            _CONN.execute(
+        if path in _BOOTSTRAPPED:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = _connect(path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(doc_processing_ledger)")}
+            if columns.get("updated_at", "").upper() == "TEXT":
+                for stmt in _MIGRATE_ISO_UPDATED_AT:
+                    conn.execute(stmt)
+            else:
+                conn.execute(_CREATE_TABLE)
+            # Covering index for get_pending_docs: index-only lookup by investigation + status
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_ledger_inv_status
+                ON doc_processing_ledger (investigation_id, status, retry_count, doc_hash)
+                """
+            )
+            # ISO-8601 updated_at for readers that want text timestamps
+            conn.execute(
                 """
-                CREATE TABLE IF NOT EXISTS doc_processing_ledger (
-                    doc_hash TEXT NOT NULL,
-                    investigation_id TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    last_agent_id TEXT,
-                    retry_count INTEGER NOT NULL DEFAULT 0,
-                    updated_at TEXT NOT NULL,
-                    PRIMARY KEY (doc_hash, investigation_id)
-                )
+                CREATE VIEW IF NOT EXISTS doc_processing_ledger_iso AS
+                SELECT doc_hash, investigation_id, status, last_agent_id, retry_count,
+                       strftime('%Y-%m-%dT%H:%M:%fZ', updated_at / 1000.0, 'unixepoch') AS updated_at
+                FROM doc_processing_ledger
                 """
             )
-            _CONN.commit()
-        return _CONN
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        _BOOTSTRAPPED.add(path)
+
+
+def _get_conn() -> sqlite3.Connection:
+    """This thread's ledger connection (opened on first use); WAL lets threads read concurrently."""
+    path = _ledger_path()
+    conn = getattr(_TLS, "conn", None)
+    if conn is not None and _TLS.path == path:
+        return conn
+    _bootstrap(path)
+    if conn is not None:
+        conn.close()
+    conn = _TLS.conn = _connect(path)
+    _TLS.path = path
+    return conn
+
+
+# retry_count in VALUES is the increment (1 for FAILED, else 0); on conflict everything comes
+# from excluded.*, so each row binds its values once. Re-asserting the same status from the same
+# agent (e.g. PROCESSING again on resume) is skipped: no page write. Failures always count.
+_UPSERT_COLUMNS = "(doc_hash, investigation_id, status, last_agent_id, retry_count, updated_at)"
+_UPSERT_ROW = "(?, ?, ?, ?, ?, ?)"
+_UPSERT_CONFLICT = """
+    ON CONFLICT(doc_hash, investigation_id) DO UPDATE SET
+        status = excluded.status,
+        last_agent_id = excluded.last_agent_id,
+        retry_count = retry_count + excluded.retry_count,
+        updated_at = excluded.updated_at
+    WHERE status <> excluded.status
+        OR last_agent_id IS NOT excluded.last_agent_id
+        OR excluded.retry_count <> 0
+"""
+_PARAMS_PER_ROW = 6
+_MAX_ROWS_PER_STATEMENT = 500
+
+
+@lru_cache(maxsize=None)
+def _upsert_sql(n_rows: int) -> str:
+    rows = ", ".join([_UPSERT_ROW] * n_rows)
+    return f"INSERT INTO doc_processing_ledger {_UPSERT_COLUMNS} VALUES {rows}{_UPSERT_CONFLICT}"
+
+
+_UPSERT_ONE_SQL = _upsert_sql(1)
+
+
+class LedgerBatch:
+    """Status updates issued inside one ledger_batch() transaction (nothing commits until it exits)."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+        limit = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        self._chunk = max(1, min(_MAX_ROWS_PER_STATEMENT, limit // _PARAMS_PER_ROW))
+
+    def _upsert(self, doc_hash: str, investigation_id: str, status: str, agent: str) -> None:
+        now = _now_ms()
+        retry = 1 if status == STATUS_FAILED else 0
+        self._conn.execute(_UPSERT_ONE_SQL, (doc_hash, investigation_id or "", status, agent, retry, now))
+
+    def start(self, doc_hash: str, investigation_id: str) -> None:
+        """Mark document as PROCESSING."""
+        self._upsert(doc_hash, investigation_id, STATUS_PROCESSING, "ingest_documents")
+
+    def success(self, doc_hash: str, investigation_id: str) -> None:
+        """Mark document as DONE."""
+        self._upsert(doc_hash, investigation_id, STATUS_DONE, "ingest_documents")
+
+    def failed(self, doc_hash: str, investigation_id: str, last_agent_id: str = "ingest_documents") -> None:
+        """Mark document as FAILED and increment retry_count."""
+        self._upsert(doc_hash, investigation_id, STATUS_FAILED, last_agent_id)
+
+    def bulk(
+        self,
+        rows: Sequence[Tuple[str, str]],
+        status: str,
+        last_agent_id: str = "ingest_documents",
+    ) -> None:
+        """Set `status` for many (doc_hash, investigation_id) rows with one multi-row upsert per chunk."""
+        now = _now_ms()
+        retry = 1 if status == STATUS_FAILED else 0
+        for i in range(0, len(rows), self._chunk):
+            chunk = rows[i:i + self._chunk]
+            params: List[object] = []
+            for doc_hash, investigation_id in chunk:
+                params += (doc_hash, investigation_id or "", status, last_agent_id, retry, now)
+            # Same SQL text per chunk size, so sqlite3 reuses the prepared statement
+            self._conn.execute(_upsert_sql(len(chunk)), params)
+
+
+@contextmanager
+def ledger_batch() -> Iterator[LedgerBatch]:
+    """
+    Group many status updates into one BEGIN IMMEDIATE ... COMMIT (one fsync instead of one per row).
+    Holds SQLite's write lock for the whole block: keep slow work outside it, and do not nest batches.
+    """
+    conn = _get_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield LedgerBatch(conn)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 
 def log_doc_start(doc_hash: str, investigation_id: str) -> None:
     """Mark document as PROCESSING. Upserts row."""
-    inv = investigation_id or ""
-    conn = _get_conn()
-    now = datetime.utcnow().isoformat() + "Z"
-    with _LOCK:
-        conn.execute(
-            """
-            INSERT INTO doc_processing_ledger (doc_hash, investigation_id, status, last_agent_id, retry_count, updated_at)
-            VALUES (?, ?, ?, ?, 0, ?)
-            ON CONFLICT(doc_hash, investigation_id) DO UPDATE SET
-                status = ?,
-                last_agent_id = ?,
-                updated_at = ?
-            """,
-            (doc_hash, inv, STATUS_PROCESSING, "ingest_documents", now, STATUS_PROCESSING, "ingest_documents", now),
-        )
-        conn.commit()
+    with ledger_batch() as lb:
+        lb.start(doc_hash, investigation_id)
 
 
 def log_doc_success(doc_hash: str, investigation_id: str) -> None:
     """Mark document as DONE."""
-    inv = investigation_id or ""
-    conn = _get_conn()
-    now = datetime.utcnow().isoformat() + "Z"
-    with _LOCK:
-        conn.execute(
-            """
-            INSERT INTO doc_processing_ledger (doc_hash, investigation_id, status, last_agent_id, retry_count, updated_at)
-            VALUES (?, ?, ?, ?, 0, ?)
-            ON CONFLICT(doc_hash, investigation_id) DO UPDATE SET
-                status = ?,
-                last_agent_id = ?,
-                updated_at = ?
-            """,
-            (doc_hash, inv, STATUS_DONE, "ingest_documents", now, STATUS_DONE, "ingest_documents", now),
-        )
-        conn.commit()
+    with ledger_batch() as lb:
+        lb.success(doc_hash, investigation_id)
 
 
 def log_doc_failed(doc_hash: str, investigation_id: str, last_agent_id: str = "ingest_documents") -> None:
     """Mark document as FAILED and increment retry_count."""
-    inv = investigation_id or ""
-    conn = _get_conn()
-    now = datetime.utcnow().isoformat() + "Z"
-    with _LOCK:
-        conn.execute(
-            """
-            INSERT INTO doc_processing_ledger (doc_hash, investigation_id, status, last_agent_id, retry_count, updated_at)
-            VALUES (?, ?, ?, ?, 1, ?)
-            ON CONFLICT(doc_hash, investigation_id) DO UPDATE SET
-                status = ?,
-                last_agent_id = ?,
-                retry_count = retry_count + 1,
-                updated_at = ?
-            """,
-            (doc_hash, inv, STATUS_FAILED, last_agent_id, now, STATUS_FAILED, last_agent_id, now),
-        )
-        conn.commit()
+    with ledger_batch() as lb:
+        lb.failed(doc_hash, investigation_id, last_agent_id)
+
+
+def bulk_log_status(
+    rows: Sequence[Tuple[str, str]],
+    status: str,
+    last_agent_id: str = "ingest_documents",
+) -> None:
+    """Set `status` for many (doc_hash, investigation_id) rows in one transaction."""
+    with ledger_batch() as lb:
+        lb.bulk(rows, status, last_agent_id)
 
 
 def get_doc_status(doc_hash: str, investigation_id: str) -> Optional[str]:
     """Return status for (doc_hash, investigation_id) or None if not in ledger."""
     inv = investigation_id or ""
-    conn = _get_conn()
-    with _LOCK:
-        row = conn.execute(
-            "SELECT status FROM doc_processing_ledger WHERE doc_hash = ? AND investigation_id = ?",
-            (doc_hash, inv),
-        ).fetchone()
+    row = _get_conn().execute(
+        "SELECT status FROM doc_processing_ledger WHERE doc_hash = ? AND investigation_id = ?",
+        (doc_hash, inv),
+    ).fetchone()
     return row[0] if row else None
 
 
@@ -126,13 +263,11 @@ def get_pending_docs(
 ) -> List[Tuple[str, int]]:
     """Return list of (doc_hash, retry_count) for docs with status PENDING or FAILED and retry_count < max_retries."""
     inv = investigation_id or ""
-    conn = _get_conn()
-    with _LOCK:
-        rows = conn.execute(
-            """
-            SELECT doc_hash, retry_count FROM doc_processing_ledger
-            WHERE investigation_id = ? AND status IN (?, ?) AND retry_count < ?
-            """,
-            (inv, STATUS_PENDING, STATUS_FAILED, max_retries),
-        ).fetchall()
+    rows = _get_conn().execute(
+        """
+        SELECT doc_hash, retry_count FROM doc_processing_ledger
+        WHERE investigation_id = ? AND status IN (?, ?) AND retry_count < ?
+        """,
+        (inv, STATUS_PENDING, STATUS_FAILED, max_retries),
+    ).fetchall()
     return [(r[0], r[1]) for r in rows]
@@ -5,10 +5,18 @@ Defines the state structure for LangGraph multi-agent workflow.
 
 from typing import TypedDict, List, Dict, Optional, Any
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class DocumentMetadata(BaseModel):
+class _StateModel(BaseModel):
+    """
+    Base for state records. Agents build them from already-typed values at high volume:
+    hot paths use Model.model_construct(...) to skip validation; __init__ still validates.
+    """
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
+
+class DocumentMetadata(_StateModel):
     """Metadata for ingested documents (Soul-aligned)."""
     doc_id: str
     filename: str
@@ -32,7 +40,7 @@ class DocumentMetadata(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
-class DocumentClassification(BaseModel):
+class DocumentClassification(_StateModel):
     """Classification results (Soul-aligned): doc_type, domain, language, priority_score, reasons, processing_order."""
     doc_id: str
     domain: str
@@ -49,7 +57,7 @@ class DocumentClassification(BaseModel):
     processing_order: int = 0
 
 
-class Entity(BaseModel):
+class Entity(_StateModel):
     """Extracted entity with metadata (Soul-compatible)."""
     entity_id: str
     text: str
@@ -66,7 +74,7 @@ class Entity(BaseModel):
     variations: List[str] = Field(default_factory=list)
 
 
-class Relationship(BaseModel):
+class Relationship(_StateModel):
     """Relationship between two entities (Soul: source, target, type, evidence_count, confidence)."""
     source_entity_id: str
     target_entity_id: str
@@ -78,7 +86,7 @@ class Relationship(BaseModel):
     confidence: float = 1.0
 
 
-class SemanticLink(BaseModel):
+class SemanticLink(_StateModel):
     """Semantic connection between documents (Soul: doc1, doc2, similarity, shared_entities, shared_concepts)."""
     doc_id_1: str
     doc_id_2: str
@@ -90,7 +98,7 @@ class SemanticLink(BaseModel):
     shared_concepts: List[str] = Field(default_factory=list)
 
 
-class TimelineEvent(BaseModel):
+class TimelineEvent(_StateModel):
     """Event (Soul: event_id, date, type, description, entities, documents, confidence)."""
     event_id: str
     timestamp: Optional[datetime] = None
@@ -103,7 +111,7 @@ class TimelineEvent(BaseModel):
     type: str = "EVENT"
 
 
-class CryptoSegment(BaseModel):
+class CryptoSegment(_StateModel):
     """Detected encrypted or obfuscated content."""
     segment_id: str
     doc_id: str
@@ -115,7 +123,7 @@ class CryptoSegment(BaseModel):
     decrypted_content: Optional[str] = None
 
 
-class CryptographyFinding(BaseModel):
+class CryptographyFinding(_StateModel):
     """Soul Agent 4: cryptography_findings schema."""
     document_id: str
     finding_type: str
@@ -126,7 +134,7 @@ class CryptographyFinding(BaseModel):
     algorithm: Optional[str] = None
 
 
-class Pattern(BaseModel):
+class Pattern(_StateModel):
     """Detected pattern (Soul: pattern_type, description, occurrences, confidence, evidence)."""
     pattern_id: str
     pattern_type: str
@@ -140,7 +148,7 @@ class Pattern(BaseModel):
     evidence: List[str] = Field(default_factory=list)
 
 
-class Hypothesis(BaseModel):
+class Hypothesis(_StateModel):
     """Investigative hypothesis (Soul: hypothesis_id, title, description, confidence, supporting_evidence, status)."""
     hypothesis_id: str
     title: Optional[str] = None
@@ -0,0 +1,22 @@
+"""
+SHERLOCK - Timestamp helpers for hot write paths (events, episodes, store meta).
+"""
+
+import time
+from typing import Tuple
+
+# (epoch milliseconds, formatted string) of the last call
+_last: Tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """Current UTC time as ISO-8601 with millisecond precision and "Z"; reformatted at most once per ms."""
+    global _last
+    ms = time.time_ns() // 1_000_000
+    last_ms, last_iso = _last
+    if ms == last_ms:
+        return last_iso
+    sec, frac = divmod(ms, 1000)
+    iso = f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))}.{frac:03d}Z"
+    _last = (ms, iso)
+    return iso
@@ -7,6 +7,16 @@ import base64
 import binascii
 from typing import Optional, Tuple
 
+import numpy as np
+
+_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LOWER = "abcdefghijklmnopqrstuvwxyz"
+# _CAESAR_TABLES[s] decodes a Caesar shift of s (each ASCII letter moves back s places)
+_CAESAR_TABLES = [
+    str.maketrans(_UPPER + _LOWER, _UPPER[26 - s:] + _UPPER[:26 - s] + _LOWER[26 - s:] + _LOWER[:26 - s])
+    for s in range(26)
+]
+
 
 def decode_base64(s: str) -> Optional[str]:
     try:
@@ -29,23 +39,12 @@ def decode_hex(s: str) -> Optional[str]:
 
 
 def decode_rot13(s: str) -> str:
-    return s.translate(str.maketrans(
-        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
-        "NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm",
-    ))
+    return s.translate(_CAESAR_TABLES[13])
 
 
 def decode_caesar(text: str, shift: int) -> str:
     """Decode Caesar cipher with given shift (0-25)."""
-    out = []
-    for c in text:
-        if c.isupper():
-            out.append(chr((ord(c) - ord("A") - shift) % 26 + ord("A")))
-        elif c.islower():
-            out.append(chr((ord(c) - ord("a") - shift) % 26 + ord("a")))
-        else:
-            out.append(c)
-    return "".join(out)
+    return text.translate(_CAESAR_TABLES[shift % 26])
 
 
 def decode_vigenere(text: str, key: str) -> str:
@@ -53,6 +52,8 @@ def decode_vigenere(text: str, key: str) -> str:
     key = "".join(c for c in key.lower() if c.isalpha())
     if not key:
         return text
+    if text.isascii():
+        return _decode_vigenere_ascii(text, key)
     out = []
     ki = 0
     for c in text:
@@ -67,7 +68,29 @@ def decode_vigenere(text: str, key: str) -> str:
     return "".join(out)
 
 
-def decode_segment(crypto_type: str, content: str, shift: Optional[int] = None) -> Optional[str]:
+def _decode_vigenere_ascii(text: str, key: str) -> str:
+    """Vectorised decode_vigenere for ASCII text: every letter is shifted in one NumPy pass."""
+    buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8).copy()
+    upper = (buf >= 65) & (buf <= 90)
+    pos = np.flatnonzero(upper | ((buf >= 97) & (buf <= 122)))
+    if not pos.size:
+        return text
+    shifts = np.array([(ord(k) - ord("a")) % 26 for k in key], dtype=np.int16)
+    base = np.where(upper[pos], 65, 97).astype(np.int16)
+    letters = buf[pos].astype(np.int16)
+    buf[pos] = (letters - base - np.resize(shifts, pos.size)) % 26 + base
+    return buf.tobytes().decode("ascii")
+
+
+def decode_segment(
+    crypto_type: str,
+    content: str,
+    shift: Optional[int] = None,
+    raw: Optional[bytes] = None,
+) -> Optional[str]:
+    """Decode one detected segment; `raw` is the payload a detector already decoded, if any."""
+    if raw is not None:
+        return raw.decode("utf-8", errors="replace")
     if crypto_type == "base64":
         return decode_base64(content)
     if crypto_type == "hex":
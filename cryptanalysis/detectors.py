@@ -2,55 +2,96 @@
 SHERLOCK - Detect encrypted/obfuscated segments (Base64, hex, ROT13, etc.).
 """
 
+import os
 import re
-import base64
 import binascii
-from typing import List, Tuple, Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Sequence, Tuple, Optional
 
+from loguru import logger
 
-def is_base64(s: str) -> bool:
+from cryptanalysis.decoders import decode_rot13
+
+# Compiled once; each detector is a single finditer pass. The patterns overlap (a hex run is also
+# base64/alpha text), so they are not merged into one alternation that would consume shared spans.
+_RX_B64 = re.compile(r"[A-Za-z0-9+/]{20,}={0,2}")
+_RX_HEX = re.compile(r"\b(?:0x)?[0-9a-fA-F]{16,}\b")
+_RX_WS = re.compile(r"\s+")
+_RX_NON_HEX = re.compile(r"[^0-9a-fA-F]")
+_RX_ALPHA_BY_LEN: Dict[int, "re.Pattern[str]"] = {}
+
+
+def _run_table(alphabet: bytes) -> bytes:
+    """bytes.translate table: alphabet bytes -> b"x", everything else -> b" "."""
+    return bytes(0x78 if c in alphabet else 0x20 for c in range(256))
+
+
+# A Base64 match needs 20 consecutive alphabet characters and a hex match 16 hex digits. Mapping
+# the text through these tables and searching for such a run is a C-speed check that lets
+# documents without one skip the regex walk (non-ASCII encodes to bytes outside both alphabets).
+_B64_RUN = _run_table(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")
+_HEX_RUN = _run_table(b"0123456789abcdefABCDEF")
+
+
+def _has_run(text: str, table: bytes, length: int) -> bool:
+    return b"x" * length in text.encode("utf-8", "replace").translate(table)
+
+
+def _alpha_pattern(min_len: int) -> "re.Pattern[str]":
+    rx = _RX_ALPHA_BY_LEN.get(min_len)
+    if rx is None:
+        rx = _RX_ALPHA_BY_LEN[min_len] = re.compile(r"[A-Za-z\s]{%d,}" % min_len)
+    return rx
+
+
+def _b64_payload(s: str) -> Optional[bytes]:
+    """Validate and decode in one strict pass; None if `s` is not well-formed Base64."""
     try:
-        s_clean = re.sub(r"\s+", "", s)
-        if len(s_clean) % 4:
-            return False
-        base64.b64decode(s_clean, validate=True)
-        return True
-    except Exception:
-        return False
+        return binascii.a2b_base64(s, strict_mode=True)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def is_base64(s: str) -> bool:
+    return _b64_payload(_RX_WS.sub("", s)) is not None
 
 
 def is_hex(s: str) -> bool:
-    s_clean = re.sub(r"[^0-9a-fA-F]", "", s)
+    s_clean = _RX_NON_HEX.sub("", s)
     return len(s_clean) >= 8 and len(s_clean) % 2 == 0
 
 
 def is_rot13(s: str) -> bool:
     if len(s) < 10:
         return False
-    decoded = s.translate(str.maketrans(
-        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
-        "NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm",
-    ))
+    decoded = decode_rot13(s)
     return decoded != s and decoded.isprintable()
 
 
-def detect_base64_blocks(text: str) -> List[Tuple[int, int, str]]:
-    """Return list of (start, end, content) for likely Base64 blocks."""
-    pattern = re.compile(r"[A-Za-z0-9+/]{20,}={0,2}")
+def detect_base64_blocks(text: str) -> List[Tuple[int, int, str, bytes]]:
+    """Return list of (start, end, content, decoded bytes) for likely Base64 blocks."""
     out = []
-    for m in pattern.finditer(text):
+    if not _has_run(text, _B64_RUN, 20):
+        return out
+    for m in _RX_B64.finditer(text):
         segment = m.group(0)
-        if is_base64(segment):
-            out.append((m.start(), m.end(), segment))
+        raw = _b64_payload(segment)
+        if raw is not None:
+            out.append((m.start(), m.end(), segment, raw))
     return out
 
 
 def detect_hex_blocks(text: str) -> List[Tuple[int, int, str]]:
     """Return list of (start, end, content) for likely hex blocks."""
-    pattern = re.compile(r"\b(?:0x)?[0-9a-fA-F]{16,}\b")
     out = []
-    for m in pattern.finditer(text):
-        seg = re.sub(r"^0x", "", m.group(0))
+    if not _has_run(text, _HEX_RUN, 16):
+        return out
+    for m in _RX_HEX.finditer(text):
+        seg = m.group(0)
+        if seg.startswith("0x"):
+            seg = seg[2:]
         if len(seg) >= 16 and len(seg) % 2 == 0:
             out.append((m.start(), m.end(), m.group(0)))
     return out
@@ -62,11 +103,10 @@ def detect_caesar_blocks(text: str, min_len: int = 20) -> List[Tuple[int, int, s
         from cryptanalysis.frequency import suggest_caesar_shift
     except ImportError:
         return []
-    pattern = re.compile(r"[A-Za-z\s]{%d,}" % min_len)
     out = []
-    for m in pattern.finditer(text):
+    for m in _alpha_pattern(min_len).finditer(text):
         content = m.group(0)
-        letters_only = "".join(c for c in content if c.isalpha())
+        letters_only = "".join(content.split())  # the pattern only admits letters and whitespace
         if len(letters_only) < min_len:
             continue
         shift = suggest_caesar_shift(letters_only, "pt")
@@ -74,13 +114,41 @@ def detect_caesar_blocks(text: str, min_len: int = 20) -> List[Tuple[int, int, s
     return out
 
 
-def detect_all(text: str) -> List[Tuple[str, int, int, str, Optional[int]]]:
-    """Return list of (crypto_type, start, end, content, optional_shift)."""
-    found: List[Tuple[str, int, int, str, Optional[int]]] = []
-    for start, end, content in detect_base64_blocks(text):
-        found.append(("base64", start, end, content, None))
+def detect_all(text: str) -> List[Tuple[str, int, int, str, Optional[int], Optional[bytes]]]:
+    """Return list of (crypto_type, start, end, content, optional_shift, optional_raw_bytes)."""
+    found: List[Tuple[str, int, int, str, Optional[int], Optional[bytes]]] = []
+    for start, end, content, raw in detect_base64_blocks(text):
+        found.append(("base64", start, end, content, None, raw))
     for start, end, content in detect_hex_blocks(text):
-        found.append(("hex", start, end, content, None))
+        found.append(("hex", start, end, content, None, None))
     for start, end, content, shift in detect_caesar_blocks(text):
-        found.append(("caesar", start, end, content, shift))
+        found.append(("caesar", start, end, content, shift, None))
     return found
+
+
+# Below these sizes process start-up costs more than the scans it would parallelise
+_PARALLEL_MIN_DOCS = 4
+_PARALLEL_MIN_CHARS = 1_000_000
+
+
+def detect_all_batch(
+    texts: Sequence[str],
+    max_workers: Optional[int] = None,
+) -> List[List[Tuple[str, int, int, str, Optional[int], Optional[bytes]]]]:
+    """detect_all for many documents (same order); large batches are scanned in a process pool."""
+    if max_workers is None:
+        from core.config import settings
+        max_workers = settings.CRYPTO_WORKERS
+    workers = min(max_workers or os.cpu_count() or 1, len(texts))
+    if workers <= 1 or len(texts) < _PARALLEL_MIN_DOCS or sum(map(len, texts)) < _PARALLEL_MIN_CHARS:
+        return [detect_all(t) for t in texts]
+    # spawn, not fork: callers run inside threaded servers (API, Streamlit)
+    ctx = multiprocessing.get_context("spawn")
+    chunksize = max(1, len(texts) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            return list(pool.map(detect_all, texts, chunksize=chunksize))
+    except (BrokenProcessPool, OSError, RuntimeError) as e:
+        # e.g. a __main__ that is not import-safe under spawn, or no permission to fork
+        logger.warning(f"Detector pool unavailable ({e}); scanning serially")
+        return [detect_all(t) for t in texts]
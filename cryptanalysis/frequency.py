@@ -3,8 +3,11 @@ SHERLOCK - Frequency analysis for classical ciphers.
 """
 
 from collections import Counter
+from functools import lru_cache
 from typing import Dict, List
 
+import numpy as np
+
 # Reference letter frequencies (relative) for Portuguese and English
 PT_FREQ = {
     "a": 0.1463, "e": 0.1257, "o": 0.1078, "s": 0.0781, "r": 0.0682,
@@ -22,6 +25,32 @@ EN_FREQ = {
 }
 
 
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+# bytes.translate tables: fold A-Z to a-z and delete every other byte, in one C pass
+_FOLD_LOWER = bytes.maketrans(_ALPHABET.upper().encode(), _ALPHABET.encode())
+_DEL_NON_LETTERS = bytes(c for c in range(256) if not (65 <= c <= 90 or 97 <= c <= 122))
+
+
+def _centered_unit(vec: np.ndarray) -> np.ndarray:
+    """Mean-centred, unit-norm copy of `vec` (Pearson correlation becomes a dot product)."""
+    centered = vec - vec.mean(axis=-1, keepdims=True)
+    norm = np.linalg.norm(centered, axis=-1, keepdims=True)
+    return centered / np.where(norm == 0, 1.0, norm)
+
+
+_LANG_VECS = {
+    lang: _centered_unit(np.array([freq[c] for c in _ALPHABET]))
+    for lang, freq in (("pt", PT_FREQ), ("en", EN_FREQ))
+}
+# _SHIFT_REF[lang][s, c]: reference weight of cipher letter c when decoded with shift s.
+# A shift only permutes the histogram, so its mean and norm are equal for all 26 shifts and
+# drop out of the argmax; scoring is then a single 26x26 mat-vec on the raw counts.
+_SHIFT_REF = {
+    lang: vec[(np.arange(26)[None, :] - np.arange(26)[:, None]) % 26]
+    for lang, vec in _LANG_VECS.items()
+}
+
+
 def char_frequency(text: str) -> Dict[str, float]:
     """Character frequency in [0,1] for letters only."""
     if not text:
@@ -31,39 +60,15 @@ def char_frequency(text: str) -> Dict[str, float]:
     return {k: v / total for k, v in c.most_common()} if total else {}
 
 
-def _correlation(f1: Dict[str, float], f2: Dict[str, float]) -> float:
-    """Correlation between two frequency dicts (over common keys)."""
-    keys = set(f1) | set(f2)
-    if not keys:
-        return 0.0
-    n = len(keys)
-    v1 = [f1.get(k, 0) for k in keys]
-    v2 = [f2.get(k, 0) for k in keys]
-    m1 = sum(v1) / n
-    m2 = sum(v2) / n
-    num = sum((a - m1) * (b - m2) for a, b in zip(v1, v2))
-    den1 = (sum((a - m1) ** 2 for a in v1) ** 0.5) or 1
-    den2 = (sum((b - m2) ** 2 for b in v2) ** 0.5) or 1
-    return num / (den1 * den2) if (den1 * den2) else 0
-
-
+@lru_cache(maxsize=1024)
 def suggest_caesar_shift(cipher_text: str, lang: str = "pt") -> int:
     """Suggest Caesar shift by correlating decrypted letter frequencies with language."""
-    cipher_text = "".join(c for c in cipher_text if c.isalpha())
-    if len(cipher_text) < 20:
+    letters = cipher_text.encode("ascii", "ignore").translate(_FOLD_LOWER, _DEL_NON_LETTERS)
+    # Non-ASCII letters still count towards the minimum length, as before (rare slow path)
+    if len(letters) < 20 and sum(map(str.isalpha, cipher_text)) < 20:
         return 0
-    lang_freq = EN_FREQ if lang == "en" else PT_FREQ
-    best_shift, best_corr = 0, -1
-    for shift in range(26):
-        dec = []
-        for c in cipher_text:
-            if c.isupper():
-                dec.append(chr((ord(c) - ord("A") - shift) % 26 + ord("A")))
-            else:
-                dec.append(chr((ord(c) - ord("a") - shift) % 26 + ord("a")))
-        dec_freq = char_frequency("".join(dec))
-        corr = _correlation(dec_freq, lang_freq)
-        if corr > best_corr:
-            best_corr = corr
-            best_shift = shift
-    return best_shift
+    codes = np.frombuffer(letters, dtype=np.uint8)
+    hist = np.bincount(codes - 97, minlength=26)
+    if hist.min() == hist.max():
+        return 0  # flat histogram: every shift correlates equally (zero)
+    return int((_SHIFT_REF["en" if lang == "en" else "pt"] @ hist).argmax())
@@ -2,8 +2,123 @@
 SHERLOCK - Steganography detection (LSB in PNG via stegano).
 """
 
+import struct
+import zlib
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# stegano.lsb hides "<length>:<message>" one bit per R, G, B value, pixels in row order.
+# Twelve characters cover any realistic length prefix and the ':' separator.
+_HEADER_CHARS = 12
+_READ_BLOCK = 1 << 16
+
+# stegano.lsb once imported; False when stegano is not installed (None: not tried yet)
+_lsb_module: Any = None
+
+
+def _load_lsb() -> Any:
+    global _lsb_module
+    if _lsb_module is None:
+        try:
+            from stegano import lsb
+            _lsb_module = lsb
+        except ImportError:
+            _lsb_module = False
+    return _lsb_module
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _leading_pixels(file_path: Path, count: int) -> Optional[List[bytes]]:
+    """
+    RGB of the first `count` pixels, inflating and unfiltering only the leading scanlines.
+    None for layouts this reader does not handle (not 8-bit RGB/RGBA, interlaced, truncated).
+    """
+    with open(file_path, "rb") as f:
+        if f.read(8) != _PNG_SIGNATURE:
+            return None
+        width = bpp = rows = 0
+        inflater = zlib.decompressobj()
+        data = bytearray()
+        need = 0
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                return None
+            length, ctype = struct.unpack(">I4s", head)
+            if ctype == b"IHDR":
+                width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", f.read(13))
+                if depth != 8 or color not in (2, 6) or interlace or width * height < count:
+                    return None
+                bpp = 3 if color == 2 else 4
+                rows = -(-count // width)
+                need = rows * (1 + width * bpp)
+                f.seek(length - 13 + 4, 1)
+            elif ctype == b"IDAT" and need:
+                left = length
+                while left and len(data) < need:
+                    block = f.read(min(left, _READ_BLOCK))
+                    left -= len(block)
+                    data += inflater.decompress(block, need - len(data))
+                if len(data) >= need:
+                    break
+                f.seek(left + 4, 1)
+            elif ctype == b"IEND":
+                return None
+            else:
+                f.seek(length + 4, 1)
+    stride = width * bpp
+    prev = bytearray(stride)
+    pixels: List[bytes] = []
+    for r in range(rows):
+        base = r * (stride + 1)
+        ftype = data[base]
+        line = bytearray(data[base + 1:base + 1 + stride])
+        # Filters only look left and up, so a row prefix is enough
+        upto = min(stride, (count - len(pixels)) * bpp)
+        for i in range(upto):
+            a = line[i - bpp] if i >= bpp else 0
+            if ftype == 1:
+                line[i] = (line[i] + a) & 0xFF
+            elif ftype == 2:
+                line[i] = (line[i] + prev[i]) & 0xFF
+            elif ftype == 3:
+                line[i] = (line[i] + ((a + prev[i]) >> 1)) & 0xFF
+            elif ftype == 4:
+                line[i] = (line[i] + _paeth(a, prev[i], prev[i - bpp] if i >= bpp else 0)) & 0xFF
+        pixels.extend(bytes(line[i:i + 3]) for i in range(0, upto, bpp))
+        prev = line
+    return pixels
+
+
+def _may_hold_lsb_message(file_path: Path) -> bool:
+    """
+    Cheap pre-filter before lsb.reveal (which decodes the whole image): the LSB stream must
+    start with "<digits>:". True when the header cannot be read this way, so reveal decides.
+    """
+    try:
+        pixels = _leading_pixels(file_path, -(-_HEADER_CHARS * 8 // 3))
+    except (OSError, zlib.error, struct.error):
+        return True
+    if pixels is None:
+        return True
+    bits = [v & 1 for px in pixels for v in px]
+    for i in range(_HEADER_CHARS):
+        ch = 0
+        for bit in bits[i * 8:i * 8 + 8]:
+            ch = (ch << 1) | bit
+        if ch == ord(":"):
+            return i > 0
+        if not 48 <= ch <= 57:
+            return False
+    return False
 
 
 def detect_image_stego(file_path: Path) -> List[Dict[str, Any]]:
@@ -12,8 +127,13 @@ def detect_image_stego(file_path: Path) -> List[Dict[str, Any]]:
     suf = file_path.suffix.lower()
     if suf != ".png":
         return [{"type": "image_check", "path": str(file_path), "note": "Stego check only for PNG"}]
+    lsb = _load_lsb()
+    if not lsb:
+        findings.append({"type": "stego_check", "path": str(file_path), "note": "Install stegano for LSB detection"})
+        return findings
+    if not _may_hold_lsb_message(file_path):
+        return findings
     try:
-        from stegano import lsb
         revealed = lsb.reveal(str(file_path))
         if revealed and revealed.strip():
             findings.append({
@@ -21,8 +141,6 @@ def detect_image_stego(file_path: Path) -> List[Dict[str, Any]]:
                 "path": str(file_path),
                 "content_preview": (revealed[:200] + "...") if len(revealed) > 200 else revealed,
             })
-    except ImportError:
-        findings.append({"type": "stego_check", "path": str(file_path), "note": "Install stegano for LSB detection"})
     except Exception as e:
         findings.append({"type": "stego_error", "path": str(file_path), "error": str(e)})
     return findings
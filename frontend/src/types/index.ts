@@ -8,6 +8,7 @@ export interface Investigation {
 }
 
 export interface ActivityEvent {
+  seq?: number
   agent: string
   step: 'start' | 'end' | 'error'
   timestamp: string
@@ -2,7 +2,9 @@
 SHERLOCK - Knowledge graph builder (writes state entities/relationships to Neo4j).
 """
 
-from typing import Dict, Any, List
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List
 from loguru import logger
 
 from core.state import InvestigationState
@@ -15,6 +17,13 @@ class KnowledgeGraphBuilder:
     def __init__(self):
         self.client = Neo4jClient()
 
+    def _read(self, method: Callable[[], Any]) -> Any:
+        """Run one client read on a pool thread, closing that thread's session when it finishes."""
+        try:
+            return method()
+        finally:
+            self.client.release_session()
+
     def process(self, state: InvestigationState) -> InvestigationState:
         logger.info("[Agent 8] Building knowledge graph...")
         try:
@@ -22,18 +31,23 @@ class KnowledgeGraphBuilder:
             entities = state.get("entities", {})
             relationships = state.get("relationships", [])
 
-            for eid, ent in entities.items():
-                self.client.create_entity_node(ent)
-            for rel in relationships:
-                self.client.create_relationship(rel)
+            self.client.create_entities_batch(list(entities.values()))
+            self.client.create_relationships_batch(relationships)
 
-            stats = self.client.get_graph_stats()
+            # The four reads are independent: issue them together so their round-trips and GDS
+            # runs overlap (each pool thread opens its own session and closes it when done).
+            with ThreadPoolExecutor(max_workers=4, thread_name_prefix="kg-read") as pool:
+                stats_f = pool.submit(self._read, self.client.get_graph_stats)
+                centrality_f = pool.submit(self._read, self.client.get_centrality_scores)
+                communities_f = pool.submit(self._read, self.client.detect_communities)
+                betweenness_f = pool.submit(self._read, self.client.get_betweenness)
+                stats = stats_f.result()
             state["graph_metadata"] = dict(stats)
             logger.info(f"Graph: {stats.get('node_count', 0)} nodes, {stats.get('relationship_count', 0)} edges")
 
             centrality = {}
             try:
-                centrality = self.client.get_centrality_scores()
+                centrality = centrality_f.result()
                 state["centrality_scores"] = centrality
                 state["graph_metadata"]["centrality"] = centrality
             except Exception as e:
@@ -42,7 +56,7 @@ class KnowledgeGraphBuilder:
 
             communities = {}
             try:
-                communities = self.client.detect_communities()
+                communities = communities_f.result()
                 state["communities"] = communities
                 state["graph_metadata"]["communities"] = communities
                 state["graph_metadata"]["community_count"] = len(communities)
@@ -52,11 +66,8 @@ class KnowledgeGraphBuilder:
 
             top_entities = []
             if centrality and entities:
-                sorted_eids = sorted(centrality.keys(), key=lambda x: centrality.get(x, 0), reverse=True)[:20]
-                eid_to_community = {}
-                for cid, eids in communities.items():
-                    for eid in eids:
-                        eid_to_community[eid] = cid
+                sorted_eids = heapq.nlargest(20, centrality, key=lambda x: centrality.get(x, 0))
+                eid_to_community = {eid: cid for cid, eids in communities.items() for eid in eids}
                 for eid in sorted_eids:
                     ent = entities.get(eid) if isinstance(entities, dict) else None
                     text = ent.get("text", eid) if isinstance(ent, dict) else getattr(ent, "text", eid)
@@ -70,9 +81,9 @@ class KnowledgeGraphBuilder:
 
             bridges = []
             try:
-                betweenness = self.client.get_betweenness()
+                betweenness = betweenness_f.result()
                 if betweenness:
-                    sorted_b = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)[:15]
+                    sorted_b = heapq.nlargest(15, betweenness.items(), key=lambda x: x[1])
                     for eid, score in sorted_b:
                         ent = entities.get(eid) if isinstance(entities, dict) else None
                         text = ent.get("text", eid) if isinstance(ent, dict) else getattr(ent, "text", eid)
@@ -2,51 +2,175 @@
 SHERLOCK - Neo4j client for knowledge graph.
 """
 
-from typing import Dict, List, Any, Optional
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from operator import attrgetter
+from typing import Dict, Iterator, List, Any, Set, Tuple
 from loguru import logger
 
 from core.config import settings
 
+# Default rows per UNWIND transaction: one round-trip and one commit per batch
+_BULK_BATCH = 1000
 
-def _entity_to_dict(entity: Any) -> Dict[str, Any]:
-    if hasattr(entity, "model_dump"):
-        d = entity.model_dump()
-    elif isinstance(entity, dict):
-        d = dict(entity)
-    else:
-        d = {
-            "entity_id": getattr(entity, "entity_id", ""),
-            "text": getattr(entity, "text", ""),
-            "entity_type": getattr(entity, "entity_type", ""),
-            "doc_id": getattr(entity, "doc_id", ""),
-            "confidence": getattr(entity, "confidence", 1.0),
-            "normalized_text": getattr(entity, "normalized_text", None),
-        }
-    if isinstance(d, dict):
-        if "entity_type" not in d and "type" in d:
-            d["entity_type"] = d["type"]
-        docs = d.get("documents") or []
-        if "doc_id" not in d and docs:
-            d["doc_id"] = docs[0] if isinstance(docs[0], str) else str(docs[0])
-        elif "doc_id" not in d:
-            d["doc_id"] = ""
-    return d
-
-
-def _relationship_to_dict(rel: Any) -> Dict[str, Any]:
-    if hasattr(rel, "model_dump"):
-        return rel.model_dump()
-    if isinstance(rel, dict):
-        return rel
+# Lookups behind MERGE/MATCH on entity_id, the entity_type aggregation and RELATED.type filters
+_SCHEMA_QUERIES = (
+    "CREATE INDEX entity_id_idx IF NOT EXISTS FOR (e:Entity) ON (e.entity_id)",
+    "CREATE INDEX entity_type_idx IF NOT EXISTS FOR (e:Entity) ON (e.entity_type)",
+    "CREATE INDEX rel_type_idx IF NOT EXISTS FOR ()-[r:RELATED]-() ON (r.type)",
+)
+# (uri, database) pairs whose indexes were ensured by this process
+_schema_ready: Set[Tuple[str, str]] = set()
+
+# Node/edge totals (both served from the counts store) and the type histogram in one round-trip
+_GRAPH_STATS_QUERY = """
+CALL { MATCH (n:Entity) RETURN count(n) AS nc }
+CALL { MATCH ()-[r:RELATED]->() RETURN count(r) AS rc }
+CALL { MATCH (n:Entity) WITH n.entity_type AS t, count(*) AS c RETURN collect([t, c]) AS types }
+RETURN nc, rc, types
+"""
+
+# Prefix of each client's named in-memory graph, shared by its PageRank, betweenness and Louvain
+# runs (projected once, not per algorithm); the GDS catalog is global, so every client gets its own
+_GDS_GRAPH_PREFIX = "sherlock_kg"
+_GDS_EXISTS_QUERY = "CALL gds.graph.exists($graph) YIELD exists RETURN exists"
+_GDS_PROJECT_QUERY = "CALL gds.graph.project($graph, 'Entity', 'RELATED') YIELD graphName RETURN graphName"
+_GDS_DROP_QUERY = "CALL gds.graph.drop($graph, false) YIELD graphName RETURN graphName"
+
+# Rows per Bolt page when streaming neighbor expansions
+_NEIGHBOR_FETCH_SIZE = 500
+
+# Edge list for the GPU backend (same directed Entity-RELATED->Entity graph as the GDS projection)
+_EDGE_LIST_QUERY = "MATCH (a:Entity)-[:RELATED]->(b:Entity) RETURN a.entity_id AS s, b.entity_id AS t"
+
+# (cudf, cugraph) once imported; False when RAPIDS is not installed (None: not tried yet)
+_rapids: Any = None
+
+
+def _load_rapids() -> Any:
+    global _rapids
+    if _rapids is None:
+        try:
+            import cudf
+            import cugraph
+            _rapids = (cudf, cugraph)
+        except ImportError:
+            _rapids = False
+    return _rapids
+
+
+_ENTITY_BULK_QUERY = """
+UNWIND $rows AS row
+MERGE (e:Entity {entity_id: row.entity_id})
+SET e += row
+"""
+
+_RELATIONSHIP_BULK_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Entity {entity_id: row.source_id})
+MATCH (b:Entity {entity_id: row.target_id})
+MERGE (a)-[r:RELATED]->(b)
+SET r += row.props
+"""
+
+
+# Row fields read from model/object entities and relationships in one C-level call
+_ENTITY_ATTRS = attrgetter("entity_id", "text", "entity_type", "doc_id", "confidence", "normalized_text")
+_RELATIONSHIP_ATTRS = attrgetter("source_entity_id", "target_entity_id", "relationship_type", "weight", "evidence_doc_ids")
+
+
+def _entity_row(entity: Any) -> Dict[str, Any]:
+    """UNWIND row for one entity, also its full property map (Entity model, dict or object with the same attributes)."""
+    if not isinstance(entity, dict):
+        try:
+            eid, text, etype, doc_id, confidence, normalized = _ENTITY_ATTRS(entity)
+            return {
+                "entity_id": eid,
+                "text": text,
+                "entity_type": etype,
+                "doc_id": doc_id,
+                "confidence": confidence,
+                "normalized_text": normalized,
+            }
+        except AttributeError:
+            entity = entity.model_dump() if hasattr(entity, "model_dump") else {
+                "entity_id": getattr(entity, "entity_id", ""),
+                "text": getattr(entity, "text", ""),
+                "entity_type": getattr(entity, "entity_type", ""),
+                "doc_id": getattr(entity, "doc_id", ""),
+            }
+    doc_id = entity.get("doc_id", "")
+    if "doc_id" not in entity:
+        docs = entity.get("documents") or []
+        if docs:
+            doc_id = docs[0] if isinstance(docs[0], str) else str(docs[0])
+    return {
+        "entity_id": entity["entity_id"],
+        "text": entity["text"],
+        "entity_type": entity["entity_type"] if "entity_type" in entity or "type" not in entity else entity["type"],
+        "doc_id": doc_id,
+        "confidence": entity.get("confidence", 1.0),
+        "normalized_text": entity.get("normalized_text"),
+    }
+
+
+def _relationship_row(rel: Any) -> Dict[str, Any]:
+    """UNWIND row for one relationship: endpoint ids plus the edge property map."""
+    if not isinstance(rel, dict):
+        try:
+            src, tgt, rtype, weight, docs = _RELATIONSHIP_ATTRS(rel)
+            return {"source_id": src, "target_id": tgt, "props": {"type": rtype, "weight": weight, "evidence_docs": docs}}
+        except AttributeError:
+            rel = rel.model_dump() if hasattr(rel, "model_dump") else {
+                "source_entity_id": getattr(rel, "source_entity_id", ""),
+                "target_entity_id": getattr(rel, "target_entity_id", ""),
+                "relationship_type": getattr(rel, "relationship_type", "RELATED"),
+                "weight": getattr(rel, "weight", 1.0),
+                "evidence_doc_ids": getattr(rel, "evidence_doc_ids", []),
+            }
     return {
-        "source_entity_id": getattr(rel, "source_entity_id", ""),
-        "target_entity_id": getattr(rel, "target_entity_id", ""),
-        "relationship_type": getattr(rel, "relationship_type", "RELATED"),
-        "weight": getattr(rel, "weight", 1.0),
-        "evidence_doc_ids": getattr(rel, "evidence_doc_ids", []),
+        "source_id": rel["source_entity_id"],
+        "target_id": rel["target_entity_id"],
+        "props": {
+            "type": rel["relationship_type"],
+            "weight": rel.get("weight", 1.0),
+            "evidence_docs": rel.get("evidence_doc_ids", []),
+        },
     }
 
 
+def _partition_rows(rows: List[Dict[str, Any]], keys: Tuple[str, ...], parts: int) -> List[List[Dict[str, Any]]]:
+    """
+    Split rows into `parts` lists so that rows sharing any value of `keys` land in the same list
+    (union-find over the key values, then whole groups go to the least-loaded list, largest first).
+    """
+    parent: Dict[Any, Any] = {}
+
+    def find(x: Any) -> Any:
+        root = x
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    for row in rows:
+        first = find(row[keys[0]])
+        for k in keys[1:]:
+            other = find(row[k])
+            if other != first:
+                parent[other] = first
+    groups: Dict[Any, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(find(row[keys[0]]), []).append(row)
+    out: List[List[Dict[str, Any]]] = [[] for _ in range(parts)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(out, key=len).extend(group)
+    return out
+
+
 class Neo4jClient:
     """Neo4j client: connect, create Entity nodes and RELATED edges."""
 
@@ -56,151 +180,319 @@ class Neo4jClient:
         self.password = settings.NEO4J_PASSWORD
         self.database = settings.NEO4J_DATABASE
         self.driver = None
+        # One session per thread (sessions are not thread-safe), reused until close()
+        self._local = threading.local()
+        self._sessions: List[Any] = []
+        self._sessions_lock = threading.Lock()
+        # GDS projection: stale until projected by this client and again after each write
+        self._gds_graph = f"{_GDS_GRAPH_PREFIX}_{uuid.uuid4().hex}"
+        self._gds_lock = threading.Lock()
+        self._gds_stale = True
+        self._gds_projected = False
+        # GPU backend: cudf edge list, pulled once per graph version
+        self._gpu_edges: Any = None
+
+    @contextmanager
+    def _session(self) -> Iterator[Any]:
+        """This thread's session, opened on first use; dropped if a call on it fails."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self.driver.session(database=self.database)
+            with self._sessions_lock:
+                self._sessions.append(session)
+        try:
+            yield session
+        except Exception:
+            self.release_session()
+            raise
+
+    def release_session(self) -> None:
+        """Close this thread's session (for pool threads that finish before close())."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            return
+        self._local.session = None
+        with self._sessions_lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        try:
+            session.close()
+        except Exception:
+            pass
 
     def connect(self) -> None:
         from neo4j import GraphDatabase
-        self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-        with self.driver.session(database=self.database) as session:
+        self.driver = GraphDatabase.driver(
+            self.uri,
+            auth=(self.user, self.password),
+            max_connection_pool_size=settings.NEO4J_POOL_SIZE,
+            connection_acquisition_timeout=settings.NEO4J_ACQUISITION_TIMEOUT,
+            max_transaction_retry_time=settings.NEO4J_TX_RETRY_TIME,
+            keep_alive=True,
+            fetch_size=settings.NEO4J_FETCH_SIZE,
+        )
+        with self._session() as session:
             session.run("RETURN 1 AS n").single()
+            if (self.uri, self.database) not in _schema_ready:
+                for q in _SCHEMA_QUERIES:
+                    session.run(q).consume()
+                _schema_ready.add((self.uri, self.database))
         logger.info("Connected to Neo4j")
 
     def close(self) -> None:
+        if self.driver:
+            self._drop_gds_projection()
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+        self._local = threading.local()
         if self.driver:
             self.driver.close()
             self.driver = None
 
     def clear_database(self) -> None:
-        with self.driver.session(database=self.database) as session:
+        with self._session() as session:
             session.run("MATCH (n) DETACH DELETE n")
+        self._graph_changed()
         logger.warning("Neo4j database cleared")
 
     def create_entity_node(self, entity: Any) -> None:
-        d = _entity_to_dict(entity)
-        q = """
-        MERGE (e:Entity {entity_id: $entity_id})
-        SET e.text = $text, e.entity_type = $entity_type, e.doc_id = $doc_id,
-            e.confidence = $confidence, e.normalized_text = $normalized_text
-        """
-        with self.driver.session(database=self.database) as session:
-            session.run(
-                q,
-                entity_id=d["entity_id"],
-                text=d["text"],
-                entity_type=d["entity_type"],
-                doc_id=d["doc_id"],
-                confidence=d.get("confidence", 1.0),
-                normalized_text=d.get("normalized_text"),
-            )
+        self.create_entities_batch([entity])
 
     def create_relationship(self, relationship: Any) -> None:
-        r = _relationship_to_dict(relationship)
-        # Ensure both nodes exist (we create nodes first)
-        q = """
-        MATCH (a:Entity {entity_id: $source_id})
-        MATCH (b:Entity {entity_id: $target_id})
-        MERGE (a)-[r:RELATED]->(b)
-        SET r.type = $rel_type, r.weight = $weight, r.evidence_docs = $evidence_docs
-        """
+        self.create_relationships_batch([relationship])
+
+    @staticmethod
+    def _write_chunks(session: Any, query: str, rows: List[Dict[str, Any]], batch_size: int) -> None:
+        for i in range(0, len(rows), batch_size):
+            chunk = rows[i:i + batch_size]
+            attempts = [0]
+
+            def work(tx: Any) -> None:
+                attempts[0] += 1
+                if attempts[0] > 1:
+                    # execute_write re-runs the batch after transient errors (deadlocks, leader switches)
+                    logger.warning(f"Neo4j write batch of {len(chunk)} rows retried (attempt {attempts[0]})")
+                tx.run(query, rows=chunk).consume()
+
+            session.execute_write(work)
+
+    def _write_partition(self, query: str, rows: List[Dict[str, Any]], batch_size: int) -> None:
         with self.driver.session(database=self.database) as session:
-            session.run(
-                q,
-                source_id=r["source_entity_id"],
-                target_id=r["target_entity_id"],
-                rel_type=r["relationship_type"],
-                weight=r.get("weight", 1.0),
-                evidence_docs=r.get("evidence_doc_ids", []),
-            )
+            self._write_chunks(session, query, rows, batch_size)
+
+    def _write_batched(self, query: str, rows: List[Dict[str, Any]], batch_size: int, keys: Tuple[str, ...]) -> None:
+        """
+        One UNWIND write transaction per `batch_size` rows (retried on transient errors). Beyond one
+        batch, rows are split across NEO4J_INGEST_WORKERS sessions written in parallel; rows sharing
+        any `keys` value (a node, or either endpoint of an edge) share a worker, so concurrent MERGEs
+        never lock the same node from two workers.
+        """
+        if not rows:
+            return
+        self._graph_changed()
+        workers = min(max(settings.NEO4J_INGEST_WORKERS, 1), -(-len(rows) // batch_size))
+        if workers == 1:
+            with self._session() as session:
+                self._write_chunks(session, query, rows, batch_size)
+            return
+        parts = _partition_rows(rows, keys, workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kg-write") as pool:
+            for f in [pool.submit(self._write_partition, query, part, batch_size) for part in parts if part]:
+                f.result()
+
+    def create_entities_batch(self, entities: List[Any], batch_size: int = _BULK_BATCH) -> None:
+        """MERGE many Entity nodes with UNWIND (one round-trip per batch_size rows)."""
+        rows = [_entity_row(entity) for entity in entities]
+        self._write_batched(_ENTITY_BULK_QUERY, rows, batch_size, ("entity_id",))
+
+    def create_relationships_batch(self, relationships: List[Any], batch_size: int = _BULK_BATCH) -> None:
+        """MERGE many RELATED edges with UNWIND; rows whose endpoints are missing are skipped."""
+        rows = [_relationship_row(r) for r in relationships]
+        self._write_batched(_RELATIONSHIP_BULK_QUERY, rows, batch_size, ("source_id", "target_id"))
 
     def get_graph_stats(self) -> Dict[str, Any]:
-        stats: Dict[str, Any] = {}
-        with self.driver.session(database=self.database) as session:
-            r = session.run("MATCH (n:Entity) RETURN count(n) AS c").single()
-            stats["node_count"] = r["c"] if r else 0
-            r = session.run("MATCH ()-[r:RELATED]->() RETURN count(r) AS c").single()
-            rc = r["c"] if r else 0
-            stats["relationship_count"] = rc
-            stats["edge_count"] = rc
-            result = session.run("MATCH (n:Entity) RETURN n.entity_type AS t, count(n) AS c")
-            stats["entity_types"] = {rec["t"] or "": rec["c"] for rec in result}
-        return stats
+        with self._session() as session:
+            r = session.run(_GRAPH_STATS_QUERY).single()
+        rc = r["rc"] if r else 0
+        return {
+            "node_count": r["nc"] if r else 0,
+            "relationship_count": rc,
+            "edge_count": rc,
+            "entity_types": {t or "": c for t, c in (r["types"] if r else [])},
+        }
 
-    def get_betweenness(self) -> Dict[str, float]:
+    def _graph_changed(self) -> None:
+        self._gds_stale = True
+        self._gpu_edges = None
+
+    def _ensure_gds_projection(self, session: Any) -> None:
+        """Project Entity/RELATED into the GDS catalog once; re-projected after writes made it stale."""
+        with self._gds_lock:
+            if self._gds_stale:
+                session.run(_GDS_DROP_QUERY, graph=self._gds_graph).consume()
+            elif session.run(_GDS_EXISTS_QUERY, graph=self._gds_graph).single()["exists"]:
+                return
+            session.run(_GDS_PROJECT_QUERY, graph=self._gds_graph).consume()
+            self._gds_stale = False
+            self._gds_projected = True
+
+    def _drop_gds_projection(self) -> None:
+        if not self._gds_projected:
+            return
         try:
-            q = """
-            CALL gds.betweenness.stream({
-                nodeProjection: 'Entity',
-                relationshipProjection: 'RELATED'
-            })
-            YIELD nodeId, score
-            RETURN gds.util.asNode(nodeId).entity_id AS entity_id, score
-            """
-            out = {}
-            with self.driver.session(database=self.database) as session:
-                for rec in session.run(q):
-                    out[rec["entity_id"]] = rec["score"]
+            with self._session() as session:
+                session.run(_GDS_DROP_QUERY, graph=self._gds_graph).consume()
+        except Exception as e:
+            logger.debug(f"GDS projection drop failed: {e}")
+        self._gds_projected = False
+        self._gds_stale = True
+
+    def _stream_scores(self, session: Any, algorithm: str) -> Dict[str, float]:
+        self._ensure_gds_projection(session)
+        q = f"""
+        CALL gds.{algorithm}.stream($graph)
+        YIELD nodeId, score
+        RETURN gds.util.asNode(nodeId).entity_id AS entity_id, score
+        """
+        return {rec["entity_id"]: rec["score"] for rec in session.run(q, graph=self._gds_graph)}
+
+    def _stream_communities(self, session: Any) -> Dict[int, List[str]]:
+        self._ensure_gds_projection(session)
+        q = """
+        CALL gds.louvain.stream($graph)
+        YIELD nodeId, communityId
+        RETURN gds.util.asNode(nodeId).entity_id AS entity_id, communityId
+        """
+        comm: Dict[int, List[str]] = {}
+        for rec in session.run(q, graph=self._gds_graph):
+            cid = rec["communityId"]
+            if cid not in comm:
+                comm[cid] = []
+            comm[cid].append(rec["entity_id"])
+        return comm
+
+    def _gpu_backend(self) -> Any:
+        """(cudf, cugraph) when GPU_GRAPH_BACKEND=cugraph and RAPIDS imports; else None."""
+        if (settings.GPU_GRAPH_BACKEND or "").lower() != "cugraph":
+            return None
+        rapids = _load_rapids()
+        if not rapids:
+            logger.warning("GPU_GRAPH_BACKEND=cugraph but cudf/cugraph are not installed; using GDS")
+            return None
+        return rapids
+
+    def _gpu_graph(self, directed: bool) -> Any:
+        """cugraph.Graph over the RELATED edge list (string ids renumbered by cugraph); None if empty."""
+        cudf, cugraph = self._gpu_backend()
+        with self._gds_lock:
+            edges = self._gpu_edges
+            if edges is None:
+                sources: List[str] = []
+                targets: List[str] = []
+                with self._session() as session:
+                    for rec in session.run(_EDGE_LIST_QUERY):
+                        sources.append(rec["s"])
+                        targets.append(rec["t"])
+                edges = self._gpu_edges = cudf.DataFrame({"src": sources, "dst": targets})
+        if len(edges) == 0:
+            return None
+        graph = cugraph.Graph(directed=directed)
+        graph.from_cudf_edgelist(edges, source="src", destination="dst")
+        return graph
+
+    def get_centrality_scores_gpu(self) -> Dict[str, float]:
+        graph = self._gpu_graph(directed=True)
+        if graph is None:
+            return {}
+        df = self._gpu_backend()[1].pagerank(graph, alpha=0.85, tol=1e-6).to_pandas()
+        return dict(zip(df["vertex"], df["pagerank"].astype(float)))
+
+    def get_betweenness_gpu(self) -> Dict[str, float]:
+        graph = self._gpu_graph(directed=True)
+        if graph is None:
+            return {}
+        df = self._gpu_backend()[1].betweenness_centrality(graph, normalized=False).to_pandas()
+        return dict(zip(df["vertex"], df["betweenness_centrality"].astype(float)))
+
+    def detect_communities_gpu(self) -> Dict[int, List[str]]:
+        # cuGraph Louvain needs an undirected graph (GDS Louvain treats edges as undirected too)
+        graph = self._gpu_graph(directed=False)
+        if graph is None:
+            return {}
+        parts, _ = self._gpu_backend()[1].louvain(graph)
+        comm: Dict[int, List[str]] = {}
+        for eid, cid in zip(parts["vertex"].to_pandas(), parts["partition"].to_pandas()):
+            comm.setdefault(int(cid), []).append(eid)
+        return comm
+
+    def _try_gpu(self, method: Any, what: str) -> Any:
+        """Result of a *_gpu method, or None to fall back to GDS (backend off, missing, or failed)."""
+        if self._gpu_backend() is None:
+            return None
+        try:
+            return method()
+        except Exception as e:
+            logger.warning(f"{what} on GPU failed, falling back to GDS: {e}")
+            return None
+
+    def get_betweenness(self) -> Dict[str, float]:
+        out = self._try_gpu(self.get_betweenness_gpu, "Betweenness")
+        if out is not None:
             return out
+        try:
+            with self._session() as session:
+                return self._stream_scores(session, "betweenness")
         except Exception as e:
             logger.warning(f"Betweenness failed (GDS?): {e}")
             return {}
 
     def get_centrality_scores(self) -> Dict[str, float]:
+        out = self._try_gpu(self.get_centrality_scores_gpu, "PageRank")
+        if out is not None:
+            return out
         try:
             # GDS PageRank
-            q = """
-            CALL gds.pageRank.stream({
-                nodeProjection: 'Entity',
-                relationshipProjection: 'RELATED'
-            })
-            YIELD nodeId, score
-            RETURN gds.util.asNode(nodeId).entity_id AS entity_id, score
-            """
-            out = {}
-            with self.driver.session(database=self.database) as session:
-                for rec in session.run(q):
-                    out[rec["entity_id"]] = rec["score"]
-            return out
+            with self._session() as session:
+                return self._stream_scores(session, "pageRank")
         except Exception as e:
             logger.warning(f"Centrality failed (GDS?): {e}")
             return {}
 
     def detect_communities(self) -> Dict[int, List[str]]:
+        out = self._try_gpu(self.detect_communities_gpu, "Community detection")
+        if out is not None:
+            return out
         try:
-            q = """
-            CALL gds.louvain.stream({
-                nodeProjection: 'Entity',
-                relationshipProjection: 'RELATED'
-            })
-            YIELD nodeId, communityId
-            RETURN gds.util.asNode(nodeId).entity_id AS entity_id, communityId
-            """
-            comm: Dict[int, List[str]] = {}
-            with self.driver.session(database=self.database) as session:
-                for rec in session.run(q):
-                    cid = rec["communityId"]
-                    if cid not in comm:
-                        comm[cid] = []
-                    comm[cid].append(rec["entity_id"])
-            return comm
+            with self._session() as session:
+                return self._stream_communities(session)
         except Exception as e:
             logger.warning(f"Community detection failed: {e}")
             return {}
 
+    def iter_neighbors(self, entity_ids: List[str], limit_per_entity: int = 10) -> Iterator[Dict[str, Any]]:
+        """Yield neighbors of given entities as Bolt pages arrive (own session, closed when exhausted)."""
+        if not entity_ids or not self.driver:
+            return
+        q = """
+        MATCH (e:Entity)-[:RELATED]-(n:Entity)
+        WHERE e.entity_id IN $ids
+        RETURN DISTINCT n.entity_id AS entity_id, n.text AS text
+        LIMIT $lim
+        """
+        with self.driver.session(database=self.database, fetch_size=_NEIGHBOR_FETCH_SIZE) as session:
+            for rec in session.run(q, ids=entity_ids, lim=limit_per_entity * len(entity_ids)):
+                yield {"entity_id": rec["entity_id"], "text": rec["text"]}
+
     def get_neighbors(self, entity_ids: List[str], limit_per_entity: int = 10) -> List[Dict[str, Any]]:
         """Return neighbors of given entities (for hybrid search expansion)."""
-        if not entity_ids or not self.driver:
-            return []
-        out = []
+        out: List[Dict[str, Any]] = []
         try:
-            q = """
-            MATCH (e:Entity)-[:RELATED]-(n:Entity)
-            WHERE e.entity_id IN $ids
-            RETURN DISTINCT n.entity_id AS entity_id, n.text AS text
-            LIMIT $lim
-            """
-            with self.driver.session(database=self.database) as session:
-                result = session.run(q, ids=entity_ids, lim=limit_per_entity * len(entity_ids))
-                for rec in result:
-                    out.append({"entity_id": rec["entity_id"], "text": rec["text"]})
+            out.extend(self.iter_neighbors(entity_ids, limit_per_entity))
         except Exception as e:
             logger.warning(f"get_neighbors failed: {e}")
         return out
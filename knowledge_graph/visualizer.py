@@ -1,13 +1,47 @@
 """
-SHERLOCK - Export Knowledge Graph to interactive HTML (pyvis).
+SHERLOCK - Export Knowledge Graph to interactive HTML (vis-network).
+Nodes and edges are serialized straight into a fixed page, no per-export template rendering.
 """
 
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Any, Optional
+
+import orjson
 from loguru import logger
 
 from core.config import settings
 
+# Same page pyvis renders (vis-network from CDN, directed edges, barnes-hut physics)
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<script src="https://unpkg.com/vis-network@9.1.9/standalone/umd/vis-network.min.js"></script>
+<style>
+  #mynetwork { width: 100%; height: 600px; border: 1px solid lightgray; position: relative; float: left; }
+</style>
+</head>
+<body>
+<div id="mynetwork"></div>
+<script type="text/javascript">
+  var nodes = new vis.DataSet({NODES_JSON});
+  var edges = new vis.DataSet({EDGES_JSON});
+  var options = {
+    edges: { color: { inherit: true }, smooth: { enabled: true, type: "dynamic" } },
+    interaction: { dragNodes: true, hideEdgesOnDrag: false, hideNodesOnDrag: false },
+    physics: { enabled: true, solver: "barnesHut", stabilization: { enabled: true, iterations: 1000 } }
+  };
+  var network = new vis.Network(document.getElementById("mynetwork"), { nodes: nodes, edges: edges }, options);
+</script>
+</body>
+</html>
+"""
+# Split once around the placeholders: inserted JSON is never scanned for the other placeholder
+_HTML_HEAD, _rest = _HTML_TEMPLATE.split("{NODES_JSON}")
+_HTML_MID, _HTML_TAIL = _rest.split("{EDGES_JSON}")
+del _rest
+
 
 def _to_dict(obj) -> dict:
     if hasattr(obj, "model_dump"):
@@ -15,36 +49,46 @@ def _to_dict(obj) -> dict:
     return obj if isinstance(obj, dict) else {}
 
 
-def build_network_html(
+def _script_json(items: List[Dict[str, Any]]) -> str:
+    # "</" would end the inline <script> early (entity text is untrusted)
+    return orjson.dumps(items).decode("utf-8").replace("</", "<\\/")
+
+
+def render_network_html(
     entities: Dict[str, Any],
     relationships: List[Any],
-    output_path: Optional[Path] = None,
     max_nodes: int = 200,
     max_edges: int = 500,
 ) -> str:
-    """Build pyvis Network and save to HTML. Returns path or HTML string."""
-    try:
-        from pyvis.network import Network
-    except ImportError:
-        logger.warning("pyvis not installed; skipping graph visualization")
-        return ""
-
-    net = Network(height="600px", width="100%", directed=True)
+    """The vis-network HTML page for the first max_nodes entities and the edges between them."""
+    nodes = []
     added = set()
-    for eid, ent in list(entities.items())[:max_nodes]:
+    for eid, ent in islice(entities.items(), max_nodes):
         d = _to_dict(ent)
         label = d.get("text", eid)[:30]
         etype = d.get("entity_type", "ENTITY")
-        net.add_node(eid, label=label, title=f"{etype}: {label}", group=etype)
+        nodes.append({"id": eid, "label": label, "title": f"{etype}: {label}", "group": etype, "shape": "dot"})
         added.add(eid)
 
+    edges = []
     for r in relationships[:max_edges]:
         src = r.source_entity_id if hasattr(r, "source_entity_id") else r.get("source_entity_id")
         tgt = r.target_entity_id if hasattr(r, "target_entity_id") else r.get("target_entity_id")
         if src in added and tgt in added:
-            net.add_edge(src, tgt)
+            edges.append({"from": src, "to": tgt, "arrows": "to"})
+
+    return "".join((_HTML_HEAD, _script_json(nodes), _HTML_MID, _script_json(edges), _HTML_TAIL))
 
-    html = net.generate_html()
+
+def build_network_html(
+    entities: Dict[str, Any],
+    relationships: List[Any],
+    output_path: Optional[Path] = None,
+    max_nodes: int = 200,
+    max_edges: int = 500,
+) -> str:
+    """Render the vis-network HTML page and save it. Returns the output path."""
+    html = render_network_html(entities, relationships, max_nodes=max_nodes, max_edges=max_edges)
     if output_path is None:
         output_path = settings.GRAPHS_DIR / "knowledge_graph.html"
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -35,6 +35,8 @@ def investigate(
 ):
     """Run investigation on documents in the given directory. Use --resume <thread_id> to resume."""
     console.print("[bold cyan]SHERLOCK Intelligence System[/bold cyan]")
+    from rag.embeddings import warmup_embeddings
+    warmup_embeddings()
     if resume:
         console.print(f"Resuming thread: {resume}\n")
         try:
@@ -2,9 +2,12 @@
 SHERLOCK - Guardian check: delta_e and bias alerts.
 """
 
-from typing import List, Any, Dict
+from collections import Counter
+from typing import List, Any
 from dataclasses import dataclass
 
+import numpy as np
+
 from core.state import InvestigationState
 from core.config import settings
 
@@ -26,26 +29,29 @@ def guardian_check(state: InvestigationState) -> GuardianResult:
 
     hypotheses = state.get("hypotheses") or []
     if hypotheses:
-        confs = []
-        for h in hypotheses:
-            c = h.get("confidence", getattr(h, "confidence", 0.5))
-            confs.append(c)
-        import statistics
-        if len(confs) >= 2:
-            var = statistics.variance(confs)
-            delta_e = max(delta_e, min(1.0, var * 2))
-        entity_counts: Dict[str, int] = {}
-        for h in hypotheses:
-            ents = h.get("entities_involved") if isinstance(h, dict) else getattr(h, "entities_involved", [])
-            for eid in ents:
-                entity_counts[eid] = entity_counts.get(eid, 0) + 1
-        for eid, count in entity_counts.items():
-            if count >= 3:
-                doc_ids = []
-                for h in hypotheses:
-                    doc_ids.extend(h.get("doc_ids_supporting") if isinstance(h, dict) else getattr(h, "doc_ids_supporting", []))
-                if len(set(doc_ids)) < 2:
-                    bias_alerts.append(f"Possible confirmation bias: entity {eid} in {count} hypotheses with few distinct docs")
+        confs = np.fromiter(
+            (h.get("confidence", getattr(h, "confidence", 0.5)) for h in hypotheses),
+            dtype=np.float64,
+            count=len(hypotheses),
+        )
+        if confs.size >= 2:
+            delta_e = max(delta_e, min(1.0, float(confs.var(ddof=1)) * 2))
+        entity_counts = Counter(
+            eid
+            for h in hypotheses
+            for eid in (h.get("entities_involved") if isinstance(h, dict) else getattr(h, "entities_involved", []))
+        )
+        if any(count >= 3 for count in entity_counts.values()):
+            # Distinct supporting docs across all hypotheses: the same for every entity, so computed once
+            distinct_docs = {
+                d
+                for h in hypotheses
+                for d in (h.get("doc_ids_supporting") if isinstance(h, dict) else getattr(h, "doc_ids_supporting", []))
+            }
+            if len(distinct_docs) < 2:
+                for eid, count in entity_counts.items():
+                    if count >= 3:
+                        bias_alerts.append(f"Possible confirmation bias: entity {eid} in {count} hypotheses with few distinct docs")
 
     threshold = getattr(settings, "PQMS_GUARDIAN_THRESHOLD", 0.05)
     passed = delta_e < threshold
@@ -44,35 +44,43 @@ def validate_odos(findings: List[Any], state: Dict[str, Any]) -> OdosResult:
     if not findings:
         return OdosResult(status=OdosStatus.VALID, message="No findings to validate", violations=[])
 
-    relationships = state.get("relationships") or []
-    evidence_doc_ids = set()
-    for r in relationships:
-        for doc_id in (r.get("evidence_doc_ids") if isinstance(r, dict) else getattr(r, "evidence_doc_ids", [])):
-            evidence_doc_ids.add(doc_id)
-
-    entity_to_docs: Dict[str, set] = {}
-    for r in relationships:
-        src = r.get("source_entity_id") if isinstance(r, dict) else getattr(r, "source_entity_id", None)
-        tgt = r.get("target_entity_id") if isinstance(r, dict) else getattr(r, "target_entity_id", None)
-        for eid in (src, tgt):
-            if eid:
-                if eid not in entity_to_docs:
-                    entity_to_docs[eid] = set()
-                for doc_id in (r.get("evidence_doc_ids") if isinstance(r, dict) else getattr(r, "evidence_doc_ids", [])):
-                    entity_to_docs[eid].add(doc_id)
-
+    # Entities that need relationship evidence: those in findings without supporting doc_ids
+    pending: List[Any] = []
     for f in findings:
         if not f:
             continue
-        entities_involved = f.get("entities_involved") if isinstance(f, dict) else getattr(f, "entities_involved", [])
-        doc_ids_supporting = f.get("doc_ids_supporting") if isinstance(f, dict) else getattr(f, "doc_ids_supporting", [])
-        for eid in entities_involved:
-            if eid and not entity_to_docs.get(eid) and not doc_ids_supporting:
-                violations.append(OdosViolation(type="unbacked_entity", count=1, severity="medium"))
-                return OdosResult(
-                    status=OdosStatus.NEEDS_REVIEW,
-                    message=f"Entity {eid} in findings without evidence in relationships or doc_ids",
-                    violations=violations,
-                )
+        if isinstance(f, dict):
+            entities_involved, doc_ids_supporting = f.get("entities_involved"), f.get("doc_ids_supporting")
+        else:
+            entities_involved = getattr(f, "entities_involved", [])
+            doc_ids_supporting = getattr(f, "doc_ids_supporting", [])
+        if not doc_ids_supporting:
+            pending.extend(eid for eid in entities_involved if eid)
+    if not pending:
+        return OdosResult(status=OdosStatus.VALID, message="ODOS validation passed", violations=violations)
+
+    # One relationship pass, only for those entities; stops once every one is backed
+    unbacked = set(pending)
+    for r in state.get("relationships") or []:
+        if isinstance(r, dict):
+            src, tgt, docs = r.get("source_entity_id"), r.get("target_entity_id"), r.get("evidence_doc_ids")
+        else:
+            src = getattr(r, "source_entity_id", None)
+            tgt = getattr(r, "target_entity_id", None)
+            docs = getattr(r, "evidence_doc_ids", [])
+        if docs:
+            unbacked.discard(src)
+            unbacked.discard(tgt)
+            if not unbacked:
+                break
+
+    for eid in pending:
+        if eid in unbacked:
+            violations.append(OdosViolation(type="unbacked_entity", count=1, severity="medium"))
+            return OdosResult(
+                status=OdosStatus.NEEDS_REVIEW,
+                message=f"Entity {eid} in findings without evidence in relationships or doc_ids",
+                violations=violations,
+            )
 
     return OdosResult(status=OdosStatus.VALID, message="ODOS validation passed", violations=violations)
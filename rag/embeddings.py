@@ -2,60 +2,125 @@
 SHERLOCK - Embeddings: local (sentence-transformers) or OpenAI.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock
 from typing import List, Any, Optional
+
+import numpy as np
 from loguru import logger
 
 from core.config import settings
 
-_embedding_model: Optional[Any] = None
+_MODEL_LOCK = Lock()  # one load per (provider, model) even when threads race on first use
 
 
-def get_embedding_model():
-    """Load embedding model: OpenAI if EMBEDDING_PROVIDER=openai and OPENAI_API_KEY set; else sentence-transformers."""
-    global _embedding_model
-    if _embedding_model is not None:
-        return _embedding_model
-    provider = getattr(settings, "EMBEDDING_PROVIDER", "local")
-    if provider == "openai" and getattr(settings, "OPENAI_API_KEY", None):
+@lru_cache(maxsize=4)
+def _load_embedding_model(provider: str, model_name: str) -> Any:
+    if provider == "openai":
         try:
             from langchain_openai import OpenAIEmbeddings
-            model_name = getattr(settings, "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
-            _embedding_model = OpenAIEmbeddings(
+            model = OpenAIEmbeddings(
                 model=model_name,
                 openai_api_key=settings.OPENAI_API_KEY,
             )
             logger.info(f"Loaded OpenAI embedding model: {model_name}")
-            return _embedding_model
+            return model
         except Exception as e:
             logger.warning(f"OpenAI embeddings not available: {e}, falling back to local")
+            model_name = settings.EMBEDDING_MODEL
     try:
         from sentence_transformers import SentenceTransformer
-        model = SentenceTransformer(settings.EMBEDDING_MODEL)
-        _embedding_model = model
-        logger.info(f"Loaded embedding model: {settings.EMBEDDING_MODEL}")
+        model = SentenceTransformer(model_name)
+        logger.info(f"Loaded embedding model: {model_name}")
         return model
     except Exception as e:
         logger.error(f"Failed to load embedding model: {e}")
         raise
 
 
-def embed_texts(texts: List[str], model=None) -> List[List[float]]:
-    """Embed a list of texts. Returns list of vectors."""
+def get_embedding_model():
+    """Load embedding model: OpenAI if EMBEDDING_PROVIDER=openai and OPENAI_API_KEY set; else sentence-transformers."""
+    provider = getattr(settings, "EMBEDDING_PROVIDER", "local")
+    if provider == "openai" and getattr(settings, "OPENAI_API_KEY", None):
+        key = ("openai", getattr(settings, "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"))
+    else:
+        key = ("local", settings.EMBEDDING_MODEL)
+    with _MODEL_LOCK:
+        return _load_embedding_model(*key)
+
+
+def warmup_embeddings() -> None:
+    """Load the embedding model and run one local encode so the first real batch skips init cost."""
+    try:
+        model = get_embedding_model()
+        if hasattr(model, "encode"):
+            model.encode(["warmup"], show_progress_bar=False)
+    except Exception as e:
+        logger.warning(f"Embedding warmup skipped: {e}")
+
+
+def _embed_documents_concurrent(model: Any, texts: List[str]) -> np.ndarray:
+    """
+    API embeddings: EMBED_API_BATCH_SIZE texts per request, up to EMBED_CONCURRENCY requests in
+    flight; rows are written back at each batch's offset so output order matches `texts`.
+    """
+    size = max(1, settings.EMBED_API_BATCH_SIZE)
+    batches = [texts[i:i + size] for i in range(0, len(texts), size)]
+    workers = min(max(1, settings.EMBED_CONCURRENCY), len(batches))
+    if workers == 1:
+        return np.asarray(model.embed_documents(texts), dtype=np.float32)
+    out: Optional[np.ndarray] = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as pool:
+        for i, rows in enumerate(pool.map(model.embed_documents, batches)):
+            block = np.asarray(rows, dtype=np.float32)
+            if out is None:
+                out = np.empty((len(texts), block.shape[1]), dtype=np.float32)
+            out[i * size:i * size + len(block)] = block
+    return out
+
+
+def embed_texts(
+    texts: List[str],
+    model=None,
+    batch_size: Optional[int] = None,
+    normalize_embeddings: bool = True,
+) -> np.ndarray:
+    """
+    Embed a list of texts as one float32 array of shape (len(texts), dim); rows are unit length
+    by default, so cosine similarity is a dot product. batch_size defaults to 128 on GPU, 64 on CPU
+    (sentence-transformers already length-sorts inputs, so each batch pads only to its own longest).
+    """
     if model is None:
         model = get_embedding_model()
     if not texts:
-        return []
+        return np.empty((0, 0), dtype=np.float32)
     if hasattr(model, "embed_documents"):
-        emb = model.embed_documents(texts)
-        return [[float(x) for x in vec] for vec in emb]
-    embeddings = model.encode(texts, convert_to_numpy=True)
-    return embeddings.tolist()
+        return _embed_documents_concurrent(model, texts)
+    if batch_size is None:
+        device = getattr(model, "device", None)
+        batch_size = 128 if getattr(device, "type", "cpu") == "cuda" else 64
+    embeddings = model.encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=normalize_embeddings,
+        show_progress_bar=False,
+    )
+    return embeddings.astype(np.float32, copy=False)
+
+
+def embed_texts_list(texts: List[str], model=None) -> List[List[float]]:
+    """embed_texts as nested Python lists, for callers that need plain JSON-able vectors."""
+    return embed_texts(texts, model=model).tolist()
 
 
-def embed_single(text: str, model=None) -> List[float]:
-    """Embed a single text."""
+def embed_single(text: str, model=None) -> np.ndarray:
+    """Embed a single text (float32 vector)."""
     if model is None:
         model = get_embedding_model()
     if hasattr(model, "embed_query"):
-        return [float(x) for x in model.embed_query(text)]
-    return embed_texts([text], model=model)[0]
+        return np.asarray(model.embed_query(text), dtype=np.float32)
+    # A single string encodes straight to a 1-D vector (no batch wrapping or row slicing)
+    vec = model.encode(text, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+    return vec.astype(np.float32, copy=False)
@@ -0,0 +1,281 @@
+"""
+SHERLOCK - FAISS vector backend (VECTOR_BACKEND=faiss).
+A Chroma-compatible collection (add/query/count) over a disk-backed inner-product index, so
+add_chunks, query_similar and hybrid_search work unchanged. Needs faiss-cpu or faiss-gpu.
+FAISS_SQ8 stores 8-bit scalar-quantized codes instead of float32 vectors.
+Several processes (API, CLI) may share one collection: each reloads the files when another
+process rewrote them, and persist() merges its own unsaved chunks into the on-disk copy.
+"""
+
+import atexit
+import os
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: persist() is then only serialized within this process
+    fcntl = None
+
+import numpy as np
+import orjson
+from loguru import logger
+
+from core.config import settings
+from core.fileio import atomic_write_bytes, ensure_dir
+
+# Exact search up to this many vectors; beyond it the index is rebuilt as HNSW (O(log n) queries)
+_HNSW_THRESHOLD = 100_000
+_HNSW_M = 32
+
+_collections: Dict[str, "FaissCollection"] = {}
+_collections_lock = Lock()
+
+
+# Fields a Chroma query returns besides ids
+_INCLUDE_ALL = ("documents", "metadatas", "distances")
+
+
+def _normalized(embeddings: Any) -> np.ndarray:
+    vecs = np.array(embeddings, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vecs / norms
+
+
+class FaissCollection:
+    """
+    Chunks of one collection: a FAISS inner-product index over unit vectors (IP = cosine) plus
+    parallel ids/documents/metadatas, persisted under EMBEDDINGS_DIR by persist() and at exit.
+    Distances are squared L2 between unit vectors (2 - 2*cos), the same scale as Chroma's default.
+    Chunks added since the last persist() are kept aside so a reload of another process's files
+    does not lose them.
+    """
+
+    def __init__(self, name: str) -> None:
+        import faiss
+        self._faiss = faiss
+        self.name = name
+        self._lock = Lock()
+        self._index: Any = None
+        self._ids: List[str] = []
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        # (id, unit vector, document, metadata) added since the last persist()
+        self._pending: List[Tuple[str, np.ndarray, Optional[str], Dict[str, Any]]] = []
+        # (mtime_ns, size) of the sidecar this process last loaded or wrote
+        self._disk_key: Optional[Tuple[int, int]] = None
+        base = ensure_dir(settings.EMBEDDINGS_DIR)
+        self._index_path = base / f"{name}.faiss"
+        self._meta_path = base / f"{name}.meta.json"
+        self._lock_path = base / f"{name}.lock"
+        with self._lock:
+            self._sync()
+
+    def _sidecar_key(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self._meta_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _sync(self) -> None:
+        """Reload the on-disk collection if another process rewrote it, then re-apply pending chunks (under _lock)."""
+        key = self._sidecar_key()
+        if key is None or key == self._disk_key:
+            return
+        try:
+            index = self._faiss.deserialize_index(np.frombuffer(self._index_path.read_bytes(), dtype=np.uint8))
+            meta = orjson.loads(self._meta_path.read_bytes())
+        except (OSError, ValueError, RuntimeError) as e:
+            logger.warning(f"FAISS collection {self.name}: reload failed, keeping the loaded copy: {e}")
+            return
+        if index.ntotal != len(meta["ids"]):
+            # Caught between the writer's index and sidecar replace: retry on the next call
+            return
+        self._index = index
+        self._ids = meta["ids"]
+        self._documents = meta["documents"]
+        self._metadatas = meta["metadatas"]
+        self._positions = {cid: i for i, cid in enumerate(self._ids)}
+        self._disk_key = key
+        pending = self._pending
+        if pending:
+            # Re-apply on top of the reloaded copy; rows another process already wrote are no longer ours to save
+            kept = self._append(
+                [p[0] for p in pending], np.stack([p[1] for p in pending]),
+                [p[2] for p in pending], [p[3] for p in pending],
+            )
+            self._pending = [pending[i] for i in kept]
+        logger.info(f"Loaded FAISS collection {self.name} ({len(self._ids)} chunks)")
+
+    def count(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._ids)
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: Any,
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """Add chunks; ids already present are skipped (like Chroma's add)."""
+        vecs = _normalized(embeddings)
+        docs = documents if documents is not None else [None] * len(ids)
+        metas = metadatas if metadatas is not None else [{} for _ in ids]
+        with self._lock:
+            self._sync()
+            added = self._append(ids, vecs, docs, metas)
+            self._pending.extend((ids[i], vecs[i], docs[i], metas[i]) for i in added)
+        if len(added) < len(ids):
+            logger.warning(f"FAISS collection {self.name}: skipped {len(ids) - len(added)} existing ids")
+
+    def _append(
+        self,
+        ids: List[str],
+        vecs: np.ndarray,
+        documents: List[Optional[str]],
+        metadatas: List[Dict[str, Any]],
+    ) -> List[int]:
+        """Add the rows whose id is new (also within `ids`) to the index (under _lock); returns their positions in `ids`."""
+        keep = []
+        seen = set()
+        for i, cid in enumerate(ids):
+            if cid not in self._positions and cid not in seen:
+                seen.add(cid)
+                keep.append(i)
+        if not keep:
+            return keep
+        if self._index is None:
+            self._index = self._new_index(vecs.shape[1])
+        self._index.add(np.ascontiguousarray(vecs[keep]))
+        for i in keep:
+            self._positions[ids[i]] = len(self._ids)
+            self._ids.append(ids[i])
+            self._documents.append(documents[i])
+            self._metadatas.append(metadatas[i])
+        if len(self._ids) > _HNSW_THRESHOLD and not isinstance(self._index, self._faiss.IndexHNSW):
+            self._upgrade_to_hnsw()
+        return keep
+
+    def _new_index(self, d: int, hnsw: bool = False) -> Any:
+        """Exact or HNSW inner-product index; float32 or, with FAISS_SQ8, int8 codes (4x smaller)."""
+        faiss = self._faiss
+        if not settings.FAISS_SQ8:
+            if hnsw:
+                return faiss.IndexHNSWFlat(d, _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            return faiss.IndexFlatIP(d)
+        qtype = faiss.ScalarQuantizer.QT_8bit_uniform
+        if hnsw:
+            index = faiss.IndexHNSWSQ(d, qtype, _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexScalarQuantizer(d, qtype, faiss.METRIC_INNER_PRODUCT)
+        # Unit vectors: every component lies in [-1, 1], so train that fixed range once (nothing clips later)
+        index.train(np.stack([np.full(d, -1.0, np.float32), np.full(d, 1.0, np.float32)]))
+        return index
+
+    def _upgrade_to_hnsw(self) -> None:
+        flat = self._index
+        hnsw = self._new_index(flat.d, hnsw=True)
+        hnsw.add(flat.reconstruct_n(0, flat.ntotal))
+        self._index = hnsw
+        logger.info(f"FAISS collection {self.name}: switched to HNSW at {flat.ntotal} chunks")
+
+    def _selector(self, where: Optional[Dict[str, Any]]) -> Any:
+        """IDSelector for the {"doc_id": {"$in": [...]}} / {"doc_id": value} filters query_similar builds."""
+        if not where:
+            return None
+        (field, cond), = where.items()
+        allowed = set(cond["$in"]) if isinstance(cond, dict) else {cond}
+        positions = [i for i, m in enumerate(self._metadatas) if m.get(field) in allowed]
+        return self._faiss.IDSelectorBatch(np.asarray(positions, dtype=np.int64))
+
+    def query(
+        self,
+        query_embeddings: Any,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Chroma-shaped result: ids plus the `include` fields (others None), one list per query."""
+        queries = _normalized(query_embeddings)
+        fields = [f for f in (include or _INCLUDE_ALL) if f in _INCLUDE_ALL]
+        out: Dict[str, Any] = {"ids": [], **{f: [] for f in fields}}
+        with self._lock:
+            self._sync()
+            k = min(n_results, len(self._ids))
+            if self._index is None or k <= 0:
+                for key in out:
+                    out[key] = [[] for _ in range(len(queries))]
+                return {**dict.fromkeys(_INCLUDE_ALL), **out}
+            selector = self._selector(where)
+            if selector is None:
+                sims, idx = self._index.search(queries, k)
+            else:
+                params = self._faiss.SearchParametersHNSW(sel=selector) if isinstance(
+                    self._index, self._faiss.IndexHNSW) else self._faiss.SearchParameters(sel=selector)
+                sims, idx = self._index.search(queries, k, params=params)
+            for row_sims, row_idx in zip(sims, idx):
+                hits = [(int(i), float(s)) for i, s in zip(row_idx, row_sims) if i >= 0]
+                out["ids"].append([self._ids[i] for i, _ in hits])
+                if "documents" in out:
+                    out["documents"].append([self._documents[i] for i, _ in hits])
+                if "metadatas" in out:
+                    out["metadatas"].append([self._metadatas[i] for i, _ in hits])
+                if "distances" in out:
+                    out["distances"].append([max(0.0, 2.0 - 2.0 * s) for _, s in hits])
+        return {**dict.fromkeys(_INCLUDE_ALL), **out}
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock on the collection's files across processes (flock; no-op without fcntl)."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def persist(self) -> None:
+        """Merge chunks added since the last write into the on-disk collection and write it back."""
+        with self._lock:
+            if not self._pending:
+                return
+            with self._file_lock():
+                # Pick up what other processes wrote meanwhile; our pending chunks are re-applied on top
+                self._sync()
+                atomic_write_bytes(self._index_path, self._faiss.serialize_index(self._index).tobytes())
+                atomic_write_bytes(self._meta_path, orjson.dumps({
+                    "ids": self._ids,
+                    "documents": self._documents,
+                    "metadatas": self._metadatas,
+                }))
+                self._disk_key = self._sidecar_key()
+            self._pending = []
+
+
+def get_faiss_collection(name: str) -> FaissCollection:
+    """Process-wide FaissCollection for `name` (loaded from disk on first use)."""
+    with _collections_lock:
+        coll = _collections.get(name)
+        if coll is None:
+            coll = _collections[name] = FaissCollection(name)
+        return coll
+
+
+def persist_all() -> None:
+    for coll in list(_collections.values()):
+        try:
+            coll.persist()
+        except Exception as e:
+            logger.warning(f"FAISS persist failed for {coll.name}: {e}")
+
+
+atexit.register(persist_all)
@@ -4,9 +4,11 @@ Plan: vector search ChromaDB -> entities from docs -> Neo4j expansion -> re-rank
 """
 
 from typing import Any, Dict, List, Optional
+
+import numpy as np
 from loguru import logger
 
-from rag.vector_store import get_chroma_client, get_or_create_collection, query_similar
+from rag.vector_store import get_or_create_collection, query_similar
 from rag.embeddings import get_embedding_model
 
 
@@ -16,6 +18,24 @@ def _similarity_from_distance(distance: Optional[float]) -> float:
     return max(0.0, 1.0 - distance)
 
 
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in O(N + k log k) via argpartition.
+    Ties keep input order (same result as a stable sort by descending score).
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        kth = scores[np.argpartition(scores, n - k)[n - k]]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        idx = np.concatenate((above, ties))
+    else:
+        idx = np.arange(n)
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+
 def hybrid_search(
     query: str,
     state: Dict[str, Any],
@@ -29,70 +49,87 @@ def hybrid_search(
     """
     try:
         model = get_embedding_model()
-        client = get_chroma_client()
-        collection = get_or_create_collection(client)
-        vector_hits = query_similar(query, n_results=n_results * 2, collection=collection, model=model)
+        collection = get_or_create_collection()
+        vector_hits = query_similar(
+            query,
+            n_results=n_results * 2,
+            collection=collection,
+            model=model,
+            include=["metadatas", "distances"],
+            use_cache=True,
+        )
     except Exception as e:
         logger.warning(f"Hybrid search vector step failed: {e}")
         return []
 
-    doc_ids_from_vector = []
     doc_scores: Dict[str, float] = {}
     for hit in vector_hits:
         meta = hit.get("metadata", {}) or {}
         doc_id = meta.get("doc_id")
         if doc_id:
-            doc_ids_from_vector.append(doc_id)
-            dist = hit.get("distance")
-            sim = _similarity_from_distance(dist)
+            sim = _similarity_from_distance(hit.get("distance"))
             doc_scores[doc_id] = max(doc_scores.get(doc_id, 0), sim)
 
     entities = state.get("entities", {}) or {}
     centrality_scores = state.get("centrality_scores", {}) or state.get("graph_metadata", {}).get("centrality", {})
+    if not isinstance(centrality_scores, dict):
+        centrality_scores = {}
+    # Entities mentioned in a hit document, with their best document similarity
     entity_ids_from_docs: List[str] = []
+    entity_texts: List[Any] = []
+    vec_scores: List[float] = []
     if isinstance(entities, dict):
         for eid, ent in entities.items():
-            docs = ent.get("documents", []) if isinstance(ent, dict) else getattr(ent, "documents", [])
-            if any(d in doc_ids_from_vector for d in docs):
+            if isinstance(ent, dict):
+                docs, text = ent.get("documents", []), ent.get("text", eid)
+            else:
+                docs, text = getattr(ent, "documents", []), getattr(ent, "text", eid)
+            sims = [doc_scores[d] for d in docs if d in doc_scores]
+            if sims:
                 entity_ids_from_docs.append(eid)
+                entity_texts.append(text)
+                vec_scores.append(max(sims))
 
-    expanded: Dict[str, Dict[str, Any]] = {}
-    for eid in entity_ids_from_docs:
-        ent = entities.get(eid) if isinstance(entities, dict) else None
-        text = ent.get("text", eid) if isinstance(ent, dict) else getattr(ent, "text", eid)
-        vec_score = max(doc_scores.get(d, 0) for d in (ent.get("documents", []) if isinstance(ent, dict) else [])) if doc_ids_from_vector else 0.5
-        cent = centrality_scores.get(eid, 0.0) if isinstance(centrality_scores, dict) else 0.0
-        combined = vector_weight * vec_score + centrality_weight * cent
-        expanded[eid] = {
+    # Re-rank all candidates in one vectorized pass
+    vec = np.asarray(vec_scores, dtype=np.float64)
+    cent = np.fromiter((centrality_scores.get(eid, 0.0) for eid in entity_ids_from_docs), dtype=np.float64, count=len(vec))
+    combined = vector_weight * vec + centrality_weight * cent
+    expanded: Dict[str, Dict[str, Any]] = {
+        eid: {
             "entity_id": eid,
             "entity_text": text,
-            "combined_score": combined,
-            "vector_score": vec_score,
-            "centrality": cent,
+            "combined_score": c,
+            "vector_score": v,
+            "centrality": ce,
             "source": "vector",
         }
+        for eid, text, c, v, ce in zip(entity_ids_from_docs, entity_texts, combined.tolist(), vec_scores, cent.tolist())
+    }
 
     try:
         from knowledge_graph.neo4j_client import Neo4jClient
         neo = Neo4jClient()
         neo.connect()
-        neighbors = neo.get_neighbors(entity_ids_from_docs[:20], limit_per_entity=5)
-        neo.close()
-        for n in neighbors:
-            eid = n.get("entity_id")
-            if not eid or eid in expanded:
-                continue
-            cent = centrality_scores.get(eid, 0.0) if isinstance(centrality_scores, dict) else 0.0
-            expanded[eid] = {
-                "entity_id": eid,
-                "entity_text": n.get("text", eid),
-                "combined_score": centrality_weight * cent,
-                "vector_score": 0.0,
-                "centrality": cent,
-                "source": "graph",
-            }
+        try:
+            # Score rows as they stream in rather than after the whole result is fetched
+            for n in neo.iter_neighbors(entity_ids_from_docs[:20], limit_per_entity=5):
+                eid = n.get("entity_id")
+                if not eid or eid in expanded:
+                    continue
+                c = centrality_scores.get(eid, 0.0)
+                expanded[eid] = {
+                    "entity_id": eid,
+                    "entity_text": n.get("text", eid),
+                    "combined_score": centrality_weight * c,
+                    "vector_score": 0.0,
+                    "centrality": c,
+                    "source": "graph",
+                }
+        finally:
+            neo.close()
     except Exception as e:
         logger.debug(f"Hybrid search graph expansion skipped: {e}")
 
-    sorted_results = sorted(expanded.values(), key=lambda x: x["combined_score"], reverse=True)[:n_results]
-    return sorted_results
+    results = list(expanded.values())
+    scores = np.fromiter((r["combined_score"] for r in results), dtype=np.float64, count=len(results))
+    return [results[i] for i in _top_k(scores, n_results)]
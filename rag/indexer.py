@@ -3,11 +3,18 @@ SHERLOCK - Document chunking and indexing into vector store.
 """
 
 import re
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
 from loguru import logger
 
-from rag.vector_store import get_chroma_client, get_or_create_collection, add_chunks
-from rag.embeddings import get_embedding_model
+from core.config import settings
+from rag.vector_store import get_or_create_collection, add_chunks
+from rag.embeddings import embed_texts, get_embedding_model
+
+# Blank line (possibly holding other whitespace) between paragraphs
+_PARA_RE = re.compile(r"\n\s*\n")
 
 
 def chunk_text(text: str, chunk_size: int = 512, overlap: int = 50) -> List[str]:
@@ -15,33 +22,26 @@ def chunk_text(text: str, chunk_size: int = 512, overlap: int = 50) -> List[str]
     if not text or not text.strip():
         return []
     text = text.strip()
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-        if chunk.strip():
-            chunks.append(chunk.strip())
-        start = end - overlap if overlap < chunk_size else end
-    return chunks
+    step = chunk_size - overlap if overlap < chunk_size else chunk_size
+    pieces = (text[start:start + chunk_size].strip() for start in range(0, len(text), step))
+    return [p for p in pieces if p]
 
 
 def chunk_by_paragraphs(text: str, max_chars: int = 800) -> List[str]:
     """Chunk by paragraphs, then by size."""
-    paras = re.split(r"\n\s*\n", text)
-    chunks = []
-    current = []
+    chunks: List[str] = []
+    current: List[str] = []
     current_len = 0
-    for p in paras:
-        p = p.strip()
-        if not p:
-            continue
-        if current_len + len(p) + 2 > max_chars and current:
+    # Stripped paragraphs from one C-level split; each emitted chunk is joined once at its boundary
+    for p in filter(None, map(str.strip, _PARA_RE.split(text))):
+        n = len(p) + 2
+        if current and current_len + n > max_chars:
             chunks.append("\n\n".join(current))
-            current = []
-            current_len = 0
-        current.append(p)
-        current_len += len(p) + 2
+            current = [p]
+            current_len = n
+        else:
+            current.append(p)
+            current_len += n
     if current:
         chunks.append("\n\n".join(current))
     return chunks
@@ -55,8 +55,10 @@ def index_documents_from_state(state: Dict[str, Any], collection=None, model=Non
     if model is None:
         model = get_embedding_model()
     if collection is None:
-        client = get_chroma_client()
-        collection = get_or_create_collection(client)
+        collection = get_or_create_collection()
+    # Chunk every document first, then embed all chunks in one call (full batches across documents)
+    all_chunks: List[str] = []
+    spans: List[Tuple[str, int, int]] = []
     for doc_id, text in extracted.items():
         if not text or len(text.strip()) < 20:
             continue
@@ -64,5 +66,31 @@ def index_documents_from_state(state: Dict[str, Any], collection=None, model=Non
         if not chunks:
             chunks = chunk_text(text, chunk_size=400, overlap=40)
         if chunks:
-            add_chunks(doc_id, chunks, model=model, collection=collection)
-            logger.debug(f"Indexed {doc_id} ({len(chunks)} chunks)")
+            spans.append((doc_id, len(all_chunks), len(all_chunks) + len(chunks)))
+            all_chunks.extend(chunks)
+    if not all_chunks:
+        return
+    # Boilerplate repeated across documents (headers, footers, signatures) is embedded once
+    first: Dict[str, int] = {}
+    inverse = np.fromiter((first.setdefault(c, len(first)) for c in all_chunks), dtype=np.intp, count=len(all_chunks))
+    if len(first) < len(all_chunks):
+        embeddings = embed_texts(list(first), model=model)[inverse]
+        logger.debug(f"Embedded {len(first)} unique of {len(all_chunks)} chunks")
+    else:
+        embeddings = embed_texts(all_chunks, model=model)
+
+    def _add(span: Tuple[str, int, int]) -> None:
+        doc_id, start, end = span
+        add_chunks(doc_id, all_chunks[start:end], embeddings=embeddings[start:end], collection=collection)
+        logger.debug(f"Indexed {doc_id} ({end - start} chunks)")
+
+    # Per-document adds are independent round-trips to the store; overlap them (clients are thread-safe)
+    workers = min(max(1, settings.INDEX_WORKERS), len(spans))
+    if workers == 1:
+        for span in spans:
+            _add(span)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="index") as pool:
+            list(pool.map(_add, spans))
+    if hasattr(collection, "persist"):
+        collection.persist()
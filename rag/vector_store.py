@@ -2,14 +2,79 @@
 SHERLOCK - Vector store (Chroma).
 """
 
-from typing import List, Optional, Dict, Any
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import List, Optional, Dict, Any, Tuple, Union
+
+import numpy as np
 from loguru import logger
 
 from core.config import settings
+from rag.embeddings import embed_single, embed_texts
+
+# Collections of the cached default client, by name
+_default_collections: Dict[str, Any] = {}
+_collections_lock = Lock()
+
+# Chunks per collection.add request (stays under Chroma's default max batch of 5461)
+_ADD_BATCH = 5000
+
+# Fields query_similar asks Chroma for unless the caller narrows them (ids always come back)
+_DEFAULT_INCLUDE = ["documents", "metadatas", "distances"]
+
+# Query results reused for near-duplicate queries (cosine >= threshold) within the TTL
+_QUERY_CACHE_MAX = 256
+_QUERY_CACHE_TTL_S = 300.0
+_QUERY_CACHE_THRESHOLD = 0.95
+
+
+class _QueryCache:
+    """
+    Semantic L1 cache for query_similar: recent results keyed by unit query embedding, scoped by
+    (collection, n_results, include); lookup is one dot product against the cached vectors. LRU-bounded.
+    """
+
+    def __init__(self, max_entries: int, ttl_s: float, threshold: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.threshold = threshold
+        self.lock = Lock()
+        self.entries: "OrderedDict[int, Tuple[Tuple[Any, ...], np.ndarray, float, List[Dict[str, Any]]]]" = OrderedDict()
+        self.next_id = 0
+
+    def get(self, scope: Tuple[Any, ...], vec: np.ndarray) -> Optional[List[Dict[str, Any]]]:
+        now = time.monotonic()
+        with self.lock:
+            ids = [k for k, (sc, _, expires, _) in self.entries.items() if sc == scope and expires > now]
+            if not ids:
+                return None
+            sims = np.stack([self.entries[k][1] for k in ids]) @ vec
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            self.entries.move_to_end(ids[best])
+            return list(self.entries[ids[best]][3])
+
+    def put(self, scope: Tuple[Any, ...], vec: np.ndarray, results: List[Dict[str, Any]]) -> None:
+        with self.lock:
+            self.entries[self.next_id] = (scope, vec, time.monotonic() + self.ttl_s, results)
+            self.next_id += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
 
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
 
+
+_query_cache = _QueryCache(_QUERY_CACHE_MAX, _QUERY_CACHE_TTL_S, _QUERY_CACHE_THRESHOLD)
+
+
+@lru_cache(maxsize=1)
 def get_chroma_client():
-    """Get Chroma client (persistent or in-memory)."""
+    """Get Chroma client (persistent or in-memory); created and heartbeat-checked once per process."""
     try:
         import chromadb
         from chromadb.config import Settings as ChromaSettings
@@ -31,38 +96,64 @@ def get_chroma_client():
 
 
 def get_or_create_collection(client=None, name: Optional[str] = None):
-    """Get or create collection."""
-    if client is None:
-        client = get_chroma_client()
+    """Get or create collection (Chroma, or a FaissCollection with the same API when VECTOR_BACKEND=faiss)."""
     coll_name = name or settings.CHROMA_COLLECTION
-    return client.get_or_create_collection(name=coll_name, metadata={"description": "SHERLOCK documents"})
+    if (settings.VECTOR_BACKEND or "").lower() == "faiss":
+        try:
+            from rag.faiss_store import get_faiss_collection
+            return get_faiss_collection(coll_name)
+        except ImportError:
+            logger.warning("VECTOR_BACKEND=faiss but faiss is not installed; using Chroma")
+    if client is not None:
+        return client.get_or_create_collection(name=coll_name, metadata={"description": "SHERLOCK documents"})
+    with _collections_lock:
+        coll = _default_collections.get(coll_name)
+        if coll is None:
+            coll = get_chroma_client().get_or_create_collection(
+                name=coll_name, metadata={"description": "SHERLOCK documents"}
+            )
+            _default_collections[coll_name] = coll
+        return coll
+
+
+def reset_chroma_client() -> None:
+    """Forget the cached client and collections (tests, or after the Chroma server comes back)."""
+    get_chroma_client.cache_clear()
+    with _collections_lock:
+        _default_collections.clear()
 
 
 def add_chunks(
     doc_id: str,
     chunks: List[str],
     chunk_ids: Optional[List[str]] = None,
-    embeddings: Optional[List[List[float]]] = None,
+    embeddings: Optional[Union[np.ndarray, List[List[float]]]] = None,
     model=None,
     collection=None,
 ) -> None:
     """Add document chunks to collection. If embeddings is None, compute them."""
     if collection is None:
-        client = get_chroma_client()
-        collection = get_or_create_collection(client)
+        collection = get_or_create_collection()
     if not chunks:
         return
     if chunk_ids is None:
         chunk_ids = [f"{doc_id}_{i}" for i in range(len(chunks))]
     if embeddings is None:
-        from rag.embeddings import embed_texts
         embeddings = embed_texts(chunks, model=model)
-    collection.add(
-        ids=chunk_ids,
-        documents=chunks,
-        embeddings=embeddings,
-        metadatas=[{"doc_id": doc_id}] * len(chunks),
-    )
+    else:
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+    # Cached query results may no longer be the nearest chunks
+    _query_cache.clear()
+    # Independent dicts (Chroma may normalize metadata in place); large docs go in several requests
+    metadatas = [{"doc_id": doc_id} for _ in range(len(chunks))]
+    for i in range(0, len(chunks), _ADD_BATCH):
+        j = i + _ADD_BATCH
+        collection.add(
+            ids=chunk_ids[i:j],
+            documents=chunks[i:j],
+            embeddings=embeddings[i:j],
+            metadatas=metadatas[i:j],
+        )
 
 
 def query_similar(
@@ -71,29 +162,53 @@ def query_similar(
     doc_ids_filter: Optional[List[str]] = None,
     collection=None,
     model=None,
+    include: Optional[List[str]] = None,
+    use_cache: bool = False,
 ) -> List[Dict[str, Any]]:
-    """Query by text (will be embedded) or by embedding vector. Returns list of {id, document, metadata, distance}."""
+    """
+    Query by text (will be embedded) or by embedding vector. Returns list of {id, document, metadata, distance}.
+    include narrows the fields Chroma returns (e.g. ["metadatas", "distances"]); left-out fields come back None/{}.
+    use_cache serves near-duplicate text queries from the semantic cache (interactive search only:
+    a near-duplicate document must get its own neighbours, not its twin's).
+    """
+    include = include or _DEFAULT_INCLUDE
     if collection is None:
-        client = get_chroma_client()
-        collection = get_or_create_collection(client)
-    if isinstance(text_or_embedding, str):
-        from rag.embeddings import embed_single
+        collection = get_or_create_collection()
+    cache_key = None
+    is_text = isinstance(text_or_embedding, str)
+    if is_text:
         query_embedding = embed_single(text_or_embedding, model=model)
     else:
-        query_embedding = text_or_embedding
+        # Lists and ndarrays of any dtype: one float32 vector, never re-embedded
+        query_embedding = np.asarray(text_or_embedding, dtype=np.float32)
+    # Unit length once: stored chunk embeddings are normalized, and the cache compares by inner product
+    norm = float(np.linalg.norm(query_embedding))
+    if norm > 0:
+        query_embedding = query_embedding / norm
+        if use_cache and is_text and not doc_ids_filter:
+            # Only text queries are cached: filtered queries are a different answer for the same text,
+            # and a caller's own vector is asked for exactly, not for its near-duplicates
+            cache_key = ((getattr(collection, "name", id(collection)), n_results, tuple(include)), query_embedding)
+            hit = _query_cache.get(*cache_key)
+            if hit is not None:
+                return hit
     where = {"doc_id": {"$in": doc_ids_filter}} if doc_ids_filter else None
     result = collection.query(
         query_embeddings=[query_embedding],
         n_results=n_results,
         where=where,
-        include=["documents", "metadatas", "distances"],
+        include=include,
     )
-    out = []
-    for i, id_ in enumerate(result["ids"][0] or []):
-        out.append({
-            "id": id_,
-            "document": (result["documents"][0] or [])[i] if result["documents"] else None,
-            "metadata": (result["metadatas"][0] or [{}])[i] if result["metadatas"] else {},
-            "distance": (result["distances"][0] or [0])[i] if result.get("distances") else None,
-        })
+    ids = result["ids"][0] or []
+    n = len(ids)
+    docs = (result.get("documents") or [None])[0] or [None] * n
+    metas = (result.get("metadatas") or [None])[0] or [{}] * n
+    dists = (result.get("distances") or [None])[0] or [None] * n
+    out = [
+        {"id": id_, "document": doc, "metadata": meta, "distance": dist}
+        for id_, doc, meta, dist in zip(ids, docs, metas, dists)
+    ]
+    if cache_key is not None:
+        _query_cache.put(*cache_key, out)
+        return list(out)
     return out
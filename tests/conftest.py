@@ -40,6 +40,8 @@ def mock_neo4j():
         instance.close = MagicMock()
         instance.create_entity_node = MagicMock()
         instance.create_relationship = MagicMock()
+        instance.create_entities_batch = MagicMock()
+        instance.create_relationships_batch = MagicMock()
         instance.get_graph_stats = MagicMock(return_value={
             "node_count": 0, "relationship_count": 0, "edge_count": 0, "entity_types": {}
         })
@@ -50,14 +52,25 @@ def mock_neo4j():
         yield m
 
 
+@pytest.fixture(scope="session")
+def chroma_session_client():
+    """One in-memory Chroma client for the whole session (chromadb import + init paid once)."""
+    try:
+        import chromadb
+        return chromadb.Client()
+    except Exception:
+        return None
+
+
 @pytest.fixture
-def mock_chroma():
-    """Mock Chroma to use in-memory or avoid server."""
+def mock_chroma(chroma_session_client):
+    """Mock Chroma to use in-memory or avoid server; collections are dropped after each test."""
+    from rag.vector_store import reset_chroma_client
+    reset_chroma_client()
     with patch("rag.vector_store.get_chroma_client") as m:
-        try:
-            import chromadb
-            client = chromadb.Client()
-            m.return_value = client
-        except Exception:
-            m.return_value = MagicMock()
+        m.return_value = chroma_session_client if chroma_session_client is not None else MagicMock()
         yield m
+    reset_chroma_client()
+    if chroma_session_client is not None:
+        for coll in chroma_session_client.list_collections():
+            chroma_session_client.delete_collection(getattr(coll, "name", coll))
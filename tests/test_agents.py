@@ -110,12 +110,13 @@ def test_activity_monitor_emit_and_get_recent():
     from core.monitors import ActivityMonitor
     monitor = ActivityMonitor()
     monitor.clear()
-    monitor.emit("agent1", "start", docs=0)
-    monitor.emit("agent1", "end", docs=2)
+    monitor.emit("agent1", "start", payload={"docs": 0})
+    monitor.emit("agent1", "end", payload={"docs": 2})
     recent = monitor.get_recent(10)
     assert len(recent) == 2
     assert recent[0]["agent"] == "agent1" and recent[0]["step"] == "start"
     assert recent[1]["step"] == "end"
+    assert recent[1]["payload"] == {"docs": 2}
 
 
 def test_odos_valid_empty_findings():
@@ -138,3 +139,20 @@ def test_suggest_caesar_shift():
     cipher = "ebiil"
     shift = suggest_caesar_shift(cipher, "en")
     assert 0 <= shift <= 25
+
+
+def test_activity_monitor_get_since_returns_only_new_events():
+    from core.monitors import ActivityMonitor
+    monitor = ActivityMonitor()
+    monitor.clear()
+    monitor.emit("agent1", "start", investigation_id="inv1")
+    first = monitor.get_since(0)
+    assert len(first) == 1
+    last_seq = first[-1]["seq"]
+    assert monitor.get_since(last_seq) == []
+    monitor.emit("agent1", "end", investigation_id="inv1")
+    monitor.emit("agent2", "start", investigation_id="inv2")
+    new = monitor.get_since(last_seq)
+    assert [e["step"] for e in new] == ["end", "start"]
+    assert [e["agent"] for e in monitor.get_since(last_seq, investigation_id="inv2")] == ["agent2"]
+    assert [e["step"] for e in monitor.get_recent(1, investigation_id="inv1")] == ["end"]
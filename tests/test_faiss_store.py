@@ -0,0 +1,101 @@
+"""
+FAISS vector backend tests: add/query/dedup, include, and the persist/reload round trip.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+
+from core.config import settings
+from rag.faiss_store import FaissCollection
+
+
+@pytest.fixture
+def embeddings_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDINGS_DIR", tmp_path)
+    monkeypatch.setattr(settings, "FAISS_SQ8", False)
+    return tmp_path
+
+
+def _vec(*values):
+    return np.asarray(values, dtype=np.float32)
+
+
+def test_add_and_query_nearest_first(embeddings_dir):
+    coll = FaissCollection("t")
+    coll.add(
+        ids=["a", "b"],
+        embeddings=[_vec(1, 0, 0), _vec(0, 1, 0)],
+        documents=["doc a", "doc b"],
+        metadatas=[{"doc_id": "A"}, {"doc_id": "B"}],
+    )
+    res = coll.query(query_embeddings=[_vec(0.9, 0.1, 0)], n_results=2)
+    assert res["ids"] == [["a", "b"]]
+    assert res["documents"] == [["doc a", "doc b"]]
+    assert res["metadatas"] == [[{"doc_id": "A"}, {"doc_id": "B"}]]
+    assert res["distances"][0][0] < res["distances"][0][1]
+
+
+def test_add_skips_existing_and_repeated_ids(embeddings_dir):
+    coll = FaissCollection("t")
+    coll.add(ids=["a"], embeddings=[_vec(1, 0)])
+    coll.add(ids=["a", "b", "b"], embeddings=[_vec(1, 0), _vec(0, 1), _vec(0, 1)])
+    assert coll.count() == 2
+    assert coll.query(query_embeddings=[_vec(1, 0)], n_results=5)["ids"] == [["a", "b"]]
+
+
+def test_query_include_and_where(embeddings_dir):
+    coll = FaissCollection("t")
+    coll.add(
+        ids=["a", "b"],
+        embeddings=[_vec(1, 0), _vec(0.8, 0.2)],
+        documents=["doc a", "doc b"],
+        metadatas=[{"doc_id": "A"}, {"doc_id": "B"}],
+    )
+    res = coll.query(
+        query_embeddings=[_vec(1, 0)], n_results=2, where={"doc_id": {"$in": ["B"]}}, include=["distances"],
+    )
+    assert res["ids"] == [["b"]]
+    assert res["documents"] is None and res["metadatas"] is None
+    assert len(res["distances"][0]) == 1
+
+
+def test_persist_round_trip(embeddings_dir):
+    coll = FaissCollection("t")
+    coll.add(ids=["a", "b"], embeddings=[_vec(1, 0), _vec(0, 1)], documents=["x", "y"])
+    coll.persist()
+    loaded = FaissCollection("t")
+    assert loaded.count() == 2
+    res = loaded.query(query_embeddings=[_vec(0, 1)], n_results=1)
+    assert res["ids"] == [["b"]]
+    assert res["documents"] == [["y"]]
+
+
+def test_persist_merges_other_writers(embeddings_dir):
+    # Two processes' views of one collection: neither overwrites the other's chunks
+    first = FaissCollection("t")
+    second = FaissCollection("t")
+    first.add(ids=["a"], embeddings=[_vec(1, 0)])
+    second.add(ids=["b"], embeddings=[_vec(0, 1)])
+    first.persist()
+    second.persist()
+    assert second.count() == 2
+    # The first view reloads the merged files on its next read
+    assert first.query(query_embeddings=[_vec(0, 1)], n_results=1)["ids"] == [["b"]]
+    assert FaissCollection("t").count() == 2
+
+
+def test_reload_before_persist_keeps_unsaved_chunks(embeddings_dir):
+    # A read that reloads another process's files must not drop this process's unsaved chunks
+    first = FaissCollection("t")
+    second = FaissCollection("t")
+    first.add(ids=["a1"], embeddings=[_vec(1, 0)])
+    second.add(ids=["b0"], embeddings=[_vec(0, 1)])
+    second.persist()
+    second.add(ids=["b1"], embeddings=[_vec(0.5, 0.5)])
+    second.persist()
+    assert first.count() == 3
+    first.persist()
+    loaded = FaissCollection("t")
+    assert sorted(loaded.query(query_embeddings=[_vec(1, 0)], n_results=5)["ids"][0]) == ["a1", "b0", "b1"]
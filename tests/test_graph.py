@@ -87,3 +87,15 @@ def test_graph_invoke_with_uploads(sample_uploads, mock_neo4j):
         "synthesis_complete",
         "odos_guardian_complete",
     ) or len(result.get("error_log", [])) > 0
+
+
+def test_build_graph_reuses_agent_instances(monkeypatch):
+    """Plain and monitored graphs share one set of agent nodes (no re-instantiation)."""
+    import core.graph as graph_mod
+    from core.graph_enhanced import create_monitored_graph
+
+    nodes = {name: (lambda s: s) for name, _ in graph_mod._AGENT_FACTORIES}
+    monkeypatch.setattr(graph_mod, "_agent_nodes", dict(nodes))
+    graph_mod.build_graph().compile()
+    create_monitored_graph()
+    assert graph_mod._agent_nodes == nodes
@@ -0,0 +1,142 @@
+"""
+Steganography pre-filter tests: the leading-scanline PNG reader and the "<digits>:" LSB header check.
+"""
+
+import struct
+import zlib
+
+import pytest
+
+from cryptanalysis.steganography import _HEADER_CHARS, _leading_pixels, _may_hold_lsb_message, _paeth
+
+
+def _chunk(ctype: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + ctype + body + struct.pack(">I", zlib.crc32(ctype + body) & 0xFFFFFFFF)
+
+
+def _filter_row(ftype: int, line: bytes, prev: bytes, bpp: int) -> bytes:
+    """PNG encoder side of filter `ftype` (the reader under test undoes it)."""
+    out = bytearray()
+    for i, x in enumerate(line):
+        a = line[i - bpp] if i >= bpp else 0
+        b = prev[i]
+        c = prev[i - bpp] if i >= bpp else 0
+        pred = (0, a, b, (a + b) >> 1, _paeth(a, b, c))[ftype]
+        out.append((x - pred) & 0xFF)
+    return bytes([ftype]) + bytes(out)
+
+
+def _png(
+    path,
+    rows,
+    bpp=3,
+    filters=(0,),
+    depth=8,
+    color=None,
+    interlace=0,
+    idat_parts=3,
+):
+    """Write `rows` (raw scanline bytes) as a PNG, cycling `filters` per row and splitting IDAT."""
+    width = len(rows[0]) // bpp
+    color = color if color is not None else (2 if bpp == 3 else 6)
+    raw = bytearray()
+    prev = bytes(len(rows[0]))
+    for r, line in enumerate(rows):
+        raw += _filter_row(filters[r % len(filters)], line, prev, bpp)
+        prev = line
+    data = zlib.compress(bytes(raw))
+    step = -(-len(data) // idat_parts)
+    ihdr = struct.pack(">IIBBBBB", width, len(rows), depth, color, 0, 0, interlace)
+    body = b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", ihdr) + _chunk(b"tEXt", b"Comment\x00test")
+    for i in range(0, len(data), step):
+        body += _chunk(b"IDAT", data[i:i + step])
+    path.write_bytes(body + _chunk(b"IEND", b""))
+    return path
+
+
+def _noise_rows(width, height, bpp):
+    return [bytes((r * 97 + i * 31 + (i * i) % 251) & 0xFF for i in range(width * bpp)) for r in range(height)]
+
+
+def _message_rows(message: str, width: int, height: int, bpp: int = 3):
+    """Pixels whose R, G, B least significant bits spell `message` (stegano.lsb order), MSB first."""
+    bits = [int(b) for ch in message for b in format(ord(ch), "08b")]
+    values = []
+    for v in range(width * height * 3):
+        base = (v * 37) & 0xFE
+        values.append(base | (bits[v] if v < len(bits) else 0))
+    rows = []
+    for r in range(height):
+        line = bytearray()
+        for p in range(width):
+            k = (r * width + p) * 3
+            line += bytes(values[k:k + 3])
+            if bpp == 4:
+                line.append(255)
+        rows.append(bytes(line))
+    return rows
+
+
+@pytest.mark.parametrize("bpp", [3, 4])
+@pytest.mark.parametrize("ftype", [0, 1, 2, 3, 4])
+def test_leading_pixels_unfilters_each_filter_type(tmp_path, ftype, bpp):
+    width, height, count = 5, 4, 12
+    rows = _noise_rows(width, height, bpp)
+    path = _png(tmp_path / "img.png", rows, bpp=bpp, filters=(ftype,))
+    flat = b"".join(rows)
+    expected = [flat[i * bpp:i * bpp + 3] for i in range(count)]
+    assert _leading_pixels(path, count) == expected
+
+
+@pytest.mark.parametrize("bpp", [3, 4])
+def test_leading_pixels_mixed_filters_and_split_idat(tmp_path, bpp):
+    width, height = 7, 6
+    rows = _noise_rows(width, height, bpp)
+    path = _png(tmp_path / "img.png", rows, bpp=bpp, filters=(4, 0, 3, 1, 2), idat_parts=7)
+    flat = b"".join(rows)
+    count = width * height
+    assert _leading_pixels(path, count) == [flat[i * bpp:i * bpp + 3] for i in range(count)]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"interlace": 1},
+        {"color": 3, "bpp": 3},
+        {"depth": 16},
+    ],
+    ids=["interlaced", "palette", "16-bit"],
+)
+def test_leading_pixels_unsupported_layouts_return_none(tmp_path, kwargs):
+    path = _png(tmp_path / "img.png", _noise_rows(4, 4, 3), **kwargs)
+    assert _leading_pixels(path, 8) is None
+    # The pre-filter cannot read the header itself, so it leaves the decision to lsb.reveal
+    assert _may_hold_lsb_message(path) is True
+
+
+def test_leading_pixels_image_smaller_than_header(tmp_path):
+    path = _png(tmp_path / "img.png", _noise_rows(2, 2, 3))
+    assert _leading_pixels(path, 8) is None
+    assert _may_hold_lsb_message(path) is True
+
+
+def test_leading_pixels_not_a_png(tmp_path):
+    path = tmp_path / "img.png"
+    path.write_bytes(b"GIF89a" + bytes(64))
+    assert _leading_pixels(path, 4) is None
+
+
+@pytest.mark.parametrize("bpp", [3, 4])
+def test_header_with_length_prefix_is_accepted(tmp_path, bpp):
+    path = _png(tmp_path / "img.png", _message_rows("12:hello world", 8, 8, bpp), bpp=bpp, filters=(1, 4))
+    assert _may_hold_lsb_message(path) is True
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["hello world!", ":12345678901", "1234567890123:x", "12a:xyz"],
+    ids=["no-digits", "colon-first", "no-colon-in-header", "letter-before-colon"],
+)
+def test_header_without_length_prefix_is_rejected(tmp_path, message):
+    path = _png(tmp_path / "img.png", _message_rows(message.ljust(_HEADER_CHARS + 2, "x"), 8, 8))
+    assert _may_hold_lsb_message(path) is False
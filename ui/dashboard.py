@@ -11,6 +11,7 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import httpx
 import streamlit as st
 from loguru import logger
 
@@ -23,6 +24,27 @@ from knowledge_graph.visualizer import export_from_state
 # Default API URL for real-time events
 API_URL = "http://localhost:8001"
 
+
+@st.cache_resource(show_spinner=False)
+def _get_graph():
+    """Compiled pipeline, built once per Streamlit server (agents, spaCy, LangGraph compile)."""
+    return create_sherlock_graph()
+
+
+@st.cache_resource(show_spinner=False)
+def _http() -> httpx.Client:
+    """One pooled HTTP client per Streamlit server (the script itself re-runs on every interaction)."""
+    return httpx.Client(timeout=10, limits=httpx.Limits(max_keepalive_connections=4))
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _fetch_events(api_url: str, n: int = 100) -> dict:
+    """GET /events, reused for 2s so repeated refreshes do not each hit the API."""
+    r = _http().get(f"{api_url.rstrip('/')}/events", params={"n": n}, timeout=5)
+    r.raise_for_status()
+    return r.json()
+
+
 st.set_page_config(page_title="SHERLOCK", page_icon="🔍", layout="wide")
 st.title("🔍 SHERLOCK Intelligence System")
 
@@ -48,7 +70,7 @@ with tab_run:
                 try:
                     initial = create_initial_state()
                     initial["config"] = {"uploads_path": str(settings.UPLOADS_DIR)}
-                    app = create_sherlock_graph()
+                    app = _get_graph()
                     state = app.invoke(initial)
                     st.session_state["last_state"] = state
                     st.session_state["last_run_ok"] = True
@@ -63,8 +85,7 @@ with tab_run:
     with col_api:
         if st.button("Start investigation (via API, monitored)"):
             try:
-                import httpx
-                r = httpx.post(f"{api_url.rstrip('/')}/investigate", json={"uploads_path": str(settings.UPLOADS_DIR)}, timeout=10)
+                r = _http().post(f"{api_url.rstrip('/')}/investigate", json={"uploads_path": str(settings.UPLOADS_DIR)}, timeout=10)
                 r.raise_for_status()
                 run_id = r.json().get("run_id")
                 st.session_state["last_run_id"] = run_id
@@ -77,10 +98,7 @@ with tab_activity:
     api_url_act = st.session_state.get("api_url", API_URL)
     if st.button("Refresh activity"):
         try:
-            import httpx
-            r = httpx.get(f"{api_url_act.rstrip('/')}/events", params={"n": 100}, timeout=5)
-            r.raise_for_status()
-            data = r.json()
+            data = _fetch_events(api_url_act)
             events = data.get("events", [])
             if events:
                 rows = [[e.get("agent"), e.get("step"), e.get("timestamp")] for e in reversed(events)]
@@ -94,8 +112,7 @@ with tab_activity:
         run_id = st.session_state["last_run_id"]
         if st.button("Check run status"):
             try:
-                import httpx
-                r = httpx.get(f"{api_url_act.rstrip('/')}/runs/{run_id}", params={"full": 1}, timeout=10)
+                r = _http().get(f"{api_url_act.rstrip('/')}/runs/{run_id}", params={"full": 1}, timeout=10)
                 data = r.json()
                 st.write("Status:", data.get("status"))
                 if data.get("status") == "completed":
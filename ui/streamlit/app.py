@@ -10,8 +10,11 @@ ROOT = Path(__file__).resolve().parent.parent.parent  # ui/streamlit -> ui -> pr
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import orjson
 import streamlit as st
 
+from ui.streamlit.utils.http import get_client
+
 st.set_page_config(page_title="SHERLOCK", page_icon="🔍", layout="wide")
 
 API_URL = "http://localhost:8001"
@@ -25,9 +28,8 @@ with st.sidebar:
     st.session_state["api_url"] = st.text_input("API URL", value=st.session_state["api_url"], key="api_url_sb")
     api_ok = True
     try:
-        import httpx
-        r = httpx.get(f"{st.session_state['api_url'].rstrip('/')}/investigations", timeout=5)
-        data = r.json()
+        r = get_client().get(f"{st.session_state['api_url'].rstrip('/')}/investigations", timeout=5)
+        data = orjson.loads(r.content)
         invs = data.get("investigations", [])
     except Exception:
         api_ok = False
@@ -1,9 +1,17 @@
 """Entity table component with optional filters."""
+import pandas as pd
 import streamlit as st
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 
-def render_entity_table(entities: Dict[str, Any], columns: Optional[List[str]] = None) -> None:
+def render_entity_table(entities: Union[Dict[str, Any], pd.DataFrame], columns: Optional[List[str]] = None) -> None:
+    if isinstance(entities, pd.DataFrame):
+        # Already tabular: hand it to st.dataframe as is (no per-row dict rebuild)
+        if entities.empty:
+            st.info("No entities.")
+        else:
+            st.dataframe(entities, use_container_width=True)
+        return
     if not entities:
         st.info("No entities.")
         return
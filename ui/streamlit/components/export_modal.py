@@ -1,18 +1,25 @@
 """Export modal / buttons (JSON, CSV)."""
+import pandas as pd
 import streamlit as st
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Union
 
+from ui.streamlit.utils.exporters import entities_to_json, records_to_csv
 
-def export_buttons(data: List[Dict[str, Any]], base_name: str = "export") -> None:
-    if not data:
+
+def export_buttons(data: Union[List[Dict[str, Any]], pd.DataFrame], base_name: str = "export") -> None:
+    if isinstance(data, pd.DataFrame):
+        if data.empty:
+            return
+        # Columnar data is written by pandas' own writers (missing cells: null / empty field)
+        json_text = data.to_json(orient="records", force_ascii=False, indent=2)
+        csv_text = data.to_csv(index=False)
+    elif data:
+        json_text = entities_to_json(data)
+        csv_text = records_to_csv(data)
+    else:
         return
     col1, col2 = st.columns(2)
     with col1:
-        st.download_button("Download JSON", data=__import__("json").dumps(data, ensure_ascii=False, indent=2), file_name=f"{base_name}.json", mime="application/json")
+        st.download_button("Download JSON", data=json_text, file_name=f"{base_name}.json", mime="application/json")
     with col2:
-        if data and isinstance(data[0], dict):
-            keys = list(data[0].keys())
-            csv = ",".join(keys) + "\n" + "\n".join(",".join(str(r.get(k, "")) for k in keys) for r in data)
-        else:
-            csv = ""
-        st.download_button("Download CSV", data=csv, file_name=f"{base_name}.csv", mime="text/csv")
+        st.download_button("Download CSV", data=csv_text, file_name=f"{base_name}.csv", mime="text/csv")
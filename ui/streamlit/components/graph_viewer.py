@@ -1,29 +1,36 @@
-"""Graph viewer component (Pyvis)."""
+"""Graph viewer component (vis-network HTML from knowledge_graph.visualizer)."""
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import orjson
 import streamlit as st
-from pathlib import Path
-from typing import Any, Dict, List
 
+from knowledge_graph.visualizer import render_network_html
 
-def render_graph_from_state(state: Dict[str, Any], height: int = 600) -> None:
-    """Render knowledge graph from state (entities + relationships) using Pyvis if available."""
-    try:
-        from pyvis.network import Network  # noqa: F401
-    except ImportError:
-        st.info("Install pyvis for graph visualization: `pip install pyvis`")
-        return
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _graph_html(graph_key: str, _entities: Dict[str, Any], _relationships: List[Any]) -> str:
+    # Keyed by graph_key only (Streamlit does not hash "_" arguments)
+    return render_network_html(_entities, _relationships)
+
+
+def _graph_key(entities: Dict[str, Any], relationships: List[Any]) -> str:
+    """Digest of the graph content: unchanged graphs reuse the rendered page across reruns."""
+    h = hashlib.blake2b(orjson.dumps(entities), digest_size=16)
+    h.update(orjson.dumps(relationships))
+    return h.hexdigest()
+
+
+def render_graph_from_state(state: Dict[str, Any], height: int = 600, state_digest: Optional[str] = None) -> None:
+    """Render knowledge graph from state (entities + relationships); state_digest (from get_state) skips re-hashing."""
     entities = state.get("entities", {}) or {}
     relationships = state.get("relationships", []) or []
     if not entities and not relationships:
         st.info("No data for this investigation yet. Run the pipeline or select another investigation. Open **Dashboard** from the sidebar to create or run an investigation.")
         return
     try:
-        from knowledge_graph.visualizer import export_from_state
-        path = export_from_state(state)
-        if path and Path(path).exists():
-            with open(path, "r", encoding="utf-8") as f:
-                html = f.read()
-            st.components.v1.html(html, height=height)
-        else:
-            st.warning("Graph export failed.")
+        key = state_digest or _graph_key(entities, relationships)
+        html = _graph_html(key, entities, relationships)
+        st.components.v1.html(html, height=height)
     except Exception as e:
         st.error(f"Graph error: {e}")
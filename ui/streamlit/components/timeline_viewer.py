@@ -2,6 +2,8 @@
 import streamlit as st
 from typing import Any, List
 
+from ui.streamlit.utils.formatters import first_nonempty
+
 
 def render_timeline(timeline: List[Any]) -> None:
     if not timeline:
@@ -10,14 +12,25 @@ def render_timeline(timeline: List[Any]) -> None:
             "then return here."
         )
         return
+    # One table for up to 100 events instead of two elements per event
+    rows = []
     for ev in timeline[:100]:
         if isinstance(ev, dict):
-            date = ev.get("date") or ev.get("timestamp") or ev.get("event_id", "")
-            desc = ev.get("description", "")
-            entities = ev.get("entities_involved", ev.get("entities", [])) or []
-            ent_str = ", ".join(entities[:5]) if isinstance(entities, list) else str(entities)[:100]
-            st.markdown(f"- **{date}** — {desc}")
-            if ent_str:
-                st.caption(f"Entities: {ent_str}")
+            entities = first_nonempty(ev, "entities_involved", "entities", default=[])
+            rows.append({
+                "date": first_nonempty(ev, "date", "timestamp", "event_id"),
+                "description": ev.get("description", ""),
+                "entities": ", ".join(entities[:5]) if isinstance(entities, list) else str(entities)[:100],
+            })
         else:
-            st.markdown(f"- {getattr(ev, 'description', str(ev))}")
+            rows.append({"date": "", "description": getattr(ev, "description", str(ev)), "entities": ""})
+    st.dataframe(
+        rows,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "date": "Date",
+            "description": st.column_config.TextColumn("Event", width="large"),
+            "entities": "Entities",
+        },
+    )
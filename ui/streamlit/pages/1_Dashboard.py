@@ -1,11 +1,18 @@
 """Dashboard: metrics, activity feed, new investigation."""
+import hashlib
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 ROOT = Path(__file__).resolve().parent.parent.parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import orjson
+import pandas as pd
 import streamlit as st
+from ui.streamlit.utils.http import get_client, get_state
 
 API_URL = st.session_state.get("api_url", "http://localhost:8001")
 inv_id = st.session_state.get("investigation_id")
@@ -13,9 +20,8 @@ inv_id = st.session_state.get("investigation_id")
 with st.sidebar:
     st.session_state["api_url"] = st.text_input("API URL", value=API_URL, key="api_url_dash")
     try:
-        import httpx
-        r = httpx.get(f"{st.session_state['api_url'].rstrip('/')}/investigations", timeout=5)
-        invs = r.json().get("investigations", [])
+        r = get_client().get(f"{st.session_state['api_url'].rstrip('/')}/investigations", timeout=5)
+        invs = orjson.loads(r.content).get("investigations", [])
     except Exception:
         invs = []
     if invs:
@@ -29,28 +35,52 @@ with st.sidebar:
         sel = st.selectbox("Investigation", opts, index=idx, key="inv_dash")
         if sel:
             st.session_state["investigation_id"] = invs[opts.index(sel)].get("id")
+    refresh_s = st.slider("Activity refresh (s, 0 = off)", 0, 60, 5, key="dash_refresh_s")
 
 st.title("Dashboard")
 base = st.session_state["api_url"].rstrip("/")
+# Concurrent per-file upload requests
+_UPLOAD_WORKERS = 8
+# Longest pause of activity-feed polling after failed requests
+_MAX_BACKOFF_S = 60.0
+
+
+def _unique_names(names: List[str]) -> List[str]:
+    """Upload names with repeats renamed name_1.ext, name_2.ext, ... (as the API does within one request)."""
+    out: List[str] = []
+    taken = set()
+    for name in names:
+        final, n = name, 0
+        stem, suffix = Path(name).stem, Path(name).suffix
+        while final in taken:
+            n += 1
+            final = f"{stem}_{n}{suffix}"
+        taken.add(final)
+        out.append(final)
+    return out
+
+
+def _get_json(path: str, **params: Any) -> Dict[str, Any]:
+    r = get_client().get(f"{base}{path}", params=params or None, timeout=5)
+    r.raise_for_status()
+    return orjson.loads(r.content)
+
+
+# Investigation overview (summary + files) and activity feed are independent: issue them together
+with st.spinner("Loading..."), ThreadPoolExecutor(max_workers=2) as pool:
+    events_f = pool.submit(_get_json, "/events", n=20)
+    overview_f = pool.submit(_get_json, f"/investigations/{inv_id}/summary") if inv_id else None
 
 # Metrics from current investigation or placeholder
 doc_count = entity_count = hyp_count = 0
 odos_status = "—"
 if inv_id:
     try:
-        with st.spinner("Loading..."):
-            import httpx
-            r = httpx.get(f"{base}/investigations/{inv_id}", timeout=5)
-            d = r.json()
-            summary = d.get("summary", {})
-            doc_count = summary.get("document_count", 0)
-            entity_count = summary.get("entity_count", 0)
-            hyp_count = 0
-            odos_status = summary.get("odos_status", "—")
-            state_r = httpx.get(f"{base}/investigations/{inv_id}/state", timeout=5)
-            state_data = state_r.json().get("state", {})
-            if state_data:
-                hyp_count = len(state_data.get("hypotheses", []))
+        summary = overview_f.result().get("summary", {})
+        doc_count = summary.get("document_count", 0)
+        entity_count = summary.get("entity_count", 0)
+        hyp_count = summary.get("hypothesis_count", 0)
+        odos_status = summary.get("odos_status", "—")
     except Exception:
         pass
 
@@ -60,20 +90,44 @@ c2.metric("Entities", entity_count)
 c3.metric("Hypotheses", hyp_count)
 c4.metric("ODOS", odos_status)
 
-# Activity feed
-st.subheader("Activity feed")
-try:
-    with st.spinner("Loading..."):
-        import httpx
-        r = httpx.get(f"{base}/events", params={"n": 20}, timeout=5)
-        events = r.json().get("events", [])
-    if events:
+# Activity feed: refreshed on its own (a fragment rerun, not the whole page) every refresh_s seconds
+_prefetched = {"events": events_f}
+
+
+def _load_events() -> Optional[List[Dict[str, Any]]]:
+    """Events, or None while backing off after an error (429/5xx/unreachable: 2s doubling to 60s)."""
+    ss = st.session_state
+    # The full page run already fetched events; fragment reruns find the dict empty and poll
+    future = _prefetched.pop("events", None)
+    if future is None and time.monotonic() < ss.get("events_backoff_until", 0.0):
+        return None
+    try:
+        events = (future.result() if future is not None else _get_json("/events", n=20)).get("events", [])
+    except Exception as e:
+        ss["events_backoff_s"] = min(2 * ss.get("events_backoff_s", 1.0), _MAX_BACKOFF_S)
+        ss["events_backoff_until"] = time.monotonic() + ss["events_backoff_s"]
+        ss["events_error"] = str(e)
+        return None
+    ss.pop("events_backoff_s", None)
+    ss.pop("events_backoff_until", None)
+    ss.pop("events_error", None)
+    return events
+
+
+@st.fragment(run_every=refresh_s or None)
+def _activity_feed() -> None:
+    events = _load_events()
+    if events is None:
+        st.warning(f"Could not load events: {st.session_state.get('events_error', '')}")
+    elif events:
         for e in reversed(events[-15:]):
             st.caption(f"{e.get('timestamp', '')} — {e.get('agent', '')}: {e.get('step', '')}")
     else:
         st.info("No events. Run an investigation.")
-except Exception as e:
-    st.warning(f"Could not load events: {e}")
+
+
+st.subheader("Activity feed")
+_activity_feed()
 
 # New investigation: 1) Create 2) Upload files 3) Run
 st.subheader("New investigation")
@@ -83,10 +137,9 @@ st.markdown("**1. Create investigation**")
 name = st.text_input("Name (optional)", key="new_inv_name", placeholder="e.g. Case 2024-01")
 if st.button("Create investigation", key="btn_create_inv"):
     try:
-        import httpx
-        r = httpx.post(f"{base}/investigations", json={"name": name.strip() or None}, timeout=10)
+        r = get_client().post(f"{base}/investigations", json={"name": name.strip() or None}, timeout=10)
         r.raise_for_status()
-        d = r.json()
+        d = orjson.loads(r.content)
         st.session_state["investigation_id"] = d.get("investigation_id")
         st.success(f"Created: {d.get('investigation_id')}. Now add files below.")
         st.rerun()
@@ -100,54 +153,87 @@ if inv_id:
     accept_extensions = ["pdf", "docx", "doc", "txt", "xlsx", "xls", "csv", "json", "xml", "html", "eml", "msg", "png", "jpg", "jpeg"]
     uploaded = st.file_uploader("Choose one or more files", accept_multiple_files=True, type=accept_extensions, key="dashboard_uploads")
     global_description = st.text_area("Description (applied to all)", key="upload_global_desc", placeholder="Optional description for this batch")
+    # One POST per file, so the API cannot tell same-named files apart: give them distinct names here
+    upload_names = _unique_names([u.name for u in uploaded]) if uploaded else []
     with st.expander("Per-file descriptions (optional)"):
         per_file_desc = {}
-        for u in (uploaded or []):
-            per_file_desc[u.name] = st.text_input(f"Description for {u.name}", key=f"desc_{u.name}", placeholder="Optional")
+        if uploaded:
+            # One editable table for all files (not a text_input widget per file). Streamlit re-applies
+            # stored edits by row position, so a different file selection gets a fresh editor key.
+            names_key = hashlib.blake2b(orjson.dumps(upload_names), digest_size=8).hexdigest()
+            edited = st.data_editor(
+                pd.DataFrame({"file": upload_names, "description": [""] * len(uploaded)}),
+                key=f"upload_descs_{names_key}",
+                num_rows="fixed",
+                disabled=["file"],
+                hide_index=True,
+                use_container_width=True,
+            )
+            per_file_desc = dict(zip(edited["file"], edited["description"].fillna("")))
     if st.button("Upload files", key="btn_upload"):
         if not uploaded:
             st.warning("Select at least one file.")
         else:
-            try:
-                import httpx
-                import json
-                files = [("files", (u.name, u.getvalue())) for u in uploaded]
+            # One POST per file, up to _UPLOAD_WORKERS at a time on the shared client
+            url = f"{base}/investigations/{inv_id}/uploads"
+            payloads = []
+            for u, name in zip(uploaded, upload_names):
                 data = {}
                 if global_description and global_description.strip():
                     data["description"] = global_description.strip()
-                if any(per_file_desc.get(u.name) for u in uploaded):
-                    data["descriptions"] = json.dumps({u.name: (per_file_desc.get(u.name) or "").strip() for u in uploaded})
-                r = httpx.post(f"{base}/investigations/{inv_id}/uploads", files=files, data=data, timeout=60)
+                desc = (per_file_desc.get(name) or "").strip()
+                if desc:
+                    data["descriptions"] = orjson.dumps({name: desc}).decode()
+                payloads.append(([("files", (name, u.getvalue()))], data))
+
+            def _post(payload: Tuple[List[Any], Dict[str, str]]) -> int:
+                files, data = payload
+                r = get_client().post(url, files=files, data=data, timeout=60)
                 r.raise_for_status()
-                d = r.json()
-                st.success(f"Uploaded {d.get('total', 0)} file(s). You can run the analysis below.")
+                return orjson.loads(r.content).get("total", 0)
+
+            with st.spinner(f"Uploading {len(payloads)} file(s)..."), ThreadPoolExecutor(max_workers=_UPLOAD_WORKERS) as pool:
+                futures = [pool.submit(_post, p) for p in payloads]
+            total = 0
+            errors = []
+            for name, f in zip(upload_names, futures):
+                try:
+                    total += f.result()
+                except Exception as e:
+                    errors.append(f"{name}: {e}")
+            if errors:
+                st.error("\n".join(errors))
+            else:
+                st.success(f"Uploaded {total} file(s). You can run the analysis below.")
                 st.rerun()
-            except Exception as e:
-                st.error(str(e))
-    # List already uploaded files
+    # List already uploaded files (came with the overview fetched above)
     try:
-        r = httpx.get(f"{base}/investigations/{inv_id}/files", timeout=5)
-        if r.status_code == 200:
-            fd = r.json()
-            flist = fd.get("files", [])
-            if flist:
-                st.caption("Files in this investigation:")
-                for f in flist:
-                    st.caption(f" — {f.get('name')} ({f.get('size', 0)} bytes)" + (f" — {f.get('description', '')[:50]}..." if f.get('description') else ""))
+        flist = overview_f.result().get("files", []) if overview_f is not None else []
+        if flist:
+            st.caption("Files in this investigation:")
+            for f in flist:
+                st.caption(f" — {f.get('name')} ({f.get('size', 0)} bytes)" + (f" — {f.get('description', '')[:50]}..." if f.get('description') else ""))
     except Exception:
         pass
 
     # Step 3: Run pipeline
     st.markdown("**3. Run analysis**")
+    # Set just before the rerun that follows a successful start, shown once here
+    started = st.session_state.pop("run_started", None)
+    if started:
+        st.success(started)
     if st.button("Run analysis", key="btn_run"):
         try:
-            import httpx
-            r = httpx.post(f"{base}/investigations/{inv_id}/run", timeout=10)
-            if r.status_code == 400:
-                st.warning("Add files first, then run.")
+            # The API only starts a background thread and answers at once; progress shows in the activity feed
+            r = get_client().post(f"{base}/investigations/{inv_id}/run", timeout=10)
+            r.raise_for_status()
+            d = orjson.loads(r.content)
+            if d.get("error"):
+                st.warning("Add files first, then run." if d["error"] == "Add files first" else d["error"])
             else:
-                r.raise_for_status()
-                st.success("Analysis started. Check the activity feed and refresh when done.")
+                # Only the cached state responses: other cached functions (and other sessions' data) stay
+                get_state.clear()
+                st.session_state["run_started"] = "Analysis started. The activity feed above updates as it runs."
                 st.rerun()
         except Exception as e:
             st.error(str(e))
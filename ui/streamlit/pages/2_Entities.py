@@ -1,16 +1,46 @@
 """Entities viewer: table, filters, export JSON/CSV."""
 import sys
 from pathlib import Path
+from typing import Any, Dict, List
 ROOT = Path(__file__).resolve().parent.parent.parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import pandas as pd
 import streamlit as st
+from ui.streamlit.utils.http import get_state
 from ui.streamlit.components.entity_table import render_entity_table
 from ui.streamlit.components.export_modal import export_buttons
 
 inv_id = st.session_state.get("investigation_id")
 base = st.session_state.get("api_url", "http://localhost:8001").rstrip("/")
+# Only the state keys this page shows
+_FIELDS = ("entities",)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _entities_frame(state_digest: str, _data: Dict[str, Any]) -> pd.DataFrame:
+    """All entities as one DataFrame, built once per state version (keyed by its digest) instead of on every widget rerun."""
+    entities = _data.get("state", {}).get("entities", {}) or {}
+    if not isinstance(entities, dict):
+        return pd.DataFrame()
+    df = pd.DataFrame([e for e in entities.values() if isinstance(e, dict)])
+    if not df.empty:
+        # entity_type, falling back to the older "type" key when it is missing or empty
+        entity_type = _column(df, "entity_type")
+        df["entity_type"] = entity_type.where(entity_type.notna() & (entity_type != ""), _column(df, "type"))
+    return df
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _entity_types(state_digest: str, _df: pd.DataFrame) -> List[str]:
+    """Type filter options (sorted), computed once per state version."""
+    return sorted(t for t in _df["entity_type"].dropna().unique().tolist() if t) if not _df.empty else []
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    return df[name] if name in df else pd.Series(None, index=df.index, dtype=object)
+
 
 st.title("Entities")
 if not inv_id:
@@ -19,36 +49,28 @@ if not inv_id:
 
 try:
     with st.spinner("Loading..."):
-        import httpx
-        r = httpx.get(f"{base}/investigations/{inv_id}/state", timeout=10)
-        data = r.json()
-        state = data.get("state", {})
+        data = get_state(base, inv_id, _FIELDS)
+        df = _entities_frame(data["state_digest"], data)
 except Exception as e:
     st.error(str(e))
     st.stop()
 
-entities = state.get("entities", {}) or {}
-if isinstance(entities, dict):
-    ent_list = list(entities.values())
-else:
-    ent_list = []
-
-if not ent_list:
+if df.empty:
     st.info("No entities for this investigation yet. Add files and **Run analysis** on the **Dashboard**, then return here.")
     st.stop()
 
 with st.sidebar:
     st.subheader("Filters")
-    types = list(set(e.get("entity_type", e.get("type", "")) for e in ent_list if isinstance(e, dict)))
+    types = _entity_types(data["state_digest"], df)
     selected_type = st.multiselect("Type", types or ["PERSON", "ORG", "LOC", "DATE", "MONEY"], default=None)
     min_conf = st.slider("Min confidence", 0.0, 1.0, 0.0, 0.05)
 
-filtered = ent_list
+mask = pd.Series(True, index=df.index)
 if selected_type:
-    filtered = [e for e in filtered if isinstance(e, dict) and (e.get("entity_type") or e.get("type")) in selected_type]
+    mask &= df["entity_type"].isin(selected_type)
 if min_conf > 0:
-    filtered = [e for e in filtered if isinstance(e, dict) and (e.get("confidence", 0) or 0) >= min_conf]
+    mask &= pd.to_numeric(_column(df, "confidence"), errors="coerce").fillna(0) >= min_conf
+filtered = df[mask]
 
-entities_dict = {str(i): e for i, e in enumerate(filtered)} if filtered else {}
-render_entity_table(entities_dict)
+render_entity_table(filtered)
 export_buttons(filtered, "entities")
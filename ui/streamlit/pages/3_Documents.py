@@ -6,9 +6,12 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import streamlit as st
+from ui.streamlit.utils.http import get_state
 
 inv_id = st.session_state.get("investigation_id")
 base = st.session_state.get("api_url", "http://localhost:8001").rstrip("/")
+# Only the state keys this page shows
+_FIELDS = ("document_metadata",)
 st.title("Documents")
 
 if not inv_id:
@@ -17,12 +20,7 @@ if not inv_id:
 
 try:
     with st.spinner("Loading..."):
-        import httpx
-        r = httpx.get(f"{base}/investigations/{inv_id}/state", timeout=10)
-        if r.status_code != 200:
-            st.error("Could not load investigation state.")
-            st.stop()
-        data = r.json()
+        data = get_state(base, inv_id, _FIELDS)
         if data.get("error") == "not_found":
             st.error("Investigation not found.")
             st.stop()
@@ -6,10 +6,13 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import streamlit as st
+from ui.streamlit.utils.http import get_state
 from ui.streamlit.components.graph_viewer import render_graph_from_state
 
 inv_id = st.session_state.get("investigation_id")
 base = st.session_state.get("api_url", "http://localhost:8001").rstrip("/")
+# Only the state keys this page shows
+_FIELDS = ("entities", "relationships")
 
 st.title("Knowledge Graph")
 if not inv_id:
@@ -17,9 +20,7 @@ if not inv_id:
     st.stop()
 try:
     with st.spinner("Loading..."):
-        import httpx
-        r = httpx.get(f"{base}/investigations/{inv_id}/state", timeout=10)
-        state = r.json().get("state", {})
-    render_graph_from_state(state)
+        data = get_state(base, inv_id, _FIELDS)
+    render_graph_from_state(data.get("state", {}), state_digest=data.get("state_digest"))
 except Exception as e:
     st.error(str(e))
@@ -6,19 +6,20 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import streamlit as st
+from ui.streamlit.utils.http import get_state
 from ui.streamlit.components.timeline_viewer import render_timeline
 
 inv_id = st.session_state.get("investigation_id")
 base = st.session_state.get("api_url", "http://localhost:8001").rstrip("/")
+# Only the state keys this page shows
+_FIELDS = ("timeline",)
 st.title("Timeline")
 if not inv_id:
     st.warning("Select an investigation in the sidebar or create one from the **Dashboard**.")
     st.stop()
 try:
     with st.spinner("Loading..."):
-        import httpx
-        r = httpx.get(f"{base}/investigations/{inv_id}/state", timeout=10)
-        state = r.json().get("state", {})
+        state = get_state(base, inv_id, _FIELDS).get("state", {})
     render_timeline(state.get("timeline", []))
 except Exception as e:
     st.error(str(e))
@@ -5,7 +5,10 @@ ROOT = Path(__file__).resolve().parent.parent.parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import orjson
 import streamlit as st
+from ui.streamlit.utils.http import get_client
+from ui.streamlit.utils.formatters import first_nonempty
 
 inv_id = st.session_state.get("investigation_id")
 base = st.session_state.get("api_url", "http://localhost:8001").rstrip("/")
@@ -21,12 +24,11 @@ if st.button("Search", key="search_btn"):
     else:
         try:
             with st.spinner("Searching..."):
-                import httpx
                 body = {"query": query.strip(), "n_results": 15}
                 if inv_id:
                     body["investigation_id"] = inv_id
-                r = httpx.post(f"{base}/search", json=body, timeout=15)
-                d = r.json()
+                r = get_client().post(f"{base}/search", json=body, timeout=15)
+                d = orjson.loads(r.content)
                 results = d.get("results", [])
                 err = d.get("error")
             if err:
@@ -35,7 +37,7 @@ if st.button("Search", key="search_btn"):
                 st.info("No results.")
             else:
                 for hit in results:
-                    doc_id = hit.get("document_id", hit.get("entity_id", ""))
+                    doc_id = first_nonempty(hit, "document_id", "entity_id")
                     score = hit.get("combined_score", hit.get("vector_score", 0)) or 0
                     snippet = hit.get("snippet", "")
                     st.markdown(f"**{doc_id}** — score: {score:.3f}")
@@ -1,14 +1,20 @@
 """Hypotheses list with evidence and confidence filter."""
 import sys
 from pathlib import Path
+from typing import Any, Dict, List
 ROOT = Path(__file__).resolve().parent.parent.parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import pandas as pd
 import streamlit as st
+from ui.streamlit.utils.http import get_state
+from ui.streamlit.utils.formatters import first_nonempty
 
 inv_id = st.session_state.get("investigation_id")
 base = st.session_state.get("api_url", "http://localhost:8001").rstrip("/")
+# Only the state keys this page shows
+_FIELDS = ("hypotheses",)
 st.title("Hypotheses")
 
 if not inv_id:
@@ -17,12 +23,7 @@ if not inv_id:
 
 try:
     with st.spinner("Loading..."):
-        import httpx
-        r = httpx.get(f"{base}/investigations/{inv_id}/state", timeout=10)
-        if r.status_code != 200:
-            st.error("Could not load investigation state.")
-            st.stop()
-        state = r.json().get("state", {})
+        state = get_state(base, inv_id, _FIELDS).get("state", {})
 except Exception as e:
     st.error(str(e))
     st.stop()
@@ -38,20 +39,52 @@ if not hyps:
 min_conf = st.slider("Min confidence", 0.0, 1.0, 0.0, 0.05, key="hyp_min_conf")
 filtered = [h for h in hyps if isinstance(h, dict) and (h.get("confidence", 0) or 0) >= min_conf]
 
-for i, h in enumerate(filtered):
-    d = h if isinstance(h, dict) else {}
-    title = d.get("title", d.get("description", ""))[:120] or f"Hypothesis {i+1}"
+if not filtered:
+    st.info("No hypotheses at this confidence.")
+    st.stop()
+
+
+def _evidence(d: Dict[str, Any]) -> List[Any]:
+    evidence = first_nonempty(d, "supporting_evidence", "evidence", default=[])
+    return evidence if isinstance(evidence, list) else [evidence]
+
+
+# One table for the whole list (one element to send, not five per hypothesis); pick a row for its evidence
+rows = []
+for i, d in enumerate(filtered):
+    title = first_nonempty(d, "title", "description")[:120] or f"Hypothesis {i+1}"
     desc = d.get("description", "")
-    conf = d.get("confidence", 0)
-    evidence = d.get("supporting_evidence", d.get("evidence", [])) or []
-    status = d.get("status", "")
-    with st.container():
-        st.markdown(f"**{title}**")
-        st.caption(f"Confidence: {conf:.2f}" + (f" — Status: {status}" if status else ""))
-        if desc and desc != title:
-            st.write(desc)
-        if evidence:
-            with st.expander("Evidence"):
-                for e in (evidence if isinstance(evidence, list) else [evidence])[:20]:
-                    st.caption(str(e)[:300])
-        st.divider()
+    rows.append({
+        "title": title,
+        "confidence": float(d.get("confidence", 0) or 0),
+        "status": d.get("status", ""),
+        "description": desc if desc != title else "",
+        "evidence": len(_evidence(d)),
+    })
+event = st.dataframe(
+    pd.DataFrame(rows),
+    use_container_width=True,
+    hide_index=True,
+    on_select="rerun",
+    selection_mode="single-row",
+    column_config={
+        "title": st.column_config.TextColumn("Hypothesis", width="large"),
+        "confidence": st.column_config.ProgressColumn("Confidence", min_value=0.0, max_value=1.0, format="%.2f"),
+        "status": "Status",
+        "description": st.column_config.TextColumn("Description", width="large"),
+        "evidence": "Evidence",
+    },
+)
+
+selected = event.selection.rows
+if selected:
+    row = rows[selected[0]]
+    st.markdown(f"**{row['title']}**")
+    if row["description"]:
+        st.write(row["description"])
+    evidence = _evidence(filtered[selected[0]])
+    if evidence:
+        st.markdown("Evidence")
+        st.text("\n".join(str(e)[:300] for e in evidence[:20]))
+else:
+    st.caption("Select a row to see its evidence.")
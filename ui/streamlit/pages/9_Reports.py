@@ -6,9 +6,13 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import streamlit as st
+from ui.streamlit.utils.http import get_state
+from ui.streamlit.utils.formatters import first_nonempty
 
 inv_id = st.session_state.get("investigation_id")
 base = st.session_state.get("api_url", "http://localhost:8001").rstrip("/")
+# Only the state keys this page shows
+_FIELDS = ("report_summary", "hypotheses", "leads")
 
 st.title("Reports")
 
@@ -18,12 +22,7 @@ if not inv_id:
 
 try:
     with st.spinner("Loading..."):
-        import httpx
-        r = httpx.get(f"{base}/investigations/{inv_id}/state", timeout=10)
-        if r.status_code != 200:
-            st.error("Could not load investigation state.")
-            st.stop()
-        state = r.json().get("state", {})
+        state = get_state(base, inv_id, _FIELDS).get("state", {})
 except Exception as e:
     st.error(str(e))
     st.stop()
@@ -41,7 +40,7 @@ if hyps:
     st.caption("See the **Hypotheses** page for full detail.")
     for i, h in enumerate(hyps[:10]):
         d = h if isinstance(h, dict) else {}
-        title = d.get("title", d.get("description", ""))[:80] or f"Hypothesis {i+1}"
+        title = first_nonempty(d, "title", "description")[:80] or f"Hypothesis {i+1}"
         st.markdown(f"- {title}")
 
 leads = state.get("leads", []) or []
@@ -49,7 +48,7 @@ if leads:
     st.subheader("Leads")
     for i, L in enumerate(leads[:15]):
         d = L if isinstance(L, dict) else {}
-        action = d.get("action", d.get("description", ""))[:80] or f"Lead {i+1}"
+        action = first_nonempty(d, "action", "description")[:80] or f"Lead {i+1}"
         priority = d.get("priority", "")
         st.markdown(f"- **{action}**" + (f" (priority: {priority})" if priority else ""))
 
@@ -1,15 +1,28 @@
 """Export helpers (JSON, CSV)."""
-import json
+import csv
+import io
 from typing import Any, List, Dict
 
+import orjson
+
 
 def entities_to_json(entities: List[Dict[str, Any]]) -> str:
-    return json.dumps(entities, ensure_ascii=False, indent=2)
+    return orjson.dumps(entities, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def records_to_csv(records: List[Dict[str, Any]]) -> str:
+    """CSV with the first record's keys as header; csv.writer quotes commas, quotes and newlines."""
+    if not records or not isinstance(records[0], dict):
+        return ""
+    keys = list(records[0].keys())
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(keys)
+    writer.writerows([r.get(k, "") for k in keys] for r in records)
+    return buf.getvalue()
 
 
 def entities_to_csv(entities: List[Dict[str, Any]]) -> str:
     if not entities:
         return "entity_id,text,entity_type,confidence\n"
-    keys = list(entities[0].keys()) if isinstance(entities[0], dict) else []
-    lines = [",".join(str(e.get(k, "")) for k in keys) for e in entities]
-    return "\n".join([",".join(keys)] + lines)
+    return records_to_csv(entities)
@@ -1,5 +1,5 @@
 """Formatters for display (dates, numbers)."""
-from typing import Any
+from typing import Any, Dict
 
 
 def format_entity_type(t: Any) -> str:
@@ -11,3 +11,12 @@ def format_confidence(c: Any) -> str:
         return f"{float(c):.2f}" if c is not None else "—"
     except (TypeError, ValueError):
         return "—"
+
+
+def first_nonempty(d: Dict[str, Any], *keys: str, default: Any = "") -> Any:
+    """Value of the first key present with a non-empty value (later keys are looked up only if needed)."""
+    for key in keys:
+        value = d.get(key)
+        if value:
+            return value
+    return default
@@ -0,0 +1,36 @@
+"""Shared HTTP client for the API (pages re-run on every interaction; connections should not)."""
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import orjson
+import streamlit as st
+
+# Idle pooled connections are kept this long (httpx default: 5s), so activity-feed polls up to a minute
+# apart reuse one connection. Below the API's keep-alive (75s) so the server never closes one first.
+_KEEPALIVE_S = 60.0
+
+
+@st.cache_resource(show_spinner=False)
+def get_client() -> httpx.Client:
+    """One keep-alive connection pool per Streamlit server; callers pass full URLs and per-call timeouts."""
+    return httpx.Client(
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=_KEEPALIVE_S),
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_state(base: str, inv_id: str, fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """
+    GET /investigations/{inv_id}/state (the whole response), reused for 30s so widget reruns
+    (filters, sliders) do not download the state again. `fields` asks for only those top-level
+    state keys. "state_digest" is a hash of the response body, computed once here: it identifies
+    this exact state for downstream caches without re-serializing it. Raises on a non-200 response.
+    """
+    params = {"fields": ",".join(fields)} if fields else None
+    r = get_client().get(f"{base}/investigations/{inv_id}/state", params=params, timeout=10)
+    r.raise_for_status()
+    data = orjson.loads(r.content)
+    data["state_digest"] = hashlib.blake2b(r.content, digest_size=16).hexdigest()
+    return data